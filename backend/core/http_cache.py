@@ -0,0 +1,50 @@
+# backend/core/http_cache.py
+# flake8: noqa
+"""
+🏷️ 조건부 GET (ETag / If-None-Match)
+응답 본문이 아니라 "데이터 버전"(트랙 version, 유저 진행도 version, 최신 updated_at 등)으로 ETag를 만들고,
+클라이언트가 같은 ETag를 보내면 조회 / 직렬화 없이 304를 돌려줍니다.
+
+사용 예:
+    etag = make_etag("dev-feed", sort, *dev_data_version(db))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return build_public_feed(db, sort)
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return 'W/"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _strip_weak(etag)
+    return any(_strip_weak(t) == target for t in header.split(","))
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # 브라우저가 매번 재검증하도록 (캐시는 하되 사용 전 If-None-Match로 확인)
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -1,11 +1,18 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
 
-from database.mariadb import SessionLocal
+from database.mariadb import get_db
 from database.models import UserProfile
+from utils.cache_utils import TTLCache
 
 # ---------------------------------------------------------
 # ⚙️ JWT 기본 설정
@@ -14,20 +21,104 @@ SECRET_KEY = "YOUR_SECRET_KEY"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt 비용(라운드) — 변경하면 다음 로그인 시 자동으로 재해시됨
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 해시 전용 워커 수 / 대기열 한도 (초과 시 503으로 즉시 거절)
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=BCRYPT_ROUNDS)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+# ---------------------------------------------------------
+# 🧵 bcrypt 전용 워커 풀
+# bcrypt는 계산 중 GIL을 놓기 때문에 스레드 풀로도 병렬 처리됩니다.
+# Starlette 기본 스레드풀과 분리해서 로그인 폭주가 다른 API를 막지 않도록 함
+# ---------------------------------------------------------
+_hash_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_hash_lock = threading.Lock()
+_hash_stats = {
+    "queued": 0, "running": 0, "completed": 0, "rejected": 0,
+    "max_depth": 0, "wait_ms_total": 0.0, "work_ms_total": 0.0,
+}
+
+
+def _submit_hash_job(fn, *args):
+    with _hash_lock:
+        depth = _hash_stats["queued"] + _hash_stats["running"]
+        if depth >= BCRYPT_MAX_QUEUE:
+            _hash_stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            )
+        _hash_stats["queued"] += 1
+        _hash_stats["max_depth"] = max(_hash_stats["max_depth"], depth + 1)
+
+    submitted = time.monotonic()
+
+    def job():
+        started = time.monotonic()
+        with _hash_lock:
+            _hash_stats["queued"] -= 1
+            _hash_stats["running"] += 1
+            _hash_stats["wait_ms_total"] += (started - submitted) * 1000
+        try:
+            return fn(*args)
+        finally:
+            with _hash_lock:
+                _hash_stats["running"] -= 1
+                _hash_stats["completed"] += 1
+                _hash_stats["work_ms_total"] += (time.monotonic() - started) * 1000
+
+    return _hash_pool.submit(job)
+
+
+def get_hash_pool_stats() -> dict:
+    with _hash_lock:
+        done = _hash_stats["completed"] or 1
+        return {
+            **_hash_stats,
+            "depth": _hash_stats["queued"] + _hash_stats["running"],
+            "wait_ms_avg": round(_hash_stats["wait_ms_total"] / done, 1),
+            "work_ms_avg": round(_hash_stats["work_ms_total"] / done, 1),
+            "workers": BCRYPT_WORKERS,
+            "max_queue": BCRYPT_MAX_QUEUE,
+            "rounds": BCRYPT_ROUNDS,
+        }
+
+
 # ---------------------------------------------------------
 # 🔐 비밀번호 관련
+# async 버전: 라우터에서 await → 이벤트 루프/스레드풀 슬롯을 점유하지 않음
+# sync 버전 : 스크립트 등에서 사용 (같은 풀에서 실행 후 결과 대기)
 # ---------------------------------------------------------
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _submit_hash_job(pwd_context.hash, password).result()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return _submit_hash_job(pwd_context.verify, plain, hashed).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit_hash_job(pwd_context.hash, password))
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await asyncio.wrap_future(_submit_hash_job(pwd_context.verify, plain, hashed))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """설정된 BCRYPT_ROUNDS 와 해시의 비용이 다르면 True ($2b$<rounds>$...)"""
+    if pwd_context.needs_update(hashed):
+        return True
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 
 # ---------------------------------------------------------
@@ -40,13 +131,71 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# ---------------------------------------------------------
+# 🪪 Principal 캐시 (토큰 id/sub → 가벼운 사용자 객체)
+# ---------------------------------------------------------
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+
+class Principal:
+    """
+    인증된 사용자의 읽기 전용 스냅샷.
+    DB 세션과 분리되어 있어 요청 간에 캐시해도 안전합니다.
+    (프로필 변경은 update_user_interests → invalidate_principal 로 즉시 반영,
+     다른 프로세스에서의 변경은 최대 PRINCIPAL_CACHE_TTL 초 뒤 반영)
+    """
+
+    __slots__ = (
+        "id", "username", "email", "role_type", "main_focus", "career_stage",
+        "tech_stack", "interest_topics", "level", "current_xp", "title", "updated_at",
+    )
+
+    def __init__(self, user: UserProfile):
+        for field in self.__slots__:
+            value = getattr(user, field, None)
+            setattr(self, field, list(value) if isinstance(value, list) else value)
+
+
+def _principal_key(payload: dict):
+    return payload.get("id") or payload.get("sub")
+
+
+def _load_principal(db: Session, payload: dict):
+    email = payload.get("sub")
+    key = _principal_key(payload)
+
+    principal = _principal_cache.get(key)
+    if principal is not None and principal.email == email:
+        return principal
+
+    user = db.query(UserProfile).filter(UserProfile.email == email).first()
+    if not user:
+        return None
+
+    principal = Principal(user)
+    _principal_cache.set(key, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int = None, email: str = None):
+    """프로필이 바뀌었을 때 캐시된 Principal 제거 (id / sub 어느 키로 캐시됐든 삭제)"""
+    if user_id is not None:
+        _principal_cache.pop(user_id)
+    if email is not None:
+        _principal_cache.pop(email)
+
+
 # ---------------------------------------------------------
 # 🔐 필수 로그인 버전 (401 발생)
 # ---------------------------------------------------------
-def get_current_user(token: str = Depends(oauth2_scheme)):
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """
     필수 로그인 요구 API에서만 사용.
     Authorization 헤더가 없거나 토큰이 잘못되면 즉시 401 발생.
+    캐시 미스일 때만 라우터와 같은 요청 스코프 세션으로 조회합니다.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,10 +211,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    db = SessionLocal()
-    user = db.query(UserProfile).filter(UserProfile.email == email).first()
-    db.close()
-
+    user = _load_principal(db, payload)
     if not user:
         raise credentials_exception
 
@@ -75,7 +221,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
 # ---------------------------------------------------------
 # 🔓 Optional 로그인 (fallback)
 # ---------------------------------------------------------
-def get_current_user_optional(request: Request):
+def get_current_user_optional(request: Request, db: Session = Depends(get_db)):
     """
     - Authorization 헤더 없음     → None
     - Bearer 포맷 아님            → None
@@ -108,12 +254,5 @@ def get_current_user_optional(request: Request):
         # ✔️ decode 실패 → 만료 / invalid → None 반환
         return None
 
-    # 5) DB 조회
-    db = SessionLocal()
-    user = db.query(UserProfile).filter(UserProfile.email == email).first()
-    db.close()
-
-    if not user:
-        return None
-
-    return user
+    # 5) Principal 조회 (캐시 → 요청 세션)
+    return _load_principal(db, payload)
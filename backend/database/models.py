@@ -7,12 +7,13 @@
 
 from sqlalchemy import (
     create_engine, Column, Integer, String, DateTime, Text,
-    JSON, Float, ForeignKey, Boolean, Enum
+    JSON, Float, ForeignKey, Boolean, Enum, Index, BigInteger, UniqueConstraint
 )
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import enum
 import os
+import time
 from sqlalchemy.dialects.mysql import LONGTEXT
 
 
@@ -82,10 +83,21 @@ class UserProfile(Base):
     today_quests = relationship("UserTodayQuests", backref="user", cascade="all, delete-orphan")
     quest_progress = relationship("UserQuestProgress", backref="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 리더보드 재구성 (level DESC, current_xp DESC 순회)
+        Index("ix_user_profiles_level_xp", "level", "current_xp"),
+        # 리더보드 증분 동기화 (updated_at 이후 변경분)
+        Index("ix_user_profiles_updated_at", "updated_at"),
+    )
+
 
 # ===================================================================
 # 🗺️ Skill Track
 # ===================================================================
+def new_track_version() -> int:
+    return time.time_ns() // 1000
+
+
 class SkillTrack(Base):
     __tablename__ = "skill_tracks"
 
@@ -94,6 +106,9 @@ class SkillTrack(Base):
     title = Column(String(100))
     description = Column(Text)
 
+    # ⭐ 구조(노드/선행관계/퀘스트 구성) 버전 → 로드맵 캐시 무효화 기준 (µs 타임스탬프)
+    version = Column(BigInteger, nullable=False, default=new_track_version)
+
     nodes = relationship("SkillNode", backref="track", cascade="all, delete-orphan")
 
 
@@ -139,7 +154,25 @@ class SkillNode(Base):
         foreign_keys="LearningQuest.node_db_id"
     )
 
+    __table_args__ = (
+        # seed 재실행 시 upsert 키
+        UniqueConstraint("track_id", "node_id", name="uq_skill_nodes_track_node"),
+    )
+
+
+# ===================================================================
+# 🔗 Skill Node Edge (prerequisites JSON의 정규화 사본, seed 시 재구성)
+# ===================================================================
+class SkillNodeEdge(Base):
+    __tablename__ = "skill_node_edges"
 
+    parent_id = Column(Integer, ForeignKey("skill_nodes.id"), primary_key=True)
+    child_id = Column(Integer, ForeignKey("skill_nodes.id"), primary_key=True)
+    track_id = Column(Integer, ForeignKey("skill_tracks.id"), index=True)
+
+    __table_args__ = (
+        Index("ix_skill_node_edges_child", "child_id"),  # 역방향(자식 → 부모) 조회용
+    )
 
 
 # ===================================================================
@@ -156,6 +189,33 @@ class UserNodeProgress(Base):
     completed_at = Column(DateTime)
     interaction_count = Column(Integer, default=0)
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "node_db_id", name="uq_user_node_progress"),
+    )
+
+
+# ===================================================================
+# 🧮 User Track Progress (트랙 단위 비트셋 요약)
+# - bit i = CompiledTrack 인덱스 i 노드 (track_version이 다르면 재구성)
+# - completed_mask / unlocked_mask : UserNodeProgress의 COMPLETED / UNLOCKED 상태를 16진수로 저장
+# ===================================================================
+class UserTrackProgress(Base):
+    __tablename__ = "user_track_progress"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user_profiles.id"))
+    track_id = Column(Integer, ForeignKey("skill_tracks.id"))
+    track_version = Column(BigInteger, nullable=False)
+
+    completed_mask = Column(Text, nullable=False, default="0")
+    unlocked_mask = Column(Text, nullable=False, default="0")
+    version = Column(Integer, nullable=False, default=0)  # 진행도(노드/퀘스트)가 바뀔 때마다 +1 → ETag
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "track_id", name="uq_user_track_progress"),
+    )
+
 
 # ===================================================================
 # 🎮 LearningResource
@@ -214,12 +274,39 @@ class DevPost(Base):
 
     published_at = Column(DateTime)
     crawled_at = Column(DateTime, default=datetime.utcnow)
+    # 재수집 / 재분류로 내용이 바뀐 시각 (ETag 버전)
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
     topic_primary = Column(String(50))
     issue_primary = Column(String(50))
     topic_ai = Column(String(50))
     issue_ai = Column(String(50))
 
+    # 🔥 hot 정렬 점수 (저장 시점에 계산, 요청 시에는 인덱스로 정렬만)
+    hot_score = Column(Float(precision=53), default=0.0)  # MySQL DOUBLE
+
+    __table_args__ = (
+        Index("ix_dev_posts_source_hot", "source", "hot_score"),
+        Index("ix_dev_posts_hot", "hot_score"),
+        Index("ix_dev_posts_updated", "updated_at"),  # ETag용 max(updated_at)
+    )
+
+
+# ===================================================================
+# 🧮 Dev Topic Cluster 스냅샷 (크롤링 후 오프라인 계산)
+# ===================================================================
+class DevTopicCluster(Base):
+    __tablename__ = "dev_topic_clusters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_at = Column(DateTime, index=True)
+
+    cluster_idx = Column(Integer)
+    label = Column(String(100))
+    top_terms = Column(JSON, default=[])
+    size = Column(Integer, default=0)
+    sample_post_ids = Column(JSON, default=[])
+
 
 # ===================================================================
 # ⭐ Dev User Preferences
@@ -248,7 +335,7 @@ class LearningQuest(Base):
 
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    url = Column(String(500), nullable=False)
+    url = Column(String(500), nullable=False, index=True)
 
     xp = Column(Integer, default=50)
     difficulty = Column(String(20), default="easy")
@@ -269,6 +356,11 @@ class LearningQuest(Base):
     completed = Column(Boolean, default=False)
     last_recommended = Column(String(20))
 
+    __table_args__ = (
+        # 노드별 강의 upsert 키 (node_db_id가 NULL인 일반 퀘스트는 제약 없음)
+        UniqueConstraint("node_db_id", "url", name="uq_learning_quests_node_url"),
+    )
+
 
 
 
@@ -288,6 +380,11 @@ class UserTodayQuests(Base):
 
     quest = relationship("LearningQuest")
 
+    __table_args__ = (
+        # (user_id, date_key) 조회 인덱스 겸 같은 날 중복 배정 방지
+        UniqueConstraint("user_id", "date_key", "quest_id", name="uq_user_today_quests"),
+    )
+
 
 # ===================================================================
 # ⭐ DAILY QUEST — 퀘스트 완료 기록
@@ -299,12 +396,53 @@ class UserQuestProgress(Base):
 
     user_id = Column(Integer, ForeignKey("user_profiles.id"))
     quest_id = Column(Integer, ForeignKey("learning_quests.id"))
+    node_db_id = Column(Integer, ForeignKey("skill_nodes.id"), nullable=True)  # 퀘스트 소속 노드 (조회용 사본)
 
     status = Column(String(20), default="pending")  # pending / completed
     completed_at = Column(DateTime)
 
     quest = relationship("LearningQuest")
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "quest_id", name="uq_user_quest_progress"),
+        Index("ix_user_quest_progress_user_node", "user_id", "node_db_id"),
+    )
+
+
+# ===================================================================
+# ⭐ DAILY QUEST — 유저 x 노드 퀘스트 완료 카운터
+# completed_count >= total_count 이면 노드의 퀘스트를 모두 완료한 것
+# ===================================================================
+class UserNodeQuestCounter(Base):
+    __tablename__ = "user_node_quest_counters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user_profiles.id"))
+    node_db_id = Column(Integer, ForeignKey("skill_nodes.id"))
+
+    completed_count = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "node_db_id", name="uq_user_node_quest_counter"),
+    )
+
+
+# ===================================================================
+# ⭐ XP 원장 (write-behind)
+# 퀘스트 완료는 여기에 한 줄 INSERT만 하고,
+# 스케줄러의 compactor가 모아서 UserProfile.current_xp / level에 반영 후 삭제
+# ===================================================================
+class XpLedger(Base):
+    __tablename__ = "xp_ledger"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user_profiles.id"), nullable=False, index=True)
+    xp = Column(Integer, nullable=False)
+    source = Column(String(100))  # 예: "quest:12"
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 
 # ===================================================================
 # 🧩 User Interests
@@ -355,5 +493,6 @@ class UserRecommendation(Base):
 # ===================================================================
 def init_db():
     print("📦 Initializing DevHub Database (v4 Gamified + Daily Quest)...")
+    # create_all은 새 테이블만 생성 → 기존 테이블의 컬럼 / 인덱스 추가는 scripts/migrate_schema.py
     Base.metadata.create_all(bind=engine)
     print("✅ Tables created/updated successfully!")
@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 
 # DB 초기화
 from database.models import init_db
+from database.mariadb import SessionLocal
+from services.user_service import load_email_filter
 
 # Routers
 from routers import (
@@ -18,6 +20,7 @@ from routers import (
     roadmap_router,    # /api/roadmap
     ai_router,         # /api/ai
     quest_router,      # /api/quest
+    leaderboard_router,  # /api/leaderboard
     # career_router,     # ⭐ 다시 활성화
     quiz_router,
 )
@@ -51,7 +54,8 @@ app.add_middleware(
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
 )
 
 
@@ -79,6 +83,9 @@ app.include_router(roadmap_router.router)
 # 6️⃣ Today Quests
 app.include_router(quest_router.router)
 
+# 🏆 Leaderboard
+app.include_router(leaderboard_router.router)
+
 # 7️⃣ AI
 app.include_router(ai_router.router, prefix="/api/ai")
 
@@ -95,6 +102,15 @@ RUN_MAIN_FLAG = os.environ.get("RUN_MAIN", "false")
 
 @app.on_event("startup")
 def startup_event():
+    # 🌸 /auth/check-email 용 Bloom Filter (프로세스마다 필요)
+    db = SessionLocal()
+    try:
+        load_email_filter(db)
+    except Exception as e:
+        print("⚠️ Email Bloom Filter 생성 실패 → DB 조회로 동작:", e)
+    finally:
+        db.close()
+
     if RUN_MAIN_FLAG == "true":
         print("⚠️ Reload Process → Scheduler Skipped")
         return
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List
 from services.ai_service import chat_with_ai
+from utils.llm_chain import get_llm_stats
 
 router = APIRouter(tags=["AI Career Compass"])
 
@@ -19,4 +20,11 @@ def chat(request: ChatRequest):
         ai_reply = chat_with_ai(request.messages)
         return {"role": "assistant", "content": ai_reply}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats")
+def llm_stats():
+    """
+    LLM 게이트웨이 사용량 (파이프라인별 호출 수 / 토큰 / 지연시간 / 예산)
+    """
+    return get_llm_stats()
@@ -1,14 +1,18 @@
 # backend/routers/dev_router.py
 # flake8: noqa
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from core.http_cache import make_etag, is_not_modified, not_modified, set_etag
 from core.security import get_current_user_optional
-from database.mariadb import SessionLocal
-from database.models import UserProfile
+from database.mariadb import get_db
+from database.models import UserProfile, DevTopicCluster
 
 from services.dev_service import (
+    FEED_SORTS,
+    get_feed_version,
     build_public_feed,
     build_personal_feed,
     get_source_feed,
@@ -29,12 +33,28 @@ from schemas.dev_schema import (
 router = APIRouter(prefix="/api/dev", tags=["DevDashboard"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def validate_sort(sort: str) -> str:
+    sort = sort.lower()
+    if sort not in FEED_SORTS:
+        raise HTTPException(status_code=400, detail="Invalid Sort")
+    return sort
+
+
+def check_etag(request: Request, response: Response, db: Session, *parts):
+    """
+    dev 데이터 버전 + 요청 파라미터로 ETag 비교 → 같으면 304 Response, 아니면 None (ETag 헤더만 세팅)
+    """
+    etag = make_etag("dev", *parts, *get_feed_version(db))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return None
+
+
+def _user_parts(current_user):
+    if current_user is None:
+        return ("public",)
+    return (current_user.id, ",".join(sorted(current_user.tech_stack or [])))
 
 
 # -------------------------------------------------------------
@@ -42,19 +62,29 @@ def get_db():
 # -------------------------------------------------------------
 @router.get("/", response_model=DevFeedResponse)
 def dev_feed(
+    request: Request,
+    response: Response,
+    sort: str = "latest",
     current_user: UserProfile = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
+    sort = validate_sort(sort)
+    cached = check_etag(request, response, db, "feed", sort, *_user_parts(current_user))
+    if cached:
+        return cached
     if current_user is None:
-        return build_public_feed(db)
-    return build_personal_feed(current_user, db)
+        return build_public_feed(db, sort)
+    return build_personal_feed(current_user, db, sort)
 
 
 # -------------------------------------------------------------
 # 🔵 Public Feed
 # -------------------------------------------------------------
 @router.get("/public", response_model=DevFeedResponse)
-def dev_public(db: Session = Depends(get_db)):
+def dev_public(request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, db, "feed", "latest", "public")
+    if cached:
+        return cached
     return build_public_feed(db)
 
 
@@ -63,9 +93,15 @@ def dev_public(db: Session = Depends(get_db)):
 # -------------------------------------------------------------
 @router.get("/personal", response_model=DevFeedResponse)
 def dev_personal(
+    request: Request,
+    response: Response,
     current_user: UserProfile = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
+    cached = check_etag(request, response, db, "feed", "latest", *_user_parts(current_user))
+    if cached:
+        return cached
+
     # 로그인 X → public 반환 (Fallback)
     if current_user is None:
         return build_public_feed(db)
@@ -85,16 +121,23 @@ def dev_personal(
 @router.get("/source/{source}", response_model=SourceFeedResponse)
 def dev_source_feed(
     source: str,
+    request: Request,
+    response: Response,
     page: int = 1,
     size: int = 10,
+    sort: str = "latest",
     db: Session = Depends(get_db),
 ):
     source = source.lower()
     if source not in ["okky", "devto"]:
         raise HTTPException(status_code=400, detail="Invalid Source")
+    sort = validate_sort(sort)
+    cached = check_etag(request, response, db, "source", source, page, size, sort)
+    if cached:
+        return cached
 
     try:
-        items, total = get_source_feed(db, source, page, size)
+        items, total = get_source_feed(db, source, page, size, sort)
         return SourceFeedResponse(source=source, total=total, items=items)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -104,7 +147,10 @@ def dev_source_feed(
 # 🏷 Tag 검색
 # -------------------------------------------------------------
 @router.get("/search", response_model=TagSearchResponse)
-def dev_search(tag: str, db: Session = Depends(get_db)):
+def dev_search(tag: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, db, "search", tag)
+    if cached:
+        return cached
     return search_by_tag(db, tag)
 
 
@@ -120,7 +166,10 @@ def dev_refresh(db: Session = Depends(get_db)):
 # 🔖 전체 태그 목록
 # -------------------------------------------------------------
 @router.get("/tags")
-def dev_tags(db: Session = Depends(get_db)):
+def dev_tags(request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, db, "tags")
+    if cached:
+        return cached
     tags = collect_all_tags(db)
     return {"tags": tags}
 
@@ -137,9 +186,17 @@ def dev_health():
 # 🔥 Insight
 # -------------------------------------------------------------
 @router.get("/insight/topic")
-def dev_topic_insight(db: Session = Depends(get_db)):
+def dev_topic_insight(request: Request, response: Response, db: Session = Depends(get_db)):
+    # 클러스터 스냅샷은 크롤링 직후 따로 갱신되므로 snapshot_at도 버전에 포함
+    snapshot_at = db.query(func.max(DevTopicCluster.snapshot_at)).scalar()
+    cached = check_etag(request, response, db, "insight-topic", snapshot_at)
+    if cached:
+        return cached
     return build_topic_clusters(db)
 
 @router.get("/insight/issues")
-def dev_issue_insight(db: Session = Depends(get_db)):
+def dev_issue_insight(request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, db, "insight-issues")
+    if cached:
+        return cached
     return build_issue_stats(db)
\ No newline at end of file
@@ -1,12 +1,13 @@
 # backend/routers/home_router.py
 # flake8: noqa
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
 from datetime import datetime, timedelta
 
-from database.mariadb import SessionLocal
+from core.http_cache import make_etag, is_not_modified, not_modified, set_etag
+from database.mariadb import get_db
 from database.models import NewsFeed
 from core.security import get_current_user
 
@@ -14,6 +15,7 @@ from core.security import get_current_user
 from services.home_service import (
     serialize_news, 
     build_charts, 
+    get_news_version,
     run_news_pipeline,          # news_service에서 이사옴
     get_trend_recommendations   # trend_service에서 이사옴
 )
@@ -21,26 +23,29 @@ from services.home_service import (
 router = APIRouter(prefix="/api/home", tags=["Home Dashboard"])
 
 
-# -------------------------
-# 🔌 DB 연결 의존성
-# -------------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # 최근 7일 계산 헬퍼
 def last_7_days():
     return datetime.utcnow() - timedelta(days=7)
 
 
+def check_etag(request: Request, response: Response, db: Session, *parts):
+    """
+    뉴스 데이터 버전 + 요청 파라미터로 ETag 비교 → 같으면 304 Response, 아니면 None (ETag 헤더만 세팅)
+    """
+    etag = make_etag("home", *parts, get_news_version(db))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return None
+
+
 # ============================================================
 # 🔓 1. PUBLIC 홈 (검색 + 랜덤 뉴스 + 차트)
 # ============================================================
 @router.get("/public")
 def public_home(
+    request: Request,
+    response: Response,
     keyword: str = Query(None),
     db: Session = Depends(get_db),
 ):
@@ -54,6 +59,11 @@ def public_home(
     try:
         # 🔍 A. 검색 모드
         if keyword:
+            # 7일 창이 계속 움직이므로 시간 단위 버킷도 버전에 포함 (기본 모드는 랜덤이라 ETag 없음)
+            cached = check_etag(request, response, db, "search", keyword, seven_days.strftime("%Y%m%d%H"))
+            if cached:
+                return cached
+
             items = (
                 db.query(NewsFeed)
                 .filter(
@@ -111,9 +121,9 @@ def public_home(
 # 🔍 2. 검색 / 개인화 트렌드 (Search & Trend)
 # ============================================================
 @router.get("/search")
-def search_home(keyword: str, db: Session = Depends(get_db)):
+def search_home(keyword: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """키워드 검색 결과를 반환 (프론트엔드 API 통일용)"""
-    return public_home(keyword=keyword, db=db)
+    return public_home(request=request, response=response, keyword=keyword, db=db)
 
 
 @router.get("/trend/recommend")
@@ -132,10 +142,15 @@ async def trend_recommend(current_user=Depends(get_current_user)):
 # ============================================================
 @router.get("/news/latest")
 def get_latest_news(
+    request: Request,
+    response: Response,
     limit: int = Query(10, description="가져올 뉴스 개수"),
     db: Session = Depends(get_db)
 ):
     """최신 뉴스 단순 목록 조회"""
+    cached = check_etag(request, response, db, "latest", limit)
+    if cached:
+        return cached
     try:
         news = (
             db.query(NewsFeed)
@@ -0,0 +1,41 @@
+# backend/routers/leaderboard_router.py
+# flake8: noqa
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from database.mariadb import get_db
+from services.leaderboard_service import get_top, get_my_rank, get_around
+from schemas.leaderboard_schema import LeaderboardEntry, MyRankResponse
+
+router = APIRouter(prefix="/api/leaderboard", tags=["Leaderboard"])
+
+
+# ===================================================================
+# 🏆 1) 상위 N명
+# ===================================================================
+@router.get("/top", response_model=list[LeaderboardEntry])
+def api_leaderboard_top(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    return get_top(db, limit)
+
+
+# ===================================================================
+# 🏆 2) 내 순위
+# ===================================================================
+@router.get("/rank/{user_id}", response_model=MyRankResponse)
+def api_leaderboard_rank(user_id: int, db: Session = Depends(get_db)):
+    entry = get_my_rank(db, user_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="User not found")
+    return entry
+
+
+# ===================================================================
+# 🏆 3) 내 주변 순위 (위아래 radius명)
+# ===================================================================
+@router.get("/around/{user_id}", response_model=list[LeaderboardEntry])
+def api_leaderboard_around(user_id: int, radius: int = Query(5, ge=0, le=50), db: Session = Depends(get_db)):
+    entries = get_around(db, user_id, radius)
+    if entries is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return entries
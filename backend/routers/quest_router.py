@@ -39,9 +39,10 @@ def api_complete_quest(user_id: int, quest_id: int, db: Session = Depends(get_db
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
 
+    # LearningQuest.completed는 전역 값 → 응답에는 이 유저의 완료 상태를 반영
     return {
         "message": "Quest completed successfully!",
-        "quest": quest,
+        "quest": QuestResponse.model_validate(quest, from_attributes=True).model_copy(update={"completed": True}),
     }
 
 
@@ -1,25 +1,48 @@
 # backend/routers/roadmap_router.py
 # flake8: noqa
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
+from core.http_cache import make_etag, is_not_modified, not_modified, set_etag
 from database.mariadb import get_db
-from services.roadmap_service import get_roadmap, complete_node
+from services.roadmap_cache import get_compiled_track
+from services.roadmap_service import get_roadmap, get_roadmap_version, complete_node
 from schemas.roadmap_schema import RoadmapResponse, NodeCompleteResponse
 
 router = APIRouter(prefix="/api/roadmap", tags=["Roadmap"])
 
 
+def _roadmap_response(request: Request, response: Response, db: Session, track_slug: str, user_id: int | None):
+    """
+    트랙 version (+ 유저 진행도 version)으로 ETag 비교 → 같으면 304, 아니면 로드맵 조회
+    컴파일된 트랙은 한 번만 읽어 ETag와 본문에 같이 사용
+    → 로드맵 dict | 304 Response | None (트랙 없음)
+    """
+    ct = get_compiled_track(db, track_slug)
+    if not ct:
+        return None
+
+    version = get_roadmap_version(db, track_slug, user_id, ct=ct)
+    etag = make_etag("roadmap", track_slug, *version) if version else None
+    if etag and is_not_modified(request, etag):
+        return not_modified(etag)
+
+    data = get_roadmap(db, track_slug, user_id, ct=ct)
+    if data and etag:
+        set_etag(response, etag)
+    return data
+
+
 # ================================================================
 # ⭐ 1) Public Web 로드맵
 # ================================================================
 @router.get("/public", response_model=RoadmapResponse)
-def api_public_roadmap(db: Session = Depends(get_db)):
+def api_public_roadmap(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     slug를 DB에 실제 존재하는 public slug로 고정
     """
-    data = get_roadmap(db, "web-roadmap", user_id=None)  # ← 여기를 DB slug에 맞춰야 함
+    data = _roadmap_response(request, response, db, "web-roadmap", user_id=None)  # ← 여기를 DB slug에 맞춰야 함
     if not data:
         raise HTTPException(status_code=404, detail="Public roadmap not found")
     return data
@@ -29,11 +52,11 @@ def api_public_roadmap(db: Session = Depends(get_db)):
 # ⭐ 2) Personal 로드맵
 # ================================================================
 @router.get("/personal/{user_id}", response_model=RoadmapResponse)
-def api_personal_roadmap(user_id: int, db: Session = Depends(get_db)):
+def api_personal_roadmap(user_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     생활코딩 개인 로드맵 제공 (slug 고정)
     """
-    data = get_roadmap(db, "life-coding", user_id)
+    data = _roadmap_response(request, response, db, "life-coding", user_id)
     if not data:
         raise HTTPException(status_code=404, detail="Personal roadmap not found")
     return data
@@ -44,11 +67,12 @@ def api_personal_roadmap(user_id: int, db: Session = Depends(get_db)):
 # ================================================================
 @router.post("/complete/{user_id}/{node_db_id}", response_model=NodeCompleteResponse)
 def api_complete_node(user_id: int, node_db_id: int, db: Session = Depends(get_db)):
-    progress = complete_node(db, user_id, node_db_id)
-    if not progress:
+    result = complete_node(db, user_id, node_db_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Node not found")
 
-    return {"message": "Node completed", "status": progress.status}
+    message = "Node already completed" if result["already_completed"] else "Node completed"
+    return {"message": message, "status": result["status"]}
 
 
 # ================================================================
@@ -63,8 +87,8 @@ def api_track_list(db: Session = Depends(get_db)):
 # ⭐ 5) Public slug 조회 (/web-basic, /html-basic 등)
 # ================================================================
 @router.get("/{track_slug}", response_model=RoadmapResponse)
-def api_get_roadmap_no_user(track_slug: str, db: Session = Depends(get_db)):
-    data = get_roadmap(db, track_slug, user_id=None)
+def api_get_roadmap_no_user(track_slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    data = _roadmap_response(request, response, db, track_slug, user_id=None)
     if not data:
         raise HTTPException(status_code=404, detail="Track not found")
     return data
@@ -74,8 +98,8 @@ def api_get_roadmap_no_user(track_slug: str, db: Session = Depends(get_db)):
 # ⭐ 6) Personal slug 조회 (/web-basic/3)
 # ================================================================
 @router.get("/{track_slug}/{user_id}", response_model=RoadmapResponse)
-def api_get_roadmap(track_slug: str, user_id: int, db: Session = Depends(get_db)):
-    data = get_roadmap(db, track_slug, user_id)
+def api_get_roadmap(track_slug: str, user_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    data = _roadmap_response(request, response, db, track_slug, user_id)
     if not data:
         raise HTTPException(status_code=404, detail="Track not found")
     return data
@@ -11,7 +11,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from database.mariadb import SessionLocal
+from database.mariadb import get_db
+from core.security import get_hash_pool_stats
 from schemas.user_schema import UserRegister, UserLogin, AuthResponse
 from services.user_service import (
     register_user,
@@ -24,13 +25,6 @@ from services.user_service import (
 # 통합 라우터 (Prefix는 main.py에서 /api로 설정한다고 가정하거나, 여기서 하위 경로 지정)
 router = APIRouter(tags=["User & Auth"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ----------------------------------------------------
 # 🔐 Auth (경로: /api/auth/...)
 # ----------------------------------------------------
@@ -41,12 +35,17 @@ def check_email_api(email: str, db: Session = Depends(get_db)):
     return {"exists": exists}
 
 @router.post("/auth/register", response_model=AuthResponse)
-def register_api(user: UserRegister, db: Session = Depends(get_db)):
-    return register_user(db, user)
+async def register_api(user: UserRegister, db: Session = Depends(get_db)):
+    return await register_user(db, user)
 
 @router.post("/auth/login")
-def login_api(user: UserLogin, db: Session = Depends(get_db)):
-    return authenticate_user(db, user)
+async def login_api(user: UserLogin, db: Session = Depends(get_db)):
+    return await authenticate_user(db, user)
+
+@router.get("/auth/hash-stats")
+def hash_stats_api():
+    """bcrypt 워커 풀 상태 (대기열 깊이 / 평균 대기·처리 시간 / 거절 수)"""
+    return get_hash_pool_stats()
 
 
 # ----------------------------------------------------
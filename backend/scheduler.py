@@ -10,9 +10,14 @@ import threading
 # ✅ 변경: 통합된 서비스에서 함수 가져오기
 from services.home_service import run_news_pipeline  # News + Trend 통합됨
 # from services.career_service import run_career_pipeline
-from services.dev_service import save_posts
+from services.dev_service import save_posts, refresh_topic_clusters
 from services.dev_scraper import crawl_okky, crawl_devto # ✅ 함수명 변경 반영
 
+from services.user_service import load_email_filter
+from services.quest_recommender import precompute_today_quests
+from services.xp_service import compact_xp_ledger
+from services.leaderboard_service import leaderboard
+
 from database.mariadb import SessionLocal
 
 KST = timezone("Asia/Seoul")
@@ -59,12 +64,73 @@ def auto_update_dev():
         print(f"  • OKKY   → inserted={inserted1}, updated={updated1}")
         print(f"  • Dev.to → inserted={inserted2}, updated={updated2}")
 
+        # 🧮 토픽 클러스터 스냅샷 갱신 (insight API는 스냅샷만 읽음)
+        refresh_topic_clusters(db)
+
     except Exception as e:
         print("❌ Dev 업데이트 오류:", e)
     finally:
         db.close()
 
 
+# -------------------------------------------------------------
+# 🌸 이메일 Bloom Filter 재생성 (다른 워커에서 가입한 이메일 반영)
+# -------------------------------------------------------------
+def auto_refresh_email_filter():
+    db = SessionLocal()
+    try:
+        load_email_filter(db)
+    except Exception as e:
+        print("❌ Email Bloom Filter 재생성 오류:", e)
+    finally:
+        db.close()
+
+
+# -------------------------------------------------------------
+# 🎯 오늘의 퀘스트 미리 계산 (KST 자정 이후, 활성 유저 전체)
+# -------------------------------------------------------------
+def auto_precompute_today_quests():
+    print("🕒 [스케줄러] 오늘의 퀘스트 배치 계산 실행")
+    db = SessionLocal()
+    try:
+        count = precompute_today_quests(db)
+        print(f"🎯 오늘의 퀘스트 배치 완료: {count}명")
+    except Exception as e:
+        db.rollback()
+        print("❌ 오늘의 퀘스트 배치 오류:", e)
+    finally:
+        db.close()
+
+
+# -------------------------------------------------------------
+# ⭐ XP 원장 → UserProfile 반영
+# -------------------------------------------------------------
+def auto_compact_xp_ledger():
+    db = SessionLocal()
+    try:
+        folded = compact_xp_ledger(db)
+        if folded:
+            print(f"⭐ XP 원장 반영: {folded}건")
+    except Exception as e:
+        db.rollback()
+        print("❌ XP 원장 반영 오류:", e)
+    finally:
+        db.close()
+
+
+# -------------------------------------------------------------
+# 🏆 리더보드 동기화 (다른 워커에서 반영된 XP 변경분)
+# -------------------------------------------------------------
+def auto_sync_leaderboard():
+    db = SessionLocal()
+    try:
+        leaderboard.sync(db)
+    except Exception as e:
+        print("❌ 리더보드 동기화 오류:", e)
+    finally:
+        db.close()
+
+
 # -------------------------------------------------------------
 # 🚀 스케줄러 시작
 # -------------------------------------------------------------
@@ -94,6 +160,38 @@ def start_scheduler():
         id="dev-cron",
     )
 
+    # 🌸 Email Bloom Filter: 30분 간격
+    scheduler.add_job(
+        auto_refresh_email_filter,
+        CronTrigger(minute="*/30"),
+        id="email-filter-cron",
+    )
+
+    # 🎯 Daily Quest: 매일 00:10 (KST)
+    scheduler.add_job(
+        auto_precompute_today_quests,
+        CronTrigger(hour=0, minute=10),
+        id="today-quests-cron",
+    )
+
+    # ⭐ XP 원장: 1분 간격
+    scheduler.add_job(
+        auto_compact_xp_ledger,
+        CronTrigger(minute="*"),
+        id="xp-ledger-cron",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # 🏆 Leaderboard: 1분 간격 (XP 원장 반영 직후)
+    scheduler.add_job(
+        auto_sync_leaderboard,
+        CronTrigger(minute="*", second=30),
+        id="leaderboard-cron",
+        max_instances=1,
+        coalesce=True,
+    )
+
     scheduler.start()
     print("🕐 스케줄러 실행됨 (뉴스 + Career + DevFeed)")
 
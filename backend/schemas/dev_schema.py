@@ -69,9 +69,11 @@ class TagSearchResponse(BaseModel):
 class TopicInsightItem(BaseModel):
     topic: str
     count: int
+    terms: List[str] = []
 
 class TopicInsightResponse(BaseModel):
     clusters: List[TopicInsightItem]
+    snapshot_at: Optional[datetime] = None
 
 class IssueInsightItem(BaseModel):
     category: str
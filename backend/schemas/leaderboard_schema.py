@@ -0,0 +1,23 @@
+# backend/schemas/leaderboard_schema.py
+# flake8: noqa
+
+from pydantic import BaseModel
+
+
+# -----------------------------------------------------------
+# 🏆 리더보드 한 줄
+# -----------------------------------------------------------
+class LeaderboardEntry(BaseModel):
+    rank: int                      # 동점이면 같은 순위 (1, 2, 2, 4 ...)
+    user_id: int
+    username: str | None = None
+    title: str | None = None
+    level: int
+    current_xp: int
+
+
+# -----------------------------------------------------------
+# 🏆 내 순위 (+ 전체 인원)
+# -----------------------------------------------------------
+class MyRankResponse(LeaderboardEntry):
+    total: int
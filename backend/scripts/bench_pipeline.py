@@ -0,0 +1,70 @@
+# backend/scripts/bench_pipeline.py
+# flake8: noqa
+"""
+⏱️ 파이프라인 벤치마크
+run_news_pipeline / crawl_devto / chat_with_ai 를 실행 시간과 LLM 게이트웨이 통계와 함께 측정합니다.
+오프라인 환경에서는 scripts/llm_stub_server.py 를 먼저 띄우고 env를 stub 주소로 지정하세요.
+
+사용법:
+    python scripts/bench_pipeline.py                    # 전체
+    python scripts/bench_pipeline.py --skip-news        # DB 없이 (뉴스 파이프라인은 DB 저장 포함)
+    python scripts/bench_pipeline.py --devto-limit 50 --chat-rounds 20
+"""
+
+import sys, os
+import json
+import time
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.llm_chain import get_llm_stats
+
+
+def timed(label, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    print(f"   ⏱️ {label:<20} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="News / Dev.to / AI Chat 파이프라인 벤치마크")
+    parser.add_argument("--skip-news", action="store_true")
+    parser.add_argument("--devto-limit", type=int, default=20)
+    parser.add_argument("--chat-rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"🔧 OPENAI_BASE_URL={os.getenv('OPENAI_BASE_URL', '(OpenAI)')}")
+    results = {}
+
+    # 1) 뉴스 파이프라인 (RSS → 본문 → LLM 분석 → DB 저장)
+    if not args.skip_news:
+        from services.home_service import run_news_pipeline
+        _, results["news_pipeline_s"] = timed("run_news_pipeline", run_news_pipeline)
+
+    # 2) Dev.to 수집 + 요약
+    from services.dev_scraper import crawl_devto
+    items, results["crawl_devto_s"] = timed("crawl_devto", crawl_devto, limit=args.devto_limit)
+    results["devto_items"] = len(items)
+
+    # 3) AI 커리어 나침반 대화 (4턴)
+    from services.ai_service import chat_with_ai
+
+    def chat_rounds():
+        for r in range(args.chat_rounds):
+            messages = []
+            for turn in range(4):
+                messages.append({"role": "user", "content": f"라운드 {r} 답변 {turn}: 논리적인 구조가 좋아요"})
+                messages.append({"role": "assistant", "content": chat_with_ai(messages)})
+
+    _, results["chat_s"] = timed(f"chat x{args.chat_rounds}", chat_rounds)
+
+    print("\n📊 LLM Gateway Stats")
+    print(json.dumps({"timings": results, "llm": get_llm_stats()}, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
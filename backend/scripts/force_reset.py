@@ -5,8 +5,8 @@ import os
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.mariadb import engine, Base
-from scripts.seed_roadmap import seed_data
+from database.mariadb import engine, Base, SessionLocal
+from scripts.seed_roadmap import seed_roadmaps
 
 def reset_database():
     print("💥 [Danger] 기존 데이터베이스 테이블을 모두 삭제합니다...")
@@ -24,7 +24,11 @@ def reset_database():
 
     # 3. 데이터 채우기 (Seed)
     print("🌱 Seeding data...")
-    seed_data()
+    db = SessionLocal()
+    try:
+        seed_roadmaps(db)
+    finally:
+        db.close()
     print("✨ DB Reset & Seed Completed Successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,255 @@
+# backend/scripts/llm_stub_server.py
+# flake8: noqa
+"""
+🧪 오프라인 LLM Stub 서버 (OpenAI 호환)
+OpenAI / Dev.to / 뉴스 RSS 없이도 파이프라인을 end-to-end로 프로파일링하기 위한 로컬 서버입니다.
+같은 입력에는 항상 같은 응답(내용 / 지연시간 / 오류 여부)을 돌려줍니다.
+
+제공 경로:
+    POST /v1/chat/completions     : OpenAI Chat Completions 호환 (json_object 응답 포함)
+    GET  /devto/api/articles      : Dev.to articles API 형태의 고정 데이터
+    GET  /rss/<n>.xml             : 기사 3개짜리 RSS 피드
+    GET  /news/<slug>             : 기사 본문 HTML
+
+환경 변수:
+    LLM_STUB_PORT        (기본 8899)
+    LLM_STUB_LATENCY_MS  응답 기본 지연 (기본 300)
+    LLM_STUB_JITTER_MS   입력 해시 기반 추가 지연 최대값 (기본 100)
+    LLM_STUB_ERROR_RATE  429/500 오류 비율 0~1 (기본 0)
+    LLM_STUB_SEED        결정적 응답용 시드 (기본 42)
+    LLM_STUB_MAX_TRACKED 재시도 횟수를 기억할 실패 프롬프트 수 상한 (기본 10000)
+
+사용법:
+    python scripts/llm_stub_server.py
+    export OPENAI_BASE_URL=http://127.0.0.1:8899/v1
+    export DEVTO_API_URL=http://127.0.0.1:8899/devto/api/articles
+    export NEWS_FEEDS=http://127.0.0.1:8899/rss/1.xml,http://127.0.0.1:8899/rss/2.xml
+    python scripts/bench_pipeline.py
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+PORT = int(os.getenv("LLM_STUB_PORT", "8899"))
+LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "300"))
+JITTER_MS = float(os.getenv("LLM_STUB_JITTER_MS", "100"))
+ERROR_RATE = float(os.getenv("LLM_STUB_ERROR_RATE", "0"))
+SEED = os.getenv("LLM_STUB_SEED", "42")
+MAX_TRACKED = int(os.getenv("LLM_STUB_MAX_TRACKED", "10000"))
+
+CATEGORIES = ["ai", "cloud", "security", "backend", "frontend", "data", "etc"]
+TOPICS = [
+    ("React", "react"), ("FastAPI", "python"), ("Kubernetes", "devops"), ("LLM", "ai"),
+    ("Docker", "docker"), ("TypeScript", "javascript"), ("PostgreSQL", "database"), ("Rust", "rust"),
+]
+BASE_TIME = datetime(2025, 1, 1)
+
+# 같은 프롬프트가 몇 번째로 들어왔는지 (재시도 시 다른 오류 판정을 받도록)
+# 성공하면 지우고, 끝내 성공하지 못한 프롬프트는 오래된 것부터 MAX_TRACKED개까지만 유지
+_attempts = OrderedDict()
+_attempts_lock = threading.Lock()
+
+
+# -----------------------------------------------------------
+# 결정적 난수 (시드 + 입력 → 0~1)
+# -----------------------------------------------------------
+def _digest(*parts) -> bytes:
+    h = hashlib.sha256(SEED.encode())
+    for p in parts:
+        h.update(str(p).encode())
+    return h.digest()
+
+
+def _unit(*parts) -> float:
+    return int.from_bytes(_digest(*parts)[:8], "big") / 2 ** 64
+
+
+def _pick(options, *parts):
+    return options[int(_unit(*parts) * len(options))]
+
+
+# -----------------------------------------------------------
+# Chat Completions 응답 생성
+# -----------------------------------------------------------
+def _extract_title(prompt: str) -> str:
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("[제목]"):
+            return line.replace("[제목]", "").strip() or "기술 소식"
+    return prompt.strip().splitlines()[0][:40] if prompt.strip() else "기술 소식"
+
+
+def build_completion(body: dict) -> str:
+    messages = body.get("messages", [])
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    user_turns = [m for m in messages if m.get("role") == "user"]
+    is_json = (body.get("response_format") or {}).get("type") == "json_object"
+
+    # 1) 뉴스 분석 (JSON)
+    if is_json:
+        title = _extract_title(prompt)
+        words = [w for w in title.replace(",", " ").split() if len(w) > 1][:3] or ["IT"]
+        return json.dumps({
+            "summary": f"{title} 관련 소식입니다. 주요 변화와 영향을 정리했습니다. 후속 발표가 예상됩니다.",
+            "category": _pick(CATEGORIES, prompt),
+            "keywords": words,
+        }, ensure_ascii=False)
+
+    # 2) AI 커리어 나침반 (system prompt에 결과 태그 규칙이 있음)
+    if any(m.get("role") == "system" and "RECOMMEND" in str(m.get("content")) for m in messages):
+        if len(user_turns) < 3:
+            return "눈에 보이는 결과를 바로 확인하는 게 좋나요, 아니면 보이지 않는 논리 구조를 짜는 게 좋나요?"
+        tag = _pick(["FRONTEND", "BACKEND", "AI"], prompt)
+        return f"답변을 보니 잘 어울리는 방향이 보이네요!\n[RECOMMEND: {tag}]"
+
+    # 3) 그 밖의 요약
+    title = _extract_title(prompt)
+    return f"{title}에 대한 요약입니다. 핵심 기술 내용을 간단히 정리했습니다. 실무 적용 시 참고할 만합니다."
+
+
+# -----------------------------------------------------------
+# Dev.to / RSS / 기사 고정 데이터
+# -----------------------------------------------------------
+def devto_articles(per_page: int, base: str):
+    items = []
+    for i in range(per_page):
+        name, tag = TOPICS[i % len(TOPICS)]
+        items.append({
+            "id": 900000 + i,
+            "title": f"{name} tips #{i}: building faster apps",
+            "url": f"{base}/news/devto-{i}",
+            "description": f"Practical {name} notes for production ({i}).",
+            "user": {"username": f"writer{i % 7}"},
+            "tag_list": [tag, "webdev"],
+            "public_reactions_count": int(_unit("likes", i) * 300),
+            "comments_count": int(_unit("comments", i) * 40),
+            "page_views_count": int(_unit("views", i) * 5000),
+            "published_at": (BASE_TIME + timedelta(hours=i)).isoformat() + "Z",
+        })
+    return items
+
+
+def rss_feed(feed_no: str, base: str) -> str:
+    items = "".join(
+        f"<item><title>Stub feed {feed_no} article {j}: {TOPICS[j % len(TOPICS)][0]} update</title>"
+        f"<link>{base}/news/feed{feed_no}-{j}</link></item>"
+        for j in range(3)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>stub {feed_no}</title>{items}</channel></rss>'
+
+
+def article_html(slug: str) -> str:
+    body = " ".join(f"{slug} 문단 {k}: 신규 기능과 성능 개선 내용을 다룹니다." for k in range(20))
+    return f"<html><body><article>{body}</article></body></html>"
+
+
+# -----------------------------------------------------------
+# HTTP 핸들러
+# -----------------------------------------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, payload, content_type="application/json", headers=None):
+        data = payload if isinstance(payload, bytes) else (
+            payload.encode() if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False).encode()
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _base(self) -> str:
+        return f"http://{self.headers.get('Host', f'127.0.0.1:{PORT}')}"
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+
+        if path.startswith("/devto/api/articles"):
+            per_page = int(parse_qs(parsed.query).get("per_page", ["20"])[0])
+            return self._send(200, devto_articles(per_page, self._base()))
+        if path.startswith("/rss/"):
+            feed_no = path.rsplit("/", 1)[-1].replace(".xml", "")
+            return self._send(200, rss_feed(feed_no, self._base()), "application/rss+xml")
+        if path.startswith("/news/"):
+            return self._send(200, article_html(path.rsplit("/", 1)[-1]), "text/html; charset=utf-8")
+        if path == "/health":
+            return self._send(200, {"status": "ok"})
+        return self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._send(404, {"error": {"message": "not found"}})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        key = json.dumps(body.get("messages", []), ensure_ascii=False, sort_keys=True)
+
+        attempt_key = _digest(key)
+        with _attempts_lock:
+            attempt = _attempts.pop(attempt_key, 0)
+            _attempts[attempt_key] = attempt + 1
+            while len(_attempts) > MAX_TRACKED:
+                _attempts.popitem(last=False)
+
+        time.sleep((LATENCY_MS + JITTER_MS * _unit("latency", key)) / 1000)
+
+        if ERROR_RATE and _unit("error", key, attempt) < ERROR_RATE:
+            if attempt % 2 == 0:
+                return self._send(
+                    429, {"error": {"message": "stub rate limit", "type": "rate_limit_exceeded"}},
+                    headers={"Retry-After": "0"},
+                )
+            return self._send(500, {"error": {"message": "stub server error", "type": "server_error"}})
+
+        with _attempts_lock:
+            _attempts.pop(attempt_key, None)
+
+        content = build_completion(body)
+        prompt_tokens = max(1, len(key) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        self._send(200, {
+            "id": "chatcmpl-stub-" + _digest(key).hex()[:12],
+            "object": "chat.completion",
+            "created": int(BASE_TIME.timestamp()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", PORT), StubHandler)
+    print(f"🧪 LLM Stub Server → http://127.0.0.1:{PORT}/v1 "
+          f"(latency={LATENCY_MS}ms±{JITTER_MS}, error_rate={ERROR_RATE})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
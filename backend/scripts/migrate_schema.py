@@ -0,0 +1,285 @@
+# backend/scripts/migrate_schema.py
+# flake8: noqa
+"""
+🛠️ 기존 DB 스키마 업그레이드
+init_db()의 create_all은 새 테이블만 만들고, 이미 있는 테이블에 컬럼 / 인덱스 / 유니크 키를
+추가하지 않습니다. 모델에 추가된 스키마를 기존 DB에 반영하는 스크립트입니다.
+
+- 새 테이블은 create_all로 먼저 생성
+- 요청(변경)별 단계가 없는 컬럼 / 인덱스만 추가 → 여러 번 실행해도 안전
+- 유니크 키를 걸기 전에 중복 행을 정리 (어떤 행을 남길지는 단계마다 명시)
+- 데이터 채우기(backfill)는 모든 DDL이 끝난 뒤 실행
+
+사용법:
+    python scripts/migrate_schema.py
+"""
+
+import sys, os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.orm import Session
+
+from database.mariadb import engine
+from database.models import Base, DevPost, new_track_version
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+# -----------------------------------------------------------
+# 공통 헬퍼 (있으면 건너뜀)
+# -----------------------------------------------------------
+def has_column(conn, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn, table: str, name: str) -> bool:
+    insp = inspect(conn)
+    names = {i["name"] for i in insp.get_indexes(table)}
+    names |= {u["name"] for u in insp.get_unique_constraints(table)}
+    return name in names
+
+
+def add_column(conn, table: str, column: str, ddl: str) -> bool:
+    if has_column(conn, table, column):
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    print(f"   ➕ {table}.{column}")
+    return True
+
+
+def add_index(conn, table: str, name: str, columns: str, unique: bool = False) -> bool:
+    if has_index(conn, table, name):
+        return False
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} {name} ON {table} ({columns})"))
+    print(f"   ➕ {kind} {name} ON {table} ({columns})")
+    return True
+
+
+def drop_index(conn, table: str, name: str) -> bool:
+    if not has_index(conn, table, name):
+        return False
+    conn.execute(text(f"DROP INDEX {name} ON {table}"))
+    print(f"   ➖ INDEX {name} ON {table}")
+    return True
+
+
+def dedupe(conn, table: str, keys, prefer: str = "0") -> int:
+    """
+    keys가 같은 행 중 한 행만 남기고 삭제 (유니크 키 추가 전 정리).
+    prefer({t} = 테이블 별칭) 값이 큰 행, 같으면 id가 작은 행을 남김. NULL 키는 유니크 대상이 아니므로 그대로.
+    """
+    join = " AND ".join(f"k.{c} = t.{c}" for c in keys)
+    pk, pt = prefer.format(t="k"), prefer.format(t="t")
+    res = conn.execute(text(f"""
+        DELETE FROM {table} WHERE id IN (
+            SELECT id FROM (
+                -- DISTINCT: 파생 테이블을 물질화시켜 MySQL의 "같은 테이블 DELETE + SELECT"(1093) 회피
+                SELECT DISTINCT t.id FROM {table} t
+                JOIN {table} k ON {join}
+                 AND (({pk}) > ({pt}) OR (({pk}) = ({pt}) AND k.id < t.id))
+            ) AS dup
+        )
+    """))
+    if res.rowcount:
+        print(f"   🧹 {table}: 중복 {res.rowcount}행 삭제")
+    return res.rowcount
+
+
+def count_duplicates(conn, table: str, keys) -> int:
+    cols = ", ".join(keys)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in keys)
+    return conn.execute(text(f"""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM {table} WHERE {not_null} GROUP BY {cols} HAVING COUNT(*) > 1
+        ) AS dup
+    """)).scalar()
+
+
+# ===========================================================
+# 요청별 단계: (conn) → 모든 DDL 이후 실행할 backfill 함수 목록
+# ===========================================================
+def step_dev_hot_score(conn):
+    """[user-030] dev 피드 hot 정렬: dev_posts.hot_score + 정렬 인덱스"""
+    added = add_column(conn, "dev_posts", "hot_score", "DOUBLE DEFAULT 0")
+    add_index(conn, "dev_posts", "ix_dev_posts_source_hot", "source, hot_score")
+    add_index(conn, "dev_posts", "ix_dev_posts_hot", "hot_score")
+    if not added:
+        return []
+
+    def backfill():
+        # 기존 글의 hot_score 계산 (id 순으로 BACKFILL_BATCH_SIZE씩 bulk UPDATE)
+        from services.dev_service import compute_hot_score
+        total, last_id = 0, 0
+        with Session(engine) as db:
+            while True:
+                rows = (
+                    db.query(
+                        DevPost.id, DevPost.like_count, DevPost.comment_count, DevPost.view_count,
+                        DevPost.published_at, DevPost.crawled_at,
+                    )
+                    .filter(DevPost.id > last_id)
+                    .order_by(DevPost.id)
+                    .limit(BACKFILL_BATCH_SIZE)
+                    .all()
+                )
+                if not rows:
+                    break
+                db.execute(update(DevPost), [
+                    {"id": r.id, "hot_score": compute_hot_score(
+                        r.like_count, r.comment_count, r.view_count, r.published_at, r.crawled_at
+                    )}
+                    for r in rows
+                ])
+                db.commit()
+                total += len(rows)
+                last_id = rows[-1].id
+        print(f"   🔥 dev_posts.hot_score: {total}행")
+    return [backfill]
+
+
+def step_track_version(conn):
+    """[user-035] 로드맵 캐시 무효화 기준: skill_tracks.version"""
+    if add_column(conn, "skill_tracks", "version", "BIGINT NOT NULL DEFAULT 0"):
+        conn.execute(
+            text("UPDATE skill_tracks SET version = :v WHERE version = 0"),
+            {"v": new_track_version()},
+        )
+    return []
+
+
+def step_quest_progress(conn):
+    """[user-038] 유저별 퀘스트 완료 기록: node_db_id 사본 + (user_id, quest_id) 유니크 + 노드 카운터"""
+    added = add_column(conn, "user_quest_progress", "node_db_id", "INTEGER NULL")
+    if added:
+        if conn.dialect.name == "mysql":
+            conn.execute(text(
+                "ALTER TABLE user_quest_progress "
+                "ADD FOREIGN KEY (node_db_id) REFERENCES skill_nodes (id)"
+            ))
+        conn.execute(text("""
+            UPDATE user_quest_progress
+               SET node_db_id = (
+                   SELECT q.node_db_id FROM learning_quests q
+                    WHERE q.id = user_quest_progress.quest_id
+               )
+             WHERE node_db_id IS NULL
+        """))
+
+    # 완료 기록을 남김
+    dedupe(conn, "user_quest_progress", ("user_id", "quest_id"), "{t}.status = 'completed'")
+    add_index(conn, "user_quest_progress", "uq_user_quest_progress", "user_id, quest_id", unique=True)
+    add_index(conn, "user_quest_progress", "ix_user_quest_progress_user_node", "user_id, node_db_id")
+
+    if added:
+        # 기존 완료 기록으로 노드 카운터 재계산 (없으면 완료 1건부터 다시 세게 됨)
+        res = conn.execute(text("""
+            INSERT INTO user_node_quest_counters
+                (user_id, node_db_id, completed_count, total_count, updated_at)
+            SELECT p.user_id, p.node_db_id, COUNT(*),
+                   (SELECT COUNT(*) FROM learning_quests q WHERE q.node_db_id = p.node_db_id),
+                   UTC_TIMESTAMP()
+              FROM user_quest_progress p
+             WHERE p.status = 'completed' AND p.node_db_id IS NOT NULL
+             GROUP BY p.user_id, p.node_db_id
+            ON DUPLICATE KEY UPDATE
+                completed_count = VALUES(completed_count),
+                total_count = VALUES(total_count)
+        """))
+        print(f"   🔢 user_node_quest_counters: {res.rowcount}행")
+    return []
+
+
+def step_node_progress_unique(conn):
+    """[user-039] 노드 완료 upsert 키: user_node_progress (user_id, node_db_id) 유니크"""
+    # COMPLETED > UNLOCKED > LOCKED 순으로 남김
+    dedupe(
+        conn, "user_node_progress", ("user_id", "node_db_id"),
+        "CASE {t}.status WHEN 'COMPLETED' THEN 2 WHEN 'UNLOCKED' THEN 1 ELSE 0 END",
+    )
+    add_index(conn, "user_node_progress", "uq_user_node_progress", "user_id, node_db_id", unique=True)
+    return []
+
+
+def step_dev_updated_at(conn):
+    """[user-040] dev ETag 버전: dev_posts.updated_at + 인덱스"""
+    if add_column(conn, "dev_posts", "updated_at", "DATETIME NULL"):
+        conn.execute(text("UPDATE dev_posts SET updated_at = crawled_at WHERE updated_at IS NULL"))
+    add_index(conn, "dev_posts", "ix_dev_posts_updated", "updated_at")
+    # 초기 버전이 만들었던 crawled_at 인덱스는 더 이상 쓰지 않음
+    drop_index(conn, "dev_posts", "ix_dev_posts_crawled")
+    return []
+
+
+def step_quest_url_index(conn):
+    """[user-042] 자동 생성 퀘스트 url 조회: learning_quests.url 인덱스"""
+    add_index(conn, "learning_quests", "ix_learning_quests_url", "url")
+    return []
+
+
+def step_today_quests_unique(conn):
+    """[user-043] 오늘의 퀘스트 중복 배정 방지: user_today_quests (user_id, date_key, quest_id) 유니크"""
+    dedupe(conn, "user_today_quests", ("user_id", "date_key", "quest_id"))
+    add_index(
+        conn, "user_today_quests", "uq_user_today_quests", "user_id, date_key, quest_id", unique=True
+    )
+    return []
+
+
+def step_leaderboard_indexes(conn):
+    """[user-048] 리더보드 재구성 / 증분 동기화: user_profiles 인덱스"""
+    add_index(conn, "user_profiles", "ix_user_profiles_level_xp", "level, current_xp")
+    add_index(conn, "user_profiles", "ix_user_profiles_updated_at", "updated_at")
+    return []
+
+
+def step_seed_upsert_keys(conn):
+    """[user-050] seed upsert 키: skill_nodes (track_id, node_id) / learning_quests (node_db_id, url) 유니크"""
+    # 두 테이블은 다른 테이블이 참조하므로 자동 삭제하지 않음 → 중복이 있으면 seed_all로 초기화 후 재실행
+    for table, name, keys in (
+        ("skill_nodes", "uq_skill_nodes_track_node", ("track_id", "node_id")),
+        ("learning_quests", "uq_learning_quests_node_url", ("node_db_id", "url")),
+    ):
+        if has_index(conn, table, name):
+            continue
+        dup = count_duplicates(conn, table, keys)
+        if dup:
+            print(f"   ⚠️ {table}: 중복 키 {dup}개 → {name} 건너뜀 (python scripts/seed_all.py 후 다시 실행)")
+            continue
+        add_index(conn, table, name, ", ".join(keys), unique=True)
+    return []
+
+
+STEPS = [
+    step_dev_hot_score,
+    step_track_version,
+    step_quest_progress,
+    step_node_progress_unique,
+    step_dev_updated_at,
+    step_quest_url_index,
+    step_today_quests_unique,
+    step_leaderboard_indexes,
+    step_seed_upsert_keys,
+]
+
+
+def migrate():
+    print("🛠️ [Migrate] 새 테이블 생성 (create_all)...")
+    Base.metadata.create_all(bind=engine)
+
+    backfills = []
+    for step in STEPS:
+        print(f"🔧 {step.__doc__}")
+        with engine.begin() as conn:
+            backfills += step(conn)
+
+    for backfill in backfills:
+        backfill()
+    print("✅ 스키마 업그레이드 완료!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,71 @@
+# backend/scripts/reclassify_dev_posts.py
+# flake8: noqa
+"""
+🔁 DevPost 토픽/이슈 재분류 Backfill
+TOPIC_KEYWORDS / ISSUE_MAP 을 수정한 뒤 기존 글의 topic_primary / issue_primary 를 다시 계산합니다.
+
+사용법:
+    python scripts/reclassify_dev_posts.py              # 체크포인트부터 이어서 실행
+    python scripts/reclassify_dev_posts.py --restart    # 처음부터 다시 실행
+    python scripts/reclassify_dev_posts.py --batch-size 5000
+"""
+
+import sys, os
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from services.dev_service import reclassify_posts, RECLASSIFY_BATCH_SIZE
+
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "scripts", ".reclassify_dev_posts.ckpt")
+
+
+# -----------------------------------------------------------
+# 체크포인트 (마지막으로 커밋된 DevPost.id)
+# -----------------------------------------------------------
+def load_checkpoint():
+    try:
+        with open(CHECKPOINT_PATH) as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def save_checkpoint(last_id: int):
+    with open(CHECKPOINT_PATH, "w") as f:
+        f.write(str(last_id))
+
+
+def clear_checkpoint():
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
+
+# -----------------------------------------------------------
+# 메인 실행 함수
+# -----------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="DevPost topic/issue 재분류")
+    parser.add_argument("--batch-size", type=int, default=RECLASSIFY_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터 실행")
+    args = parser.parse_args()
+
+    if args.restart:
+        clear_checkpoint()
+
+    after_id = load_checkpoint()
+    print(f"🔁 DevPost 재분류 시작 (id > {after_id}, batch={args.batch_size})")
+
+    def on_batch(last_id, scanned, changed):
+        save_checkpoint(last_id)
+        print(f"   • scanned={scanned:,} changed={changed:,} (last_id={last_id})")
+
+    result = reclassify_posts(after_id=after_id, batch_size=args.batch_size, on_batch=on_batch)
+
+    clear_checkpoint()
+    print(f"✅ 재분류 완료: scanned={result['scanned']:,}, changed={result['changed']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,40 +2,40 @@
 # flake8: noqa
 
 import sys, os
-from sqlalchemy import text  # ⭐ SQL 직접 실행을 위해 추가
+from sqlalchemy import delete, update
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
 from database.mariadb import SessionLocal
 from database.models import (
-    SkillTrack, SkillNode, LearningQuest, 
-    UserNodeProgress, UserQuestProgress, UserTodayQuests
+    SkillTrack, SkillNode, SkillNodeEdge, LearningQuest, 
+    UserNodeProgress, UserTrackProgress, UserQuestProgress, UserNodeQuestCounter, UserTodayQuests
 )
 from scripts.seed_roadmap import seed_roadmaps
+from services.roadmap_cache import invalidate_roadmap_cache
 
 
 # -----------------------------------------------------------
 # 전체 데이터 초기화 (강제 삭제 모드)
 # -----------------------------------------------------------
 def reset_all_tables(db):
-    print("\n🧨 초기화 중: FK 체크 끄고 데이터 강제 삭제...")
+    print("\n🧨 초기화 중: 참조 순서대로 데이터 삭제...")
 
-    # ⭐ 1. 외래키 검사 비활성화 (순환 참조 무시)
-    db.execute(text("SET FOREIGN_KEY_CHECKS = 0;"))
+    # FK 검사는 켠 채로, 자식 → 부모 순서의 DELETE 한 문장씩
+    # 1. 유저 진행 기록 (퀘스트 / 노드 / 트랙 참조)
+    for model in (UserTodayQuests, UserQuestProgress, UserNodeQuestCounter, UserNodeProgress, UserTrackProgress):
+        db.execute(delete(model))
 
-    # 2. 데이터 삭제 (순서 상관 없음)
-    db.query(UserNodeProgress).delete()
-    db.query(UserQuestProgress).delete()
-    db.query(UserTodayQuests).delete()
-    db.query(LearningQuest).delete()
-    db.query(SkillNode).delete()
-    db.query(SkillTrack).delete()
+    # 2. skill_nodes.main_quest_id ↔ learning_quests.node_db_id 순환 참조 끊기
+    db.execute(update(SkillNode).values(main_quest_id=None))
 
-    # ⭐ 3. 외래키 검사 다시 활성화
-    db.execute(text("SET FOREIGN_KEY_CHECKS = 1;"))
+    # 3. 퀘스트 → 간선 → 노드 → 트랙
+    for model in (LearningQuest, SkillNodeEdge, SkillNode, SkillTrack):
+        db.execute(delete(model))
 
     db.commit()
+    invalidate_roadmap_cache()
     print("✔ 테이블 초기화 완료! (깨끗해요 ✨)\n")
 
 
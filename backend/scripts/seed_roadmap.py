@@ -8,28 +8,72 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
 from database.mariadb import SessionLocal
-from database.models import SkillTrack, SkillNode, LearningQuest
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from database.models import SkillTrack, SkillNode, LearningQuest, new_track_version
 from services.roadmap_scraper import crawl_life_coding_library
+from services.roadmap_cache import bump_track_version
+from services.roadmap_service import rebuild_node_edges
 
 
 # ============================================================
-# 공통: Quest 생성 함수
+# 공통: bulk upsert (행은 메모리에서 만들고 테이블당 executemany 1회)
+# - skill_tracks.slug / skill_nodes(track_id, node_id) / learning_quests(node_db_id, url)
+#   유니크 키 기준 ON DUPLICATE KEY UPDATE → 다시 실행해도 중복 없이 최신 내용으로 갱신
 # ============================================================
-def create_quest(db, title, desc, url, track_slug, node_db_id):
-    quest = LearningQuest(
-        title=title,
-        description=desc,
-        url=url, 
-        xp=50,
-        difficulty="medium",
-        category=track_slug,
-        chapter=title,
-        node_db_id=node_db_id,
-        completed=False 
+def _upsert(db, model, rows, update_cols):
+    if not rows:
+        return
+    stmt = mysql_insert(model)
+    stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    db.execute(stmt, rows)
+
+
+def upsert_track(db, slug, title, description) -> int:
+    stmt = mysql_insert(SkillTrack).values(
+        slug=slug, title=title, description=description, version=new_track_version()
     )
-    db.add(quest)
-    db.flush()
-    return quest.id
+    stmt = stmt.on_duplicate_key_update(title=stmt.inserted.title, description=stmt.inserted.description)
+    db.execute(stmt)
+    return db.query(SkillTrack.id).filter(SkillTrack.slug == slug).scalar()
+
+
+NODE_UPDATE_COLS = (
+    "track_slug", "label", "description", "resource_link",
+    "xp_reward", "position", "prerequisites", "thumbnail",
+)
+
+
+def upsert_nodes(db, track_id, node_rows) -> dict:
+    """→ node_id → skill_nodes.id (트랙 노드 전체를 쿼리 1회로)"""
+    _upsert(db, SkillNode, [{**r, "track_id": track_id} for r in node_rows], NODE_UPDATE_COLS)
+    return dict(
+        db.query(SkillNode.node_id, SkillNode.id).filter(SkillNode.track_id == track_id).all()
+    )
+
+
+QUEST_UPDATE_COLS = ("title", "description", "xp", "difficulty", "category", "chapter")
+
+
+def quest_row(title, desc, url, track_slug, node_db_id):
+    return {
+        "title": title,
+        "description": desc,
+        "url": url,
+        "xp": 50,
+        "difficulty": "medium",
+        "category": track_slug,
+        "chapter": title,
+        "node_db_id": node_db_id,
+        "completed": False,
+    }
+
+
+def upsert_quests(db, quest_rows):
+    # 같은 (node_db_id, url)이 한 번에 여러 번 오면 마지막 값으로
+    unique = {(r["node_db_id"], r["url"]): r for r in quest_rows}
+    _upsert(db, LearningQuest, list(unique.values()), QUEST_UPDATE_COLS)
+    return len(unique)
 
 
 # ============================================================
@@ -49,32 +93,34 @@ PUBLIC_NODES = [
 ]
 
 def seed_public_track(db):
-    track = SkillTrack(
+    track_id = upsert_track(
+        db,
         slug="web-roadmap",
         title="Web Developer Roadmap",
-        description="웹 개발자 입문: 프론트엔드와 백엔드의 갈림길"
+        description="웹 개발자 입문: 프론트엔드와 백엔드의 갈림길",
     )
-    db.add(track)
-    db.commit()
-    db.refresh(track)
 
+    node_rows = []
     prev_node_id = None
     for idx, (node_id, title, desc, url) in enumerate(PUBLIC_NODES, start=1):
-        node = SkillNode(
-            track_id=track.id,
-            track_slug="web-roadmap",
-            node_id=node_id,
-            label=title,
-            description=desc,
-            resource_link=url,
-            xp_reward=40,
-            position=idx,
-            prerequisites=[prev_node_id] if prev_node_id else []
-        )
-        db.add(node)
-        db.flush()
-        create_quest(db, title, desc, url, "web-roadmap", node.id)
-        prev_node_id = node.node_id 
+        node_rows.append({
+            "track_slug": "web-roadmap",
+            "node_id": node_id,
+            "label": title,
+            "description": desc,
+            "resource_link": url,
+            "xp_reward": 40,
+            "position": idx,
+            "prerequisites": [prev_node_id] if prev_node_id else [],
+            "thumbnail": None,
+        })
+        prev_node_id = node_id
+
+    node_ids = upsert_nodes(db, track_id, node_rows)
+    upsert_quests(db, [
+        quest_row(title, desc, url, "web-roadmap", node_ids[node_id])
+        for node_id, title, desc, url in PUBLIC_NODES
+    ])
 
     db.commit()
     print("✅ Public Web Roadmap 생성 완료!")
@@ -87,14 +133,13 @@ def seed_personal_track(db):
     lessons = crawl_life_coding_library()
     print(f"📚 생활코딩 강의 {len(lessons)}개 수집됨 -> 분류 작업 시작")
 
-    track = SkillTrack(
+    track_id = upsert_track(
+        db,
         slug="life-coding",
         title="생활코딩 실전 로드맵",
         description="수집된 강의를 공통/프론트/백엔드 트랙으로 자동 분류하여 제공합니다.",
     )
-    db.add(track)
     db.commit()
-    db.refresh(track)
 
     if not lessons:
         return
@@ -120,49 +165,46 @@ def seed_personal_track(db):
         {"label": "Deep Dive", "id": "LC-ADV", "keys": [], "parent": "LC-01"} 
     ]
 
-    node_objects = {}
-    
-    # 2. 노드 생성
+    # 2. 노드 생성 (한 번에 upsert 후 node_id → db id 조회 1회)
+    node_rows = []
     for idx, cat in enumerate(CATEGORIES, start=1):
         parent_id = cat["parent"]
-        parents = [node_objects[parent_id].node_id] if parent_id and parent_id in node_objects else []
-
-        node = SkillNode(
-            track_id=track.id,
-            track_slug="life-coding",
-            node_id=cat["id"],
-            label=cat["label"],
-            description=f"{cat['label']} 관련 실습 강의 모음",
-            xp_reward=100,
-            position=idx,
-            prerequisites=parents,
-            thumbnail=None
-        )
-        db.add(node)
-        db.flush()
-        node_objects[cat["id"]] = node
-
-    # 3. 강의(Quest) 자동 분류 및 삽입
-    count = 0
+        node_rows.append({
+            "track_slug": "life-coding",
+            "node_id": cat["id"],
+            "label": cat["label"],
+            "description": f"{cat['label']} 관련 실습 강의 모음",
+            "resource_link": None,
+            "xp_reward": 100,
+            "position": idx,
+            "prerequisites": [parent_id] if parent_id else [],
+            "thumbnail": None,
+        })
+    node_ids = upsert_nodes(db, track_id, node_rows)
+
+    # 3. 강의(Quest) 자동 분류 (키워드는 미리 소문자로)
+    matchers = [(cat["id"], [k.lower() for k in cat["keys"]]) for cat in CATEGORIES]
+    quest_rows = []
     for lec in lessons:
         title = lec["title"]
-        target_node = node_objects["LC-ADV"] # 기본값
+        lowered = title.lower()
+        target = "LC-ADV"  # 기본값
 
         # 키워드 매칭 (위 카테고리 순서대로 검사)
-        for cat in CATEGORIES:
-            if any(k.lower() in title.lower() for k in cat["keys"]):
-                target_node = node_objects[cat["id"]]
+        for cat_id, keys in matchers:
+            if any(k in lowered for k in keys):
+                target = cat_id
                 break
-        
-        create_quest(
-            db, 
-            title=lec["title"], 
-            desc=lec["description"], 
-            url=lec["resource_link"], 
-            track_slug="life-coding", 
-            node_db_id=target_node.id
-        )
-        count += 1
+
+        quest_rows.append(quest_row(
+            title=lec["title"],
+            desc=lec["description"],
+            url=lec["resource_link"],
+            track_slug="life-coding",
+            node_db_id=node_ids[target],
+        ))
+
+    count = upsert_quests(db, quest_rows)
 
     db.commit()
     print(f"🎉 Personal 트랙: {count}개 강의가 풍성한 단계로 분류되었습니다!")
@@ -175,6 +217,15 @@ def seed_roadmaps(db: Session):
     print("🔥 [Seeding] 로드맵 생성 시작...")
     seed_public_track(db)
     seed_personal_track(db)
+
+    # prerequisites JSON → skill_node_edges 동기화
+    for track in db.query(SkillTrack).all():
+        edges = rebuild_node_edges(db, track.id)
+        print(f"🔗 {track.slug}: {edges}개 선행관계 간선")
+
+    # 구조가 바뀌었으므로 새 version 발급 → 실행 중인 서버의 로드맵 캐시도 재컴파일
+    bump_track_version(db)
+    db.commit()
     print("🎉 모든 로드맵 생성 완료!")
 
 if __name__ == "__main__":
@@ -1,12 +1,5 @@
 # backend/services/ai_service.py
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
-
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key) if api_key else None
+from utils.llm_chain import chat_completion, is_enabled
 
 # 🤖 AI 페르소나: 직무 적성 검사관
 SYSTEM_PROMPT = """
@@ -32,7 +25,7 @@ SYSTEM_PROMPT = """
 
 def chat_with_ai(messages):
     # API 키 없을 때 테스트용 시나리오
-    if not client:
+    if not is_enabled():
         last_msg = messages[-1]["content"]
         if "시각" in last_msg or "디자인" in last_msg:
             return "눈에 보이는 걸 만드는 걸 좋아하시는군요! 그렇다면 **프론트엔드 개발자**가 딱이에요. 웹사이트의 얼굴을 만드는 일이죠.\n[RECOMMEND: FRONTEND]"
@@ -42,16 +35,16 @@ def chat_with_ai(messages):
             return "어떤 스타일을 선호하시나요? 1. 눈에 보이는 화면 만들기 2. 복잡한 데이터 처리하기"
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        return chat_completion(
+            "chat",
+            [
                 {"role": "system", "content": SYSTEM_PROMPT},
                 *messages
             ],
+            model="gpt-3.5-turbo",
             temperature=0.7,
             max_tokens=500
         )
-        return response.choices[0].message.content
 
     except Exception as e:
         print(f"❌ OpenAI Error: {e}")
@@ -14,11 +14,14 @@ from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from dotenv import load_dotenv
-from openai import OpenAI
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from utils.llm_chain import chat_completion
+
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 오프라인 벤치마크 시 scripts/llm_stub_server.py 의 /devto/api/articles 로 교체 가능
+DEVTO_API_URL = os.getenv("DEVTO_API_URL", "https://dev.to/api/articles")
 
 # ================================================================
 # 🟢 Selenium Driver (OKKY용)
@@ -75,12 +78,12 @@ def summarize_text(title, content=None, author=None):
     - HTML, 코드 블록 등 제거
     """
     try:
-        res = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        content = chat_completion(
+            "dev",
+            [{"role": "user", "content": prompt}],
             temperature=0.3
         )
-        return res.choices[0].message.content.strip()
+        return content.strip()
     except Exception as e:
         print(f"⚠️ AI Summary Error: {e}")
         return title
@@ -204,7 +207,7 @@ def crawl_okky(limit=20):
 # 🟣 Dev.to (함수명 수정: fetch_devto_latest -> crawl_devto)
 # ================================================================
 def crawl_devto(limit=20, tag=None):
-    base_url = "https://dev.to/api/articles"
+    base_url = DEVTO_API_URL
     params = {"per_page": limit}
     if tag: params["tag"] = tag
 
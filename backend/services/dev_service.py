@@ -2,13 +2,16 @@
 # flake8: noqa
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc, or_, func
+from sqlalchemy import select, update, desc, or_, func
 from datetime import datetime
+import math
+import re
 import traceback
 from collections import Counter
 
 # 모델과 스키마는 프로젝트 구조에 맞게 Import 경로 확인해주세요
-from database.models import DevPost, UserInterest
+from database.mariadb import SessionLocal, engine
+from database.models import DevPost, DevTopicCluster, UserInterest
 from schemas.dev_schema import (
     DevFeedResponse, 
     DevPostResponse, 
@@ -65,19 +68,49 @@ ISSUE_MAP = {
 DEFAULT_TOPIC = "Others"
 DEFAULT_ISSUE = "General Info"
 
+def compile_keyword_matcher(mapping: dict):
+    """
+    {라벨: [키워드...]} → [(라벨, 컴파일된 정규식)]
+    dict 순서가 곧 우선순위 (첫 번째로 매칭되는 라벨 채택)
+    """
+    return [
+        (label, re.compile("|".join(re.escape(k.lower()) for k in keys)))
+        for label, keys in mapping.items()
+    ]
+
+TOPIC_MATCHER = compile_keyword_matcher(TOPIC_KEYWORDS)
+ISSUE_MATCHER = compile_keyword_matcher(ISSUE_MAP)
+
+def _match_first(matcher, text: str, default: str):
+    for label, pattern in matcher:
+        if pattern.search(text):
+            return label
+    return default
+
 def classify_topic(text: str):
-    text = text.lower()
-    for topic, keys in TOPIC_KEYWORDS.items():
-        if any(k in text for k in keys):
-            return topic
-    return DEFAULT_TOPIC
+    return _match_first(TOPIC_MATCHER, text.lower(), DEFAULT_TOPIC)
 
 def classify_issue(text: str):
-    text = text.lower()
-    for issue, keys in ISSUE_MAP.items():
-        if any(k in text for k in keys):
-            return issue
-    return DEFAULT_ISSUE
+    return _match_first(ISSUE_MATCHER, text.lower(), DEFAULT_ISSUE)
+
+
+# ===========================================================
+# 🔥 Hot Score (engagement + 최신성)
+# ===========================================================
+HOT_EPOCH = datetime(2024, 1, 1)
+HOT_GRAVITY_SECONDS = 45000  # 12.5시간 늦게 올라온 글 = engagement 10배 차이와 동등
+
+def compute_hot_score(like_count, comment_count, view_count, published_at, crawled_at=None):
+    """
+    engagement / decay^(나이) 형태의 gravity 정렬을 log 공간으로 옮긴 점수.
+    log10(engagement) + 게시시각 / HOT_GRAVITY_SECONDS
+    → 시간이 흘러도 글 사이의 상대 순서가 변하지 않으므로 저장 시점에 한 번만 계산하면 됨
+    게시시각이 없는 글은 처음 수집된 시각(crawled_at)을 대신 사용 (재수집해도 나이가 초기화되지 않도록)
+    """
+    engagement = (like_count or 0) + 2 * (comment_count or 0) + (view_count or 0) / 100
+    order = math.log10(max(engagement, 1))
+    age = ((published_at or crawled_at or datetime.utcnow()) - HOT_EPOCH).total_seconds()
+    return round(order + age / HOT_GRAVITY_SECONDS, 7)
 
 
 # ===========================================================
@@ -109,11 +142,16 @@ def save_posts(db: Session, posts: list):
                 exist.like_count = p.get("like_count", 0)
                 exist.comment_count = p.get("comment_count", 0)
                 exist.view_count = p.get("view_count", 0)
-                exist.crawled_at = datetime.utcnow()
+                exist.updated_at = datetime.utcnow()
                 exist.topic_primary = topic
                 exist.issue_primary = issue
+                exist.hot_score = compute_hot_score(
+                    exist.like_count, exist.comment_count, exist.view_count,
+                    exist.published_at, exist.crawled_at,
+                )
                 updated += 1
             else:
+                now = datetime.utcnow()
                 new_post = DevPost(
                     source=p["source"],
                     source_id=str(p["source_id"]),
@@ -126,9 +164,14 @@ def save_posts(db: Session, posts: list):
                     comment_count=p.get("comment_count", 0),
                     view_count=p.get("view_count", 0),
                     published_at=p["published_at"],
-                    crawled_at=datetime.utcnow(),
+                    crawled_at=now,  # 처음 수집된 시각 (재수집 시 갱신하지 않음)
+                    updated_at=now,
                     topic_primary=topic,
                     issue_primary=issue,
+                    hot_score=compute_hot_score(
+                        p.get("like_count", 0), p.get("comment_count", 0),
+                        p.get("view_count", 0), p["published_at"], now,
+                    ),
                 )
                 db.add(new_post)
                 inserted += 1
@@ -144,15 +187,93 @@ def save_posts(db: Session, posts: list):
     return inserted, updated
 
 
+# ===========================================================
+# 🔁 재분류 Backfill (TOPIC_KEYWORDS / ISSUE_MAP 변경 시)
+# ===========================================================
+RECLASSIFY_BATCH_SIZE = 1000
+
+def reclassify_posts(after_id: int = 0, batch_size: int = RECLASSIFY_BATCH_SIZE, on_batch=None):
+    """
+    저장된 DevPost를 현재 분류 규칙으로 다시 분류하고 hot_score도 다시 계산합니다.
+    - 읽기: 서버 사이드 커서(yield_per)로 id 순 스트리밍 → 메모리는 batch_size 만큼만 사용
+    - 쓰기: 라벨이 바뀐 행만 모아 배치마다 bulk UPDATE + commit
+    - on_batch(last_id, scanned, changed): 배치 커밋 직후 호출 (진행률 / 체크포인트 저장용)
+    중간에 끊겨도 마지막 last_id부터 after_id로 다시 시작하면 됩니다.
+    """
+    scanned, changed, last_id = 0, 0, after_id
+
+    # 스트리밍 커서가 열려 있는 동안 같은 연결로 UPDATE 할 수 없으므로 읽기/쓰기 연결 분리
+    read_conn = engine.connect()
+    write_db = SessionLocal()
+    try:
+        stmt = (
+            select(
+                DevPost.id, DevPost.title, DevPost.summary, DevPost.topic_primary, DevPost.issue_primary,
+                DevPost.like_count, DevPost.comment_count, DevPost.view_count, DevPost.published_at,
+                DevPost.crawled_at, DevPost.hot_score,
+            )
+            .where(DevPost.id > after_id)
+            .order_by(DevPost.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in read_conn.execute(stmt).partitions():
+            changes = []
+            now = datetime.utcnow()
+            for row in rows:
+                text = f"{row.title or ''} {row.summary or ''}".lower()
+                topic = classify_topic(text)
+                issue = classify_issue(text)
+                hot = compute_hot_score(
+                    row.like_count, row.comment_count, row.view_count, row.published_at, row.crawled_at
+                )
+                if topic != row.topic_primary or issue != row.issue_primary or hot != row.hot_score:
+                    changes.append({
+                        "id": row.id, "topic_primary": topic, "issue_primary": issue,
+                        "hot_score": hot, "updated_at": now,  # 재분류도 ETag 버전을 올림
+                    })
+
+            if changes:
+                write_db.execute(update(DevPost), changes)
+                write_db.commit()
+
+            scanned += len(rows)
+            changed += len(changes)
+            last_id = rows[-1].id
+            if on_batch:
+                on_batch(last_id, scanned, changed)
+    except Exception:
+        write_db.rollback()
+        raise
+    finally:
+        write_db.close()
+        read_conn.close()
+
+    return {"scanned": scanned, "changed": changed, "last_id": last_id}
+
+
 # ===========================================================
 # 🔥 Source Feed (Helper)
 # ===========================================================
-def get_source_feed(db: Session, source: str, page: int = 1, size: int = 10):
+FEED_SORTS = {
+    "latest": DevPost.published_at,
+    "hot": DevPost.hot_score,   # ix_dev_posts_source_hot 인덱스 역순 스캔
+}
+
+def get_feed_version(db: Session) -> tuple:
+    """
+    ETag용 dev 데이터 버전 = (최대 id, 최신 updated_at)
+    새 글은 id를, 재수집(좋아요 / 조회수 / hot_score 갱신)과 재분류(topic / issue 라벨)는 updated_at을 올림.
+    둘 다 인덱스 끝값 조회
+    """
+    return tuple(db.query(func.max(DevPost.id), func.max(DevPost.updated_at)).one())
+
+
+def get_source_feed(db: Session, source: str, page: int = 1, size: int = 10, sort: str = "latest"):
     offset = (page - 1) * size
     query = (
         select(DevPost)
         .where(DevPost.source == source)
-        .order_by(desc(DevPost.published_at))
+        .order_by(desc(FEED_SORTS.get(sort, DevPost.published_at)))
         .offset(offset)
         .limit(size)
     )
@@ -164,10 +285,10 @@ def get_source_feed(db: Session, source: str, page: int = 1, size: int = 10):
 # ===========================================================
 # 🔵 Public Feed
 # ===========================================================
-def build_public_feed(db: Session) -> DevFeedResponse:
+def build_public_feed(db: Session, sort: str = "latest") -> DevFeedResponse:
     try:
-        okky_items, okky_total = get_source_feed(db, "okky", page=1, size=50)
-        devto_items, devto_total = get_source_feed(db, "devto", page=1, size=50)
+        okky_items, okky_total = get_source_feed(db, "okky", page=1, size=50, sort=sort)
+        devto_items, devto_total = get_source_feed(db, "devto", page=1, size=50, sort=sort)
 
         return DevFeedResponse(
             okky=FeedSection(items=okky_items, total=okky_total),
@@ -182,7 +303,7 @@ def build_public_feed(db: Session) -> DevFeedResponse:
 # ===========================================================
 # 🟣 Personal Feed (수정된 핵심 로직 ✨)
 # ===========================================================
-def build_personal_feed(current_user, db: Session) -> DevFeedResponse:
+def build_personal_feed(current_user, db: Session, sort: str = "latest") -> DevFeedResponse:
     # 1. 유저 관심사 가져오기 (UserInterest 테이블)
     interests = db.query(UserInterest).filter(UserInterest.user_id == current_user.id).all()
     interest_tags = [i.keyword for i in interests]
@@ -198,7 +319,7 @@ def build_personal_feed(current_user, db: Session) -> DevFeedResponse:
 
     # 3. 관심사가 하나도 없으면 -> 그냥 Public Feed 반환
     if not interest_tags:
-        return build_public_feed(db)
+        return build_public_feed(db, sort)
 
     # 4. 필터 생성 (제목 or 요약에 키워드 포함)
     filters = []
@@ -212,7 +333,7 @@ def build_personal_feed(current_user, db: Session) -> DevFeedResponse:
         recommended_items = (
             db.query(DevPost)
             .filter(or_(*filters))
-            .order_by(desc(DevPost.published_at))
+            .order_by(desc(FEED_SORTS.get(sort, DevPost.published_at)))
             .limit(100)  # 최대 100개까지만 추천
             .all()
         )
@@ -261,6 +382,7 @@ def refresh_all_sources(db: Session):
         save_posts(db, crawl_okky())
         print("Refreshing Dev.to...")
         save_posts(db, crawl_devto())
+        refresh_topic_clusters(db)
         return {"ok": True, "message": "Refresh completed"}
     except Exception as e:
         return {"ok": False, "message": str(e)}
@@ -269,7 +391,71 @@ def refresh_all_sources(db: Session):
 # ===========================================================
 # 🔥 Insight Logic
 # ===========================================================
+TOPIC_CLUSTER_K = 8
+TOPIC_CLUSTER_MAX_POSTS = 5000
+TOPIC_CLUSTER_STOPWORDS = {
+    "the", "and", "for", "with", "you", "your", "how", "what", "this", "that", "from", "are", "can",
+    "합니다", "있습니다", "대한", "관련", "질문", "내용", "방법", "사용", "경우",
+}
+
+def refresh_topic_clusters(db: Session):
+    """
+    최근 DevPost 제목+요약으로 TF-IDF → mini-batch k-means를 돌려 스냅샷 테이블을 교체합니다.
+    크롤링 직후(스케줄러 / refresh)에만 호출 → 요청 경로에서는 무거운 계산을 하지 않음
+    """
+    try:
+        from utils.nlp_utils import cluster_documents
+    except ImportError:
+        print("⚠️ numpy/scipy 미설치 → 토픽 클러스터 스냅샷 생략")
+        return 0
+
+    rows = db.execute(
+        select(DevPost.id, DevPost.title, DevPost.summary)
+        .order_by(desc(DevPost.published_at))
+        .limit(TOPIC_CLUSTER_MAX_POSTS)
+    ).all()
+    docs = [f"{r.title or ''} {r.summary or ''}" for r in rows]
+
+    clusters = cluster_documents(docs, k=TOPIC_CLUSTER_K, stopwords=TOPIC_CLUSTER_STOPWORDS)
+    if not clusters:
+        return 0
+
+    snapshot_at = datetime.utcnow()
+    try:
+        # 이전 스냅샷 삭제 + 새 스냅샷 저장을 한 트랜잭션으로 → 읽는 쪽은 항상 완전한 스냅샷만 봄
+        db.query(DevTopicCluster).delete()
+        for idx, c in enumerate(clusters):
+            db.add(DevTopicCluster(
+                snapshot_at=snapshot_at,
+                cluster_idx=idx,
+                label=" · ".join(c["terms"][:3]) or DEFAULT_TOPIC,
+                top_terms=c["terms"],
+                size=len(c["members"]),
+                sample_post_ids=[rows[i].id for i in c["members"][:5]],
+            ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("❌ Topic Cluster Snapshot Error:", e)
+        return 0
+
+    print(f"🧮 Topic clusters refreshed: {len(clusters)} clusters / {len(docs)} posts")
+    return len(clusters)
+
 def build_topic_clusters(db: Session):
+    # 1) 최신 스냅샷이 있으면 그대로 반환
+    latest = db.query(func.max(DevTopicCluster.snapshot_at)).scalar()
+    if latest:
+        rows = (
+            db.query(DevTopicCluster)
+            .filter(DevTopicCluster.snapshot_at == latest)
+            .order_by(desc(DevTopicCluster.size))
+            .all()
+        )
+        data = [TopicInsightItem(topic=r.label, count=r.size, terms=r.top_terms or []) for r in rows]
+        return TopicInsightResponse(clusters=data, snapshot_at=latest)
+
+    # 2) 스냅샷이 아직 없으면 키워드 분류 결과로 대체
     rows = db.query(DevPost.topic_primary, func.count(DevPost.id)).group_by(DevPost.topic_primary).all()
     counter = Counter()
     for t, c in rows:
@@ -19,14 +19,15 @@ from collections import Counter, defaultdict
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
 from dotenv import load_dotenv
-from openai import OpenAI
-from sqlalchemy import or_
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, func
+from sqlalchemy.orm import Session
 
 from database.mariadb import SessionLocal
 from database.models import NewsFeed, UserProfile
+from utils.llm_chain import chat_completion
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
 # ====================================================================
@@ -84,6 +85,10 @@ IT_FEEDS = [
     "http://rss.slashdot.org/Slashdot/slashdotMain",
 ]
 
+# 오프라인 벤치마크 등에서 피드 목록 교체 (쉼표 구분)
+if os.getenv("NEWS_FEEDS"):
+    IT_FEEDS = [u.strip() for u in os.getenv("NEWS_FEEDS").split(",") if u.strip()]
+
 # HTML Fallback 도메인 매핑
 FALLBACK_MAP = {
     "zdnet.co.kr": "https://www.zdnet.co.kr/news/",
@@ -151,12 +156,12 @@ def analyze_article(title, content):
     }}
     """
     try:
-        res = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        content = chat_completion(
+            "news",
+            [{"role": "user", "content": prompt}],
             response_format={"type": "json_object"}
         )
-        return json.loads(res.choices[0].message.content)
+        return json.loads(content)
     except:
         return {"summary": title, "category": "etc", "keywords": ["IT"]}
 
@@ -261,6 +266,11 @@ def build_charts(news_items):
         "weekly_trend": weekly_trend,
     }
 
+def get_news_version(db: Session):
+    """ETag용 뉴스 데이터 버전 (뉴스는 추가만 되므로 최대 id = PK 끝값 조회)"""
+    return db.query(func.max(NewsFeed.id)).scalar()
+
+
 def serialize_news(item: NewsFeed):
     return {
         "id": item.id,
@@ -303,11 +313,11 @@ async def get_trend_recommendations(user_id: int):
         prompt = f"키워드 [{keyword}] 관련 뉴스 제목들입니다:\n" + "\n".join(titles) + "\n핵심 트렌드를 2문장으로 요약해줘."
         
         try:
-            res = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}]
+            # 게이트웨이는 세마포어 / 토큰 버킷 / 백오프에서 블로킹 대기 → 이벤트 루프 밖에서 실행
+            summary = await run_in_threadpool(
+                chat_completion, "trend", [{"role": "user", "content": prompt}]
             )
-            summary = res.choices[0].message.content.strip()
+            summary = summary.strip()
             results.append({"keyword": keyword, "summary": summary})
         except:
             pass
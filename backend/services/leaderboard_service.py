@@ -0,0 +1,203 @@
+# backend/services/leaderboard_service.py
+# flake8: noqa
+"""
+🏆 XP 리더보드 (프로세스 단위 인메모리)
+정렬 기준: level DESC → current_xp DESC (동점은 같은 순위, 표시 순서는 user_id 오름차순)
+
+구조
+- IndexableSkipList 에 key = (-level, -current_xp, user_id) 를 정렬 보관
+- user_id → key 맵으로 XP가 바뀐 유저만 remove + add (O(log n))
+- 순위 = 1 + (나보다 점수가 높은 유저 수) = 1 + bisect_left((-level, -current_xp, 0))
+
+영속화 / 재구성
+- 원본은 UserProfile (level, current_xp) 인덱스 → 재시작 후 첫 요청에서 한 번 적재
+- XP 반영(compact_xp_ledger) 직후 같은 프로세스는 apply_changes() 로 즉시 갱신
+- 다른 프로세스의 변경은 sync() 가 updated_at 이후 변경분만 읽어 반영 (스케줄러 1분 간격)
+- 탈퇴 등 삭제는 LEADERBOARD_REBUILD_SECONDS 마다 전체 재구성으로 정리
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from database.models import UserProfile
+from utils.skiplist import IndexableSkipList
+
+
+LEADERBOARD_REBUILD_SECONDS = float(os.getenv("LEADERBOARD_REBUILD_SECONDS", "3600"))
+LEADERBOARD_MAX_LIMIT = 100
+
+# updated_at 경계에서 같은 시각 커밋을 놓치지 않도록 조금 겹쳐 읽음 (재반영은 멱등)
+_SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _score_key(user_id: int, level, current_xp):
+    return (-(level or 1), -(current_xp or 0), user_id)
+
+
+class Leaderboard:
+    def __init__(self, rebuild_seconds: float = LEADERBOARD_REBUILD_SECONDS):
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._list = IndexableSkipList()
+        self._keys = {}
+        self._loaded_at = None
+        self._watermark = None
+
+    # ----------------------------------------------------------------
+    # 적재 / 동기화
+    # ----------------------------------------------------------------
+    def rebuild(self, db: Session):
+        rows = (
+            db.query(UserProfile.id, UserProfile.level, UserProfile.current_xp, UserProfile.updated_at)
+            .order_by(UserProfile.level.desc(), UserProfile.current_xp.desc())
+            .all()
+        )
+        sl = IndexableSkipList()
+        keys = {}
+        for r in rows:
+            key = _score_key(r.id, r.level, r.current_xp)
+            keys[r.id] = key
+            sl.add(key)
+
+        with self._lock:
+            self._list = sl
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+            self._watermark = max((r.updated_at for r in rows if r.updated_at), default=None)
+        print(f"🏆 Leaderboard rebuilt: {len(keys)} users")
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.rebuild_seconds:
+            self.rebuild(db)
+
+    def _set(self, user_id: int, level, current_xp):
+        """lock 안에서 호출"""
+        key = _score_key(user_id, level, current_xp)
+        old = self._keys.get(user_id)
+        if old == key:
+            return
+        if old is not None:
+            self._list.remove(old)
+        self._list.add(key)
+        self._keys[user_id] = key
+
+    def apply_changes(self, db: Session, user_ids):
+        """XP를 바꾼 유저들의 현재 (level, current_xp)를 IN 한 번으로 읽어 반영"""
+        user_ids = list(user_ids)
+        if not user_ids or self._loaded_at is None:
+            return
+        rows = (
+            db.query(UserProfile.id, UserProfile.level, UserProfile.current_xp)
+            .filter(UserProfile.id.in_(user_ids))
+            .all()
+        )
+        with self._lock:
+            for r in rows:
+                self._set(r.id, r.level, r.current_xp)
+
+    def sync(self, db: Session):
+        """마지막 동기화 이후 updated_at이 바뀐 유저만 반영 (미적재 상태면 전체 적재)"""
+        if self._loaded_at is None or self._watermark is None:
+            self.rebuild(db)
+            return
+
+        rows = (
+            db.query(UserProfile.id, UserProfile.level, UserProfile.current_xp, UserProfile.updated_at)
+            .filter(UserProfile.updated_at >= self._watermark - _SYNC_OVERLAP)
+            .all()
+        )
+        with self._lock:
+            for r in rows:
+                self._set(r.id, r.level, r.current_xp)
+                if r.updated_at and r.updated_at > self._watermark:
+                    self._watermark = r.updated_at
+
+    # ----------------------------------------------------------------
+    # 조회 (lock 안에서 호출)
+    # ----------------------------------------------------------------
+    def _rank_of_key(self, key) -> int:
+        return self._list.bisect_left((key[0], key[1], 0)) + 1
+
+    def _entries(self, keys):
+        return [
+            {
+                "rank": self._rank_of_key(k),
+                "user_id": k[2],
+                "level": -k[0],
+                "current_xp": -k[1],
+            }
+            for k in keys
+        ]
+
+    def top(self, db: Session, limit: int = 10):
+        self.ensure_loaded(db)
+        with self._lock:
+            return self._entries(self._list.islice(0, limit))
+
+    def rank(self, db: Session, user_id: int):
+        """→ {"rank", "user_id", "level", "current_xp", "total"} | None"""
+        self.ensure_loaded(db)
+        if user_id not in self._keys:
+            self.apply_changes(db, [user_id])  # 동기화 전 신규 가입자
+        with self._lock:
+            key = self._keys.get(user_id)
+            if key is None:
+                return None
+            return {**self._entries([key])[0], "total": len(self._list)}
+
+    def around(self, db: Session, user_id: int, radius: int = 5):
+        self.ensure_loaded(db)
+        if user_id not in self._keys:
+            self.apply_changes(db, [user_id])
+        with self._lock:
+            key = self._keys.get(user_id)
+            if key is None:
+                return None
+            pos = self._list.bisect_left(key)
+            return self._entries(self._list.islice(pos - radius, pos + radius + 1))
+
+
+leaderboard = Leaderboard()
+
+
+# ====================================================================
+# 📦 응답 조립 (username / title 은 보여줄 유저만 IN 한 번으로)
+# ====================================================================
+def _with_profiles(db: Session, entries):
+    if not entries:
+        return entries
+    ids = [e["user_id"] for e in entries]
+    profiles = {
+        r.id: r for r in
+        db.query(UserProfile.id, UserProfile.username, UserProfile.title)
+        .filter(UserProfile.id.in_(ids))
+    }
+    for e in entries:
+        p = profiles.get(e["user_id"])
+        e["username"] = p.username if p else None
+        e["title"] = p.title if p else None
+    return entries
+
+
+def get_top(db: Session, limit: int = 10):
+    limit = max(1, min(limit, LEADERBOARD_MAX_LIMIT))
+    return _with_profiles(db, leaderboard.top(db, limit))
+
+
+def get_my_rank(db: Session, user_id: int):
+    entry = leaderboard.rank(db, user_id)
+    if entry is None:
+        return None
+    return _with_profiles(db, [entry])[0]
+
+
+def get_around(db: Session, user_id: int, radius: int = 5):
+    radius = max(0, min(radius, LEADERBOARD_MAX_LIMIT // 2))
+    entries = leaderboard.around(db, user_id, radius)
+    if entries is None:
+        return None
+    return _with_profiles(db, entries)
@@ -0,0 +1,51 @@
+# backend/services/quest_bulk.py
+# flake8: noqa
+"""
+🧹 LearningQuest 일괄 갱신 (set-based)
+객체를 메모리에 올리지 않고 UPDATE ... WHERE 한 문장으로 처리합니다.
+- reset_recommendations : 추천 기록 전체 초기화
+- mark_recommended      : 추천한 퀘스트에 날짜 기록
+- mark_completed        : 완료한 퀘스트를 추천 로테이션에서 해제
+
+commit은 호출부에서 (다른 변경과 한 트랜잭션으로 묶을 수 있도록).
+반환값은 영향받은 행 수.
+"""
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from database.models import LearningQuest
+
+
+def reset_recommendations(db: Session) -> int:
+    res = db.execute(
+        update(LearningQuest)
+        .where(LearningQuest.last_recommended.is_not(None))
+        .values(last_recommended=None)
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount
+
+
+def mark_recommended(db: Session, quest_ids, day: str) -> int:
+    quest_ids = list(quest_ids)
+    if not quest_ids:
+        return 0
+    res = db.execute(
+        update(LearningQuest)
+        .where(LearningQuest.id.in_(quest_ids))
+        .values(last_recommended=day)
+    )
+    return res.rowcount
+
+
+def mark_completed(db: Session, quest_ids) -> int:
+    quest_ids = list(quest_ids)
+    if not quest_ids:
+        return 0
+    res = db.execute(
+        update(LearningQuest)
+        .where(LearningQuest.id.in_(quest_ids), LearningQuest.last_recommended.is_not(None))
+        .values(last_recommended=None)
+    )
+    return res.rowcount
@@ -3,9 +3,11 @@
 
 import re
 from datetime import datetime
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
-from database.models import LearningQuest, SkillNode
+from database.models import LearningQuest, SkillNode, UserQuestProgress, UserTodayQuests
+from utils.aho_corasick import AhoCorasick
 
 
 # ================================================================
@@ -55,87 +57,122 @@ def get_xp(difficulty: str):
 # ================================================================
 # 3) Node 기반 분류 (우선순위 가장 높음)
 # ================================================================
-def classify_by_node(db: Session, title: str, desc: str):
+class NodeMatcher:
+    """
+    모든 노드의 label / search_keywords 를 Aho-Corasick 하나로 컴파일해 두고
+    텍스트를 한 번 훑어 매칭되는 노드를 찾습니다.
+
+    우선순위는 기존 순서 그대로: 노드 순서 → 노드 안에서는 label, keyword 순.
+    (앞 노드의 어떤 패턴이든 뒤 노드보다 우선)
+    """
+
+    def __init__(self, nodes: list):
+        self.nodes = nodes
+        self.automaton = AhoCorasick()
+        priority = 0
+        for node in nodes:
+            patterns = []
+            if node.label:
+                patterns.append(node.label.lower())
+            for kw in node.search_keywords or []:
+                if kw is not None:
+                    patterns.append(kw.lower())
+            for pattern in patterns:
+                self.automaton.add(pattern, priority)
+            priority += 1
+        self.automaton.build()
+
+    @classmethod
+    def load(cls, db: Session):
+        return cls(db.query(SkillNode).order_by(SkillNode.id).all())
+
+    def match(self, title: str, desc: str):
+        found = self.automaton.best(f"{title} {desc}".lower())
+        return None if found is None else self.nodes[found]
+
+
+def classify_by_node(db: Session, title: str, desc: str, matcher: NodeMatcher | None = None):
     """
     제목/설명을 기준으로 SkillNode와 매칭하는 기능.
     Node.label 또는 Node.search_keywords에 매칭되면
     Quest.category = Node.slug 또는 Node.label 로 설정
-    """
-
-    text = f"{title} {desc}".lower()
-    nodes = db.query(SkillNode).all()
-
-    for node in nodes:
-        # label 기반 매칭
-        if node.label and node.label.lower() in text:
-            return node
 
-        # keyword 기반 매칭
-        if node.search_keywords:
-            for kw in node.search_keywords:
-                if kw.lower() in text:
-                    return node
-
-    return None  # 매칭되는 Node 없음
+    여러 건을 분류할 때는 NodeMatcher.load(db)를 한 번 만들어 matcher로 넘기세요.
+    """
+    if matcher is None:
+        matcher = NodeMatcher.load(db)
+    return matcher.match(title, desc)  # 매칭되는 Node 없으면 None
 
 
 # ================================================================
 # 4) Quest 자동 생성 (Node 우선 → static fallback)
 # ================================================================
+def course_to_quest_row(c: dict, matcher: NodeMatcher):
+    """
+    크롤링된 course 1건 → LearningQuest 컬럼 dict
+    (크롤러는 resource_link, 정적 세트는 url 키를 씀)
+    """
+    title = c.get("title", "Untitled")
+    desc = c.get("description", "")
+    url = c.get("resource_link") or c.get("url")
+
+    # ---------------------------------------
+    # 1) Node 기반 분류 (최우선)
+    # ---------------------------------------
+    matched_node = matcher.match(title, desc)
+
+    if matched_node:
+        category = matched_node.label  # 또는 matched_node.track_id 등 선택 가능
+        difficulty = matched_node.difficulty or "normal"
+        chapter = matched_node.node_id  # Node 자체를 Chapter로 활용
+    else:
+        # ---------------------------------------
+        # 2) 정규식 기반 카테고리 (fallback)
+        # ---------------------------------------
+        category, difficulty, chapter = classify_static_category(title, desc)
+
+    return {
+        "title": title,
+        "description": desc,
+        "url": url,
+        "xp": get_xp(difficulty),
+        "difficulty": difficulty,
+        "category": category,
+        "chapter": chapter,
+    }
+
+
 def generate_quests_from_courses(db: Session, courses: list):
     """
     크롤러로 수집된 courses 리스트를 기반으로 Quest 자동 생성.
     Node 기반 분류 → fallback 정규식 기반 분류 순으로 적용.
+    이미 있는 URL은 IN 쿼리 한 번으로 걸러내고, 새 퀘스트는 한 번에 INSERT.
     """
+    matcher = NodeMatcher.load(db)  # 이번 import 동안 노드 패턴은 한 번만 컴파일
 
-    inserted = 0
-
+    rows = {}
     for c in courses:
-        title = c.get("title", "Untitled")
-        desc = c.get("description", "")
-        url = c.get("resource_link")
-
-        # URL 기반 중복 방지 강화
-        exists = db.query(LearningQuest).filter_by(url=url).first()
-        if exists:
-            continue
-
-        # ---------------------------------------
-        # 1) Node 기반 분류 (최우선)
-        # ---------------------------------------
-        matched_node = classify_by_node(db, title, desc)
-
-        if matched_node:
-            category = matched_node.label  # 또는 matched_node.track_id 등 선택 가능
-            difficulty = matched_node.difficulty or "normal"
-            chapter = matched_node.node_id  # Node 자체를 Chapter로 활용
-        else:
-            # ---------------------------------------
-            # 2) 정규식 기반 카테고리 (fallback)
-            # ---------------------------------------
-            category, difficulty, chapter = classify_static_category(title, desc)
-
-        # XP 계산
-        xp = get_xp(difficulty)
-
-        # 최종 Quest 생성
-        quest = LearningQuest(
-            title=title,
-            description=desc,
-            url=url,
-            xp=xp,
-            difficulty=difficulty,
-            category=category,
-            chapter=chapter,
-            completed=False,
-            last_recommended=None,
-        )
-
-        db.add(quest)
-        inserted += 1
-
-    db.commit()
-    return inserted
+        row = course_to_quest_row(c, matcher)
+        if row["url"]:
+            rows.setdefault(row["url"], row)
+
+    # URL 기반 중복 방지 강화
+    if rows:
+        existing = {
+            url for url, in
+            db.query(LearningQuest.url).filter(LearningQuest.url.in_(list(rows)))
+        }
+        new_rows = [
+            {**row, "completed": False, "last_recommended": None}
+            for url, row in rows.items() if url not in existing
+        ]
+    else:
+        new_rows = []
+
+    if new_rows:
+        db.execute(insert(LearningQuest.__table__), new_rows)
+        db.commit()
+    return len(new_rows)
 
 
 # ================================================================
@@ -189,24 +226,86 @@ def seed_all_quests(db: Session):
 
 
 # ================================================================
-# 7) Quest 전체 리프레시 (크롤러 기반)
+# 7) Quest 리프레시 (크롤러 기반, 변경분만 반영)
 # ================================================================
-def refresh_learning_quests(db: Session):
+SYNC_FIELDS = ("title", "description", "xp", "difficulty", "category", "chapter")
+
+
+def _is_course_quest(q) -> bool:
     """
-    기존 LearningQuest 전체 삭제 후 최신 크롤링 기준으로 재생성.
+    course import로 만들어진 퀘스트만 동기화 대상
+    - 로드맵 노드에 달린 퀘스트(node_db_id)는 seed 스크립트 소유
+    - LearningResource 자동 생성 퀘스트는 chapter가 없음
     """
+    return q.node_db_id is None and q.chapter is not None
 
-    db.query(LearningQuest).delete()
-    db.commit()
 
+def sync_course_quests(db: Session, courses: list):
+    """
+    기존 퀘스트를 url → row 맵으로 한 번 읽어 크롤링 결과와 비교하고
+    INSERT / UPDATE / DELETE 를 각각 한 번의 bulk 문으로, 한 트랜잭션에서 반영.
+    - 변경 없는 퀘스트는 손대지 않음 (id / 완료 기록 / last_recommended 유지)
+    - 커밋 전까지 기존 카탈로그가 그대로 보이므로 빈 테이블 구간이 없음
+    → {"inserted", "updated", "deleted"}
+    """
+    matcher = NodeMatcher.load(db)
+
+    crawled = {}
+    for c in courses:
+        row = course_to_quest_row(c, matcher)
+        if row["url"]:
+            crawled.setdefault(row["url"], row)
+
+    existing = {}
+    for q in db.query(LearningQuest).order_by(LearningQuest.id):
+        existing.setdefault(q.url, []).append(q)
+
+    inserts, updates, delete_ids = [], [], []
+    for url, row in crawled.items():
+        quests = existing.get(url)
+        if not quests:
+            inserts.append({**row, "completed": False, "last_recommended": None})
+            continue
+        for q in quests:
+            if _is_course_quest(q) and any(getattr(q, f) != row[f] for f in SYNC_FIELDS):
+                updates.append({"id": q.id, **{f: row[f] for f in SYNC_FIELDS}})
+
+    for url, quests in existing.items():
+        if url not in crawled:
+            delete_ids += [q.id for q in quests if _is_course_quest(q)]
+
+    try:
+        if delete_ids:
+            # 사라진 강의를 가리키는 배정 / 진행 기록 먼저 정리 (노드 소속이 아니므로 노드 카운터와 무관)
+            db.execute(delete(UserTodayQuests).where(UserTodayQuests.quest_id.in_(delete_ids)))
+            db.execute(delete(UserQuestProgress).where(UserQuestProgress.quest_id.in_(delete_ids)))
+            db.execute(delete(LearningQuest).where(LearningQuest.id.in_(delete_ids)))
+        if updates:
+            db.execute(update(LearningQuest), updates)
+        if inserts:
+            db.execute(insert(LearningQuest.__table__), inserts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(delete_ids)}
+
+
+def refresh_learning_quests(db: Session):
+    """
+    최신 크롤링 결과와 기존 LearningQuest 의 차이만 반영.
+    → 추가 + 수정 + 삭제된 퀘스트 수
+    """
     try:
         from services.crawler_life_coding import fetch_life_coding_courses
         courses = fetch_life_coding_courses()
     except:
         courses = LIFE_CODING_COURSES
 
-    count = generate_quests_from_courses(db, courses)
-    return count
+    result = sync_course_quests(db, courses)
+    print(f"🔄 Quest refresh: +{result['inserted']} ~{result['updated']} -{result['deleted']}")
+    return result["inserted"] + result["updated"] + result["deleted"]
 
 
 # ================================================================
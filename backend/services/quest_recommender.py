@@ -1,70 +1,61 @@
 # backend/services/quest_recommender.py
 # flake8: noqa
 
-from datetime import datetime, date
+import os
+from datetime import date, datetime, timedelta
+
+from pytz import timezone
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from database.models import (
     LearningQuest,
-    LearningResource,
     UserProfile,
     UserNodeProgress,
+    UserQuestProgress,
+    UserTodayQuests,
     SkillNode,
     NodeStatus,
 )
 
-from services.roadmap_service import get_next_unlocked_node
+from services.quest_bulk import mark_recommended
+from services.quest_scoring import scoring_engine
+from services.resource_index import resource_index
 
 
 DAILY_RECOMMEND_COUNT = 5
 
+# 야간 배치 대상: 최근 N일 안에 로그인한 유저
+DAILY_QUEST_ACTIVE_DAYS = int(os.getenv("DAILY_QUEST_ACTIVE_DAYS", "14"))
+DAILY_QUEST_BATCH_SIZE = int(os.getenv("DAILY_QUEST_BATCH_SIZE", "500"))
 
-# -----------------------------------------------------------
-# 날짜 포맷
-# -----------------------------------------------------------
-def today_str():
-    return date.today().isoformat()
+KST = timezone("Asia/Seoul")
 
 
 # -----------------------------------------------------------
-# 🔥 유저 tech_stack 기반 점수 계산
+# 날짜 포맷 (하루의 경계는 KST 자정 — 야간 배치와 같은 기준)
 # -----------------------------------------------------------
-def calculate_interest_score(quest: LearningQuest, user: UserProfile):
-    if not user or not user.tech_stack:
-        return 0
+def today_date() -> date:
+    return datetime.now(KST).date()
 
-    score = 0
-    qtext = f"{quest.title} {quest.description} {quest.category}".lower()
 
-    for tech in user.tech_stack:
-        if tech.lower() in qtext:
-            score += 2  # tech는 강한 선호도
-
-    return score
+def today_str():
+    return today_date().isoformat()
 
 
 # -----------------------------------------------------------
-# 🔥 Node 기반 학습 우선순위 점수
+# url → LearningQuest (url당 가장 먼저 만들어진 퀘스트)
 # -----------------------------------------------------------
-def node_related_score(quest: LearningQuest, node: SkillNode):
-    if not node:
-        return 0
-
-    text = f"{quest.title} {quest.description} {quest.category}".lower()
-
-    score = 0
-
-    # Node label 기반
-    if node.label and node.label.lower() in text:
-        score += 5
-
-    # Node 검색 키워드 기반
-    if node.search_keywords:
-        for kw in node.search_keywords:
-            if kw.lower() in text:
-                score += 3
-
-    return score
+def _quests_by_url(db: Session, urls):
+    found = {}
+    for q in (
+        db.query(LearningQuest)
+        .filter(LearningQuest.url.in_(urls))
+        .order_by(LearningQuest.id)
+    ):
+        found.setdefault(q.url, q)
+    return found
 
 
 # -----------------------------------------------------------
@@ -80,32 +71,91 @@ def auto_generate_from_resources(db: Session, node: SkillNode):
     if node.search_keywords:
         keywords.extend([kw.lower() for kw in node.search_keywords])
 
-    resources = db.query(LearningResource).all()
-    matched = []
+    matched_resources = [r for r in resource_index.search(db, keywords) if r[2]]
+    if not matched_resources:
+        return []
 
-    for r in resources:
-        text = f"{r.title} {r.description} {r.category}".lower()
+    # 기존 퀘스트는 url IN 한 번으로 재활용
+    urls = list(dict.fromkeys(r[2] for r in matched_resources))
+    existing = _quests_by_url(db, urls)
+
+    # 없는 것만 한 번에 INSERT → 변경이 있을 때만 commit
+    new_rows = [
+        {
+            "title": title,
+            "description": description,
+            "url": url,
+            "category": category,
+            "xp": 50,
+            "difficulty": "easy",
+        }
+        for title, description, url, category in matched_resources
+        if url not in existing
+    ]
+    if new_rows:
+        # Core INSERT: NULL 컬럼 조합이 달라도 executemany 한 번으로 처리
+        db.execute(insert(LearningQuest.__table__), new_rows)
+        db.commit()
+        existing = _quests_by_url(db, urls)
+
+    matched = [existing[url] for url in urls if url in existing]
+    return matched[:5]
 
-        if any(kw in text for kw in keywords):
-            # 기존 퀘스트 있으면 재활용
-            exist_q = db.query(LearningQuest).filter_by(url=r.url).first()
-            if exist_q:
-                matched.append(exist_q)
-                continue
 
-            q = LearningQuest(
-                title=r.title,
-                description=r.description,
-                url=r.url,
-                category=r.category,
-                xp=50,
-                difficulty="easy",
-            )
-            db.add(q)
-            matched.append(q)
+# -----------------------------------------------------------
+# 유저별 조회 헬퍼
+# -----------------------------------------------------------
+def _current_node(db: Session, user_id: int):
+    """진행 중(UNLOCKED)인 가장 앞 노드, 진행 기록이 없으면 첫 노드"""
+    progress = (
+        db.query(UserNodeProgress)
+        .filter(
+            UserNodeProgress.user_id == user_id,
+            UserNodeProgress.status == NodeStatus.UNLOCKED,
+        )
+        .order_by(UserNodeProgress.id.asc())
+        .first()
+    )
+    if progress:
+        return db.query(SkillNode).filter_by(id=progress.node_db_id).first()
+    return db.query(SkillNode).order_by(SkillNode.id.asc()).first()
 
-    db.commit()
-    return matched[:5]
+
+def _completed_quest_ids(db: Session, user_id: int) -> set:
+    return {
+        quest_id for quest_id, in
+        db.query(UserQuestProgress.quest_id)
+        .filter(
+            UserQuestProgress.user_id == user_id,
+            UserQuestProgress.status == "completed",
+        )
+    }
+
+
+def _quests_in_order(db: Session, quest_ids):
+    if not quest_ids:
+        return []
+    by_id = {q.id: q for q in db.query(LearningQuest).filter(LearningQuest.id.in_(quest_ids))}
+    return [by_id[i] for i in quest_ids if i in by_id]
+
+
+# -----------------------------------------------------------
+# 🎯 5개 선택 (자동 생성 퀘스트 우선 + 점수 엔진 상위 N개)
+# - 점수 엔진은 호출부에서 ensure_loaded() 해 둔 상태여야 함
+# -----------------------------------------------------------
+def _pick_quest_ids(tech_stack, current_node, completed_ids: set, auto_ids, today: date):
+    selected = list(auto_ids[:DAILY_RECOMMEND_COUNT])
+
+    top_ids = scoring_engine.top_ids(
+        None,
+        DAILY_RECOMMEND_COUNT - len(selected),
+        tech_stack=tech_stack or [],
+        node_label=current_node.label if current_node else None,
+        node_keywords=(current_node.search_keywords or []) if current_node else [],
+        exclude_ids=completed_ids | set(selected),
+        today=today,
+    )
+    return selected + top_ids
 
 
 # -----------------------------------------------------------
@@ -136,89 +186,237 @@ def recommend_today_quests(db: Session, user_id: int):
     # ---------------------------
     # 2) 현재 유저가 진행 중인 Node 찾기
     # ---------------------------
-    progress = (
-        db.query(UserNodeProgress)
-        .filter(
-            UserNodeProgress.user_id == user_id,
-            UserNodeProgress.status == NodeStatus.UNLOCKED,
-        )
-        .order_by(UserNodeProgress.id.asc())
-        .first()
-    )
+    current_node = _current_node(db, user_id)
 
-    current_node = None
+    # ---------------------------
+    # 3) Node 기반 자동 생성 보조 추천 (최우선)
+    # ---------------------------
+    auto_generated = auto_generate_from_resources(db, current_node)
 
-    if progress:
-        current_node = db.query(SkillNode).filter_by(id=progress.node_db_id).first()
-    else:
-        current_node = db.query(SkillNode).order_by(SkillNode.id.asc()).first()
+    # ---------------------------
+    # 4) 나머지는 점수 엔진에서 상위 N개 (이 유저가 완료한 퀘스트 제외)
+    # ---------------------------
+    scoring_engine.ensure_loaded(db)
+    quest_ids = _pick_quest_ids(
+        user.tech_stack,
+        current_node,
+        _completed_quest_ids(db, user_id),
+        [q.id for q in auto_generated],
+        today_date(),
+    )
+    selected = _quests_in_order(db, quest_ids)
 
     # ---------------------------
-    # 3) 완료되지 않은 퀘스트 모으기
+    # 5) 오늘 추천 날짜 기록
     # ---------------------------
-    candidates = (
+    mark_recommended(db, [q.id for q in selected], today)
+
+    db.commit()
+    scoring_engine.mark_recommended([q.id for q in selected], today)
+
+    return selected
+
+
+# -----------------------------------------------------------
+# 📦 UserTodayQuests 조회 / 저장
+# -----------------------------------------------------------
+def load_today_quests(db: Session, user_id: int, date_key: str):
+    """(user_id, date_key) 인덱스로 미리 계산된 오늘의 퀘스트 조회 (배정 순서대로)"""
+    return (
         db.query(LearningQuest)
-        .filter(LearningQuest.completed == False)
+        .join(UserTodayQuests, UserTodayQuests.quest_id == LearningQuest.id)
+        .filter(
+            UserTodayQuests.user_id == user_id,
+            UserTodayQuests.date_key == date_key,
+        )
+        .order_by(UserTodayQuests.id.asc())
         .all()
     )
 
-    scored_list = []
 
-    for q in candidates:
+def _today_rows(user_id: int, quest_ids, date_key: str, assigned_at: datetime):
+    return [
+        {"user_id": user_id, "quest_id": qid, "date_key": date_key, "assigned_at": assigned_at}
+        for qid in quest_ids
+    ]
 
-        # Recency Score (오래 추천 안됐을수록 점수↑)
-        if not q.last_recommended:
-            recency_score = 5
-        else:
-            days = abs(
-                (date.today() - datetime.strptime(q.last_recommended, "%Y-%m-%d").date()).days
-            )
-            recency_score = min(10, days)
 
-        # tech_stack 기반 선호도
-        interest_score = calculate_interest_score(q, user)
+def compute_today_quests(db: Session, user_id: int, date_key: str | None = None):
+    """
+    배치에서 빠진 유저(신규 가입 등)용: 즉시 계산해 UserTodayQuests에 저장 후 반환
+    동시에 같은 유저 요청이 먼저 저장했다면 그 결과를 반환
+    """
+    date_key = date_key or today_str()
+
+    user = db.query(UserProfile).filter_by(id=user_id).first()
+    if not user:
+        return []
+
+    current_node = _current_node(db, user_id)
+    auto_generated = auto_generate_from_resources(db, current_node)
 
-        # Node 기반 학습 단계 점수
-        node_score = node_related_score(q, current_node)
+    scoring_engine.ensure_loaded(db)
+    quest_ids = _pick_quest_ids(
+        user.tech_stack,
+        current_node,
+        _completed_quest_ids(db, user_id),
+        [q.id for q in auto_generated],
+        date.fromisoformat(date_key),
+    )
+    if not quest_ids:
+        return []
 
-        total = recency_score + interest_score + node_score
+    try:
+        db.execute(
+            insert(UserTodayQuests.__table__),
+            _today_rows(user_id, quest_ids, date_key, datetime.utcnow()),
+        )
+        mark_recommended(db, quest_ids, date_key)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return load_today_quests(db, user_id, date_key)
 
-        scored_list.append((total, q))
+    scoring_engine.mark_recommended(quest_ids, date_key)
+    return _quests_in_order(db, quest_ids)
 
-    # ---------------------------
-    # 4) Node 기반 자동 생성 보조 추천
-    # ---------------------------
-    auto_generated = auto_generate_from_resources(db, current_node)
 
-    # auto generate는 높은 가중치 제공
-    for q in auto_generated:
-        scored_list.append((100, q))  # 최상위 권장
+# -----------------------------------------------------------
+# 🌙 야간 배치: 활성 유저 전체의 오늘의 퀘스트를 미리 계산
+# - 유저는 chunk_size 단위로, chunk마다 진행 노드 / 완료 퀘스트 / 기존 배정을 IN 쿼리 한 번씩
+# - 점수 카탈로그는 배치 시작 시 한 번 적재, 노드별 자동 생성 결과는 배치 내 재사용
+# - last_recommended는 모든 유저 계산이 끝난 뒤 한 번에 기록 (유저 처리 순서가 결과에 영향 없음)
+# -----------------------------------------------------------
+def _insert_today_chunk(db: Session, rows_by_user: dict) -> dict:
+    """
+    청크 전체를 한 번에 INSERT. 그 사이 요청 경로(compute_today_quests)가 먼저 넣은
+    유저가 있어 유니크 키 충돌이 나면, 유저별로 다시 넣고 충돌한 유저만 건너뜀.
+    → 실제로 저장된 유저만 남긴 rows_by_user
+    """
+    rows = [r for _, user_rows in rows_by_user.values() for r in user_rows]
+    if not rows:
+        return rows_by_user
+    try:
+        with db.begin_nested():
+            db.execute(insert(UserTodayQuests.__table__), rows)
+        return rows_by_user
+    except IntegrityError:
+        pass
+
+    inserted = {}
+    for uid, (quest_ids, user_rows) in rows_by_user.items():
+        try:
+            with db.begin_nested():
+                if user_rows:
+                    db.execute(insert(UserTodayQuests.__table__), user_rows)
+            inserted[uid] = (quest_ids, user_rows)
+        except IntegrityError:
+            print(f"⏭️ [Daily Quest] user {uid}: 이미 배정됨 → 건너뜀")
+    return inserted
+
+
+def precompute_today_quests(
+    db: Session,
+    date_key: str | None = None,
+    chunk_size: int = DAILY_QUEST_BATCH_SIZE,
+    active_days: int = DAILY_QUEST_ACTIVE_DAYS,
+) -> int:
+    date_key = date_key or today_str()
+    day = date.fromisoformat(date_key)
+    since = datetime.utcnow() - timedelta(days=active_days)
+
+    first_node = db.query(SkillNode).order_by(SkillNode.id.asc()).first()
+    nodes = {}
+    auto_ids = {}
+    recommended = set()
+    computed = 0
+    last_user_id = 0
+
+    scoring_engine.ensure_loaded(db)
+
+    while True:
+        users = (
+            db.query(UserProfile.id, UserProfile.tech_stack)
+            .filter(UserProfile.id > last_user_id, UserProfile.last_login >= since)
+            .order_by(UserProfile.id.asc())
+            .limit(chunk_size)
+            .all()
+        )
+        if not users:
+            break
+        last_user_id = users[-1].id
+        user_ids = [u.id for u in users]
+
+        assigned = {
+            uid for uid, in
+            db.query(UserTodayQuests.user_id)
+            .filter(
+                UserTodayQuests.user_id.in_(user_ids),
+                UserTodayQuests.date_key == date_key,
+            )
+            .distinct()
+        }
+
+        # 유저별 진행 중인 가장 앞 노드 (UserNodeProgress.id 오름차순 첫 UNLOCKED)
+        current = {}
+        for uid, node_db_id in (
+            db.query(UserNodeProgress.user_id, UserNodeProgress.node_db_id)
+            .filter(
+                UserNodeProgress.user_id.in_(user_ids),
+                UserNodeProgress.status == NodeStatus.UNLOCKED,
+            )
+            .order_by(UserNodeProgress.id.asc())
+        ):
+            current.setdefault(uid, node_db_id)
+
+        missing = set(current.values()) - nodes.keys()
+        if missing:
+            for node in db.query(SkillNode).filter(SkillNode.id.in_(missing)):
+                nodes[node.id] = node
+
+        completed = {}
+        for uid, qid in (
+            db.query(UserQuestProgress.user_id, UserQuestProgress.quest_id)
+            .filter(
+                UserQuestProgress.user_id.in_(user_ids),
+                UserQuestProgress.status == "completed",
+            )
+        ):
+            completed.setdefault(uid, set()).add(qid)
 
-    # ---------------------------
-    # 5) 점수 높은 순 정렬 후 상위 N개 선택
-    # ---------------------------
-    scored_list.sort(key=lambda x: x[0], reverse=True)
-    selected = [q for _, q in scored_list[:DAILY_RECOMMEND_COUNT]]
+        rows_by_user = {}
+        assigned_at = datetime.utcnow()
+        for u in users:
+            if u.id in assigned:
+                continue
 
-    # ---------------------------
-    # 6) 오늘 추천 날짜 기록
-    # ---------------------------
-    for q in selected:
-        q.last_recommended = today
+            node = nodes.get(current[u.id]) if u.id in current else first_node
+            node_key = node.id if node else None
+            if node_key not in auto_ids:
+                auto_ids[node_key] = [q.id for q in auto_generate_from_resources(db, node)]
 
-    db.commit()
+            quest_ids = _pick_quest_ids(
+                u.tech_stack, node, completed.get(u.id, set()), auto_ids[node_key], day
+            )
+            rows_by_user[u.id] = (quest_ids, _today_rows(u.id, quest_ids, date_key, assigned_at))
 
-    return selected
+        for quest_ids, _ in _insert_today_chunk(db, rows_by_user).values():
+            recommended.update(quest_ids)
+            computed += 1
+        db.commit()
+
+    if recommended:
+        mark_recommended(db, recommended, date_key)
+        db.commit()
+        scoring_engine.mark_recommended(recommended, date_key)
+
+    return computed
 
 
 # -----------------------------------------------------------
-# 🔥 퀘스트 완료 처리 (현재 구조 유지)
+# 🔥 퀘스트 완료 처리 → 유저별 완료 기록은 quest_service로 일원화
 # -----------------------------------------------------------
-def complete_quest(db: Session, quest_id: int):
-    quest = db.query(LearningQuest).filter_by(id=quest_id).first()
-    if not quest:
-        return None
-
-    quest.completed = True
-    db.commit()
-    return quest
+def complete_quest(db: Session, user_id: int, quest_id: int):
+    # quest_service가 이 모듈을 import 하므로 순환 import 방지를 위해 지연 import
+    from services.quest_service import complete_quest as complete_user_quest
+    return complete_user_quest(db, user_id, quest_id)
@@ -0,0 +1,171 @@
+# backend/services/quest_scoring.py
+# flake8: noqa
+"""
+🎯 Daily Quest 점수 엔진 (NumPy)
+퀘스트 카탈로그를 한 번 적재해 두고, 유저별 추천은 벡터 연산 몇 번 + argpartition으로 끝냅니다.
+
+점수 = recency + 2 x (tech_stack 매칭 수) + 5 x (노드 label 매칭) + 3 x (노드 keyword 매칭 수)
+- recency : 추천된 적 없으면 5, 있으면 min(10, 경과 일수)
+- 매칭     : "{title} {description} {category}".lower() 에 term이 부분 문자열로 포함되는지
+
+카탈로그 구조
+- ids        : 퀘스트 id (오름차순)
+- texts      : 매칭용 소문자 텍스트
+- rec_days   : last_recommended 의 ordinal (없으면 -1)
+- term_cols  : term → bool 배열 (quest x term 행렬의 열, 처음 쓰일 때 한 번만 계산해 캐시)
+
+퀘스트가 추가 / 삭제되면 (count, max id) 서명이 바뀌어 다시 적재하고,
+last_recommended 변경은 mark_recommended()로 제자리 반영합니다. (다른 프로세스 변경은 TTL 후 반영)
+"""
+
+import os
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.models import LearningQuest
+
+
+INTEREST_WEIGHT = 2
+NODE_LABEL_WEIGHT = 5
+NODE_KEYWORD_WEIGHT = 3
+RECENCY_DEFAULT = 5
+RECENCY_CAP = 10
+
+QUEST_SCORING_TTL = float(os.getenv("QUEST_SCORING_TTL", "600"))
+
+
+def _day_ordinal(value) -> int:
+    if not value:
+        return -1
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+    except ValueError:
+        return -1
+
+
+class QuestScoringEngine:
+    def __init__(self, ttl: float = QUEST_SCORING_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._signature = None
+        self._loaded_at = 0.0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.texts = []
+        self.rec_days = np.empty(0, dtype=np.int64)
+        self.term_cols = {}
+
+    # ----------------------------------------------------------------
+    # 적재
+    # ----------------------------------------------------------------
+    def _load(self, db: Session, signature):
+        rows = (
+            db.query(
+                LearningQuest.id,
+                LearningQuest.title,
+                LearningQuest.description,
+                LearningQuest.category,
+                LearningQuest.last_recommended,
+            )
+            .order_by(LearningQuest.id)
+            .all()
+        )
+        self.ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+        self.texts = [f"{r.title} {r.description} {r.category}".lower() for r in rows]
+        self.rec_days = np.fromiter(
+            (_day_ordinal(r.last_recommended) for r in rows), dtype=np.int64, count=len(rows)
+        )
+        self.term_cols = {}
+        self._signature = signature
+        self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        signature = tuple(db.query(func.count(LearningQuest.id), func.max(LearningQuest.id)).one())
+        with self._lock:
+            expired = time.monotonic() - self._loaded_at > self.ttl
+            if signature != self._signature or expired:
+                self._load(db, signature)
+
+    def invalidate(self):
+        with self._lock:
+            self._signature = None
+
+    # ----------------------------------------------------------------
+    # quest x term 행렬 (열 단위 lazy 캐시)
+    # ----------------------------------------------------------------
+    def _term_column(self, term: str):
+        term = term.lower()
+        col = self.term_cols.get(term)
+        if col is None:
+            col = np.fromiter((term in t for t in self.texts), dtype=bool, count=len(self.texts))
+            self.term_cols[term] = col
+        return col
+
+    def _match_count(self, terms):
+        counts = np.zeros(len(self.texts), dtype=np.int64)
+        for term in terms:
+            counts += self._term_column(term)
+        return counts
+
+    # ----------------------------------------------------------------
+    # 점수 / Top-N
+    # ----------------------------------------------------------------
+    def score(self, tech_stack=(), node_label=None, node_keywords=(), today: date | None = None):
+        today = (today or date.today()).toordinal()
+        scores = np.where(
+            self.rec_days < 0,
+            RECENCY_DEFAULT,
+            np.minimum(RECENCY_CAP, np.abs(today - self.rec_days)),
+        )
+        if tech_stack:
+            scores = scores + INTEREST_WEIGHT * self._match_count(tech_stack)
+        if node_label:
+            scores = scores + NODE_LABEL_WEIGHT * self._term_column(node_label)
+        if node_keywords:
+            scores = scores + NODE_KEYWORD_WEIGHT * self._match_count(node_keywords)
+        return scores
+
+    def top_ids(self, db: Session, n: int, tech_stack=(), node_label=None, node_keywords=(),
+                exclude_ids=(), today: date | None = None):
+        """
+        → 점수 내림차순 상위 n개 퀘스트 id (동점이면 id 오름차순)
+        exclude_ids (완료 / 이미 고른 퀘스트)는 제외
+        db가 None이면 재적재 확인 없이 현재 카탈로그로 계산 (배치에서 ensure_loaded 1회 후 반복 호출)
+        """
+        if db is not None:
+            self.ensure_loaded(db)
+        with self._lock:
+            if not len(self.ids) or n <= 0:
+                return []
+
+            scores = self.score(tech_stack, node_label, node_keywords, today).astype(np.float64)
+            if len(exclude_ids):
+                scores[np.isin(self.ids, np.fromiter(exclude_ids, dtype=np.int64))] = -np.inf
+
+            valid = int(np.isfinite(scores).sum())
+            k = min(n, valid)
+            if k == 0:
+                return []
+
+            # k번째 점수만 argpartition으로 구하고, 경계 동점은 id가 작은 쪽부터
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:k - len(above)]
+            top = np.concatenate((above, ties))
+            top = top[np.lexsort((top, -scores[top]))]
+            return self.ids[top].tolist()
+
+    def mark_recommended(self, quest_ids, day: str | None):
+        """last_recommended 변경을 DB 재적재 없이 반영"""
+        with self._lock:
+            if not len(self.ids):
+                return
+            mask = np.isin(self.ids, np.fromiter(quest_ids, dtype=np.int64))
+            self.rec_days[mask] = _day_ordinal(day)
+
+
+scoring_engine = QuestScoringEngine()
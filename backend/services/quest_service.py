@@ -1,85 +1,140 @@
 # backend/services/quest_service.py
 # flake8: noqa
 
-from datetime import date
+from datetime import datetime
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from database.models import (
     LearningQuest,
     LearningResource,
-    UserProfile,
     UserNodeProgress,
+    UserQuestProgress,
+    UserNodeQuestCounter,
     SkillNode,
     NodeStatus,
 )
 
 # roadmap_service에서 노드 완료 함수 가져오기
-from services.roadmap_service import complete_node
+from services.roadmap_service import complete_node, bump_progress_version
+from services.roadmap_cache import get_compiled_track_for_node
+from services.quest_bulk import mark_completed, reset_recommendations
+from services.quest_scoring import scoring_engine
+from services.xp_service import award_xp
+from services.quest_recommender import today_str, load_today_quests, compute_today_quests
 
 
-def today_str():
-    return date.today().isoformat()
-
-# ... (recommend_from_node, generate_quests_from_resources 함수는 기존 유지) ...
-# (코드가 너무 길어지니 변경 없는 부분은 생략 표시합니다. 위 함수들은 그대로 두세요!)
-
 # =====================================================================
-# 📌 3) 오늘의 추천 퀘스트 생성 (기존 유지)
+# 📌 3) 오늘의 추천 퀘스트
+# - 야간 배치(precompute_today_quests)가 UserTodayQuests에 미리 저장 → (user_id, date_key) 조회 1회
+# - 배치에 없던 유저(신규 가입 / 휴면 후 첫 접속)는 즉시 계산 후 저장
 # =====================================================================
 def get_today_quests(db: Session, user_id: int):
-    # ... (기존 코드 그대로 유지) ...
-    # 기존 로직이 잘 작동하므로 변경하지 않았습니다.
-    # 파일 내에 기존 코드가 있다면 그대로 두셔도 됩니다.
-    
-    # 편의를 위해 앞부분 생략하고, 변경된 complete_quest 위주로 작성합니다.
-    pass 
+    date_key = today_str()
+    quests = load_today_quests(db, user_id, date_key)
+    if quests:
+        return quests
+    return compute_today_quests(db, user_id, date_key)
 
 
 # =====================================================================
-# 📌 4) 퀘스트 완료 처리 (⭐ 핵심 수정)
+# 📌 4) 퀘스트 완료 처리 (⭐ 유저별 완료 기록 + 노드 카운터)
+# - 완료 여부는 user_quest_progress에 유저별로 기록 (LearningQuest.completed는 쓰지 않음)
+# - 노드 완료 판정은 user_node_quest_counters의 completed_count >= total_count 비교 1회
 # =====================================================================
+def _node_quest_total(db: Session, node_db_id: int) -> int:
+    ct = get_compiled_track_for_node(db, node_db_id)
+    if ct and node_db_id in ct.index:
+        return len(ct.quest_ids[ct.index[node_db_id]])
+    return db.query(func.count(LearningQuest.id)).filter(LearningQuest.node_db_id == node_db_id).scalar()
+
+
+def _increment_node_counter(db: Session, user_id: int, node_db_id: int, total: int) -> int:
+    """원자적 +1 후 현재 completed_count 반환 (행이 없으면 생성)"""
+    res = db.execute(
+        update(UserNodeQuestCounter)
+        .where(
+            UserNodeQuestCounter.user_id == user_id,
+            UserNodeQuestCounter.node_db_id == node_db_id,
+        )
+        .values(
+            completed_count=UserNodeQuestCounter.completed_count + 1,
+            total_count=total,
+        )
+    )
+    if res.rowcount == 0:
+        try:
+            with db.begin_nested():
+                db.add(UserNodeQuestCounter(
+                    user_id=user_id,
+                    node_db_id=node_db_id,
+                    completed_count=1,
+                    total_count=total,
+                ))
+            return 1
+        except IntegrityError:
+            # 동시에 다른 요청이 먼저 생성 → 다시 UPDATE
+            return _increment_node_counter(db, user_id, node_db_id, total)
+
+    return (
+        db.query(UserNodeQuestCounter.completed_count)
+        .filter_by(user_id=user_id, node_db_id=node_db_id)
+        .scalar()
+    )
+
+
 def complete_quest(db: Session, user_id: int, quest_id: int):
 
     quest = db.query(LearningQuest).filter_by(id=quest_id).first()
     if not quest:
         return None
 
-    # 1. 퀘스트 완료 상태 변경
-    quest.completed = True
-    quest.last_recommended = None
+    # 1. 유저별 완료 기록 (이미 완료했다면 XP / 카운터 중복 반영 없음)
+    progress = (
+        db.query(UserQuestProgress)
+        .filter_by(user_id=user_id, quest_id=quest_id)
+        .first()
+    )
+    if progress and progress.status == "completed":
+        return quest
+
+    if not progress:
+        progress = UserQuestProgress(user_id=user_id, quest_id=quest_id)
+        db.add(progress)
+    progress.node_db_id = quest.node_db_id
+    progress.status = "completed"
+    progress.completed_at = datetime.utcnow()
+
+    try:
+        db.flush()
+    except IntegrityError:
+        # 같은 요청이 동시에 들어와 먼저 기록됨
+        db.rollback()
+        return quest
 
-    # 2. 유저 XP 지급
-    user = db.query(UserProfile).filter_by(id=user_id).first()
-    if user:
-        user.current_xp += quest.xp
-        while user.current_xp >= 100:
-            user.current_xp -= 100
-            user.level += 1
+    mark_completed(db, [quest.id])
 
-    # 3. ⭐ [핵심] 형제 퀘스트(같은 노드) 모두 완료 체크
+    # 2. 유저 XP 지급 → 원장에 적립만 (UserProfile 반영은 compactor가 모아서)
+    award_xp(db, user_id, quest.xp, f"quest:{quest.id}")
+
+    # 3. ⭐ 노드 카운터 +1 → 노드 퀘스트를 전부 깼을 때만 노드 완료 처리
     if quest.node_db_id:
-        # 같은 노드 ID를 가진 모든 퀘스트 조회
-        sibling_quests = db.query(LearningQuest).filter(
-            LearningQuest.node_db_id == quest.node_db_id
-        ).all()
-        
-        # 하나라도 안 깬 게 있는지 확인 (all returns True if list is empty or all true)
-        all_cleared = all(q.completed for q in sibling_quests)
-        
-        # 전부 다 깼을 때만 노드 완료 처리!
-        if all_cleared:
+        bump_progress_version(db, user_id, quest.node_db_id)
+        total = _node_quest_total(db, quest.node_db_id)
+        done = _increment_node_counter(db, user_id, quest.node_db_id, total)
+
+        if done >= total:
             print(f"🎉 Node {quest.node_db_id} All Quests Cleared! Unlocking Next...")
-            complete_node(db, user_id, quest.node_db_id)
-    
-    # (기존의 불안정한 텍스트 매칭 로직은 제거하거나 else로 처리)
-    
+            complete_node(db, user_id, quest.node_db_id, commit=False)
+
     db.commit()
+    scoring_engine.mark_recommended([quest.id], None)
     return quest
 
 
 def reset_today_recommendations(db: Session):
-    quests = db.query(LearningQuest).all()
-    for q in quests:
-        q.last_recommended = None
+    reset_recommendations(db)
     db.commit()
+    scoring_engine.invalidate()
     return True
\ No newline at end of file
@@ -0,0 +1,142 @@
+# backend/services/resource_index.py
+# flake8: noqa
+"""
+📚 LearningResource 키워드 인덱스
+노드 키워드마다 전체 리소스를 훑지 않도록 "{title} {description} {category}".lower() 를
+공백 단위 토큰으로 쪼개고, 토큰의 1~3글자 n-gram → 리소스 위치 역색인을 만들어 둡니다.
+
+매칭 규칙은 기존과 같이 "키워드가 텍스트의 부분 문자열인가" 입니다.
+- 키워드를 공백으로 나눈 각 조각은 반드시 텍스트의 어떤 토큰 안에 들어 있으므로
+  조각의 모든 n-gram(3글자 이하 조각은 그 자체)이 텍스트에 있어야 함
+  → n-gram posting 교집합 = 후보 (어휘 전체를 훑지 않고 조각 길이만큼의 조회)
+- 후보만 실제 `kw in text` 로 확인 (n-gram 위치가 어긋난 거짓 양성 제거)
+- 키워드별 결과는 인덱스가 다시 적재될 때까지 캐시
+
+리소스가 추가 / 삭제되면 (count, max id) 서명이 바뀌어 다시 적재하고,
+그 외 변경은 RESOURCE_INDEX_TTL 후 반영됩니다.
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.models import LearningResource
+
+
+RESOURCE_INDEX_TTL = float(os.getenv("RESOURCE_INDEX_TTL", "600"))
+NGRAM = 3
+
+
+def _grams(part: str):
+    """조각 검색에 필요한 n-gram (NGRAM 글자 이하면 조각 자체 하나)"""
+    if len(part) <= NGRAM:
+        return {part}
+    return {part[i:i + NGRAM] for i in range(len(part) - NGRAM + 1)}
+
+
+def _token_grams(token: str):
+    """토큰에 들어 있는 1~NGRAM 글자 n-gram 전부"""
+    return {
+        token[i:i + n]
+        for n in range(1, NGRAM + 1)
+        for i in range(len(token) - n + 1)
+    }
+
+
+class ResourceIndex:
+    def __init__(self, ttl: float = RESOURCE_INDEX_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._signature = None
+        self._loaded_at = 0.0
+        self.rows = []        # (title, description, url, category), id 오름차순
+        self.texts = []
+        self.postings = {}    # n-gram → 리소스 위치 set
+        self.matches = {}     # keyword → 리소스 위치 tuple
+
+    # ----------------------------------------------------------------
+    # 적재
+    # ----------------------------------------------------------------
+    def _load(self, db: Session, signature):
+        rows = (
+            db.query(
+                LearningResource.title,
+                LearningResource.description,
+                LearningResource.url,
+                LearningResource.category,
+            )
+            .order_by(LearningResource.id)
+            .all()
+        )
+        postings = defaultdict(set)
+        texts = []
+        for i, r in enumerate(rows):
+            text = f"{r.title} {r.description} {r.category}".lower()
+            texts.append(text)
+            grams = set()
+            for token in set(text.split()):
+                grams |= _token_grams(token)
+            for gram in grams:
+                postings[gram].add(i)
+
+        self.rows = [tuple(r) for r in rows]
+        self.texts = texts
+        self.postings = dict(postings)
+        self.matches = {}
+        self._signature = signature
+        self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        signature = tuple(
+            db.query(func.count(LearningResource.id), func.max(LearningResource.id)).one()
+        )
+        with self._lock:
+            expired = time.monotonic() - self._loaded_at > self.ttl
+            if signature != self._signature or expired:
+                self._load(db, signature)
+
+    def invalidate(self):
+        with self._lock:
+            self._signature = None
+
+    # ----------------------------------------------------------------
+    # 조회
+    # ----------------------------------------------------------------
+    def _candidates(self, keyword: str):
+        candidates = None
+        for part in keyword.split():
+            for gram in _grams(part):
+                hits = self.postings.get(gram)
+                if not hits:
+                    return set()
+                candidates = set(hits) if candidates is None else candidates & hits
+                if not candidates:
+                    return set()
+        # 공백뿐인 키워드는 모든 텍스트에 포함됨
+        return set(range(len(self.texts))) if candidates is None else candidates
+
+    def _lookup(self, keyword: str):
+        found = self.matches.get(keyword)
+        if found is None:
+            found = tuple(sorted(i for i in self._candidates(keyword) if keyword in self.texts[i]))
+            self.matches[keyword] = found
+        return found
+
+    def search(self, db: Session, keywords):
+        """
+        → 키워드 중 하나라도 포함하는 리소스 (title, description, url, category) 목록
+        순서는 리소스 id 오름차순
+        """
+        self.ensure_loaded(db)
+        with self._lock:
+            hits = set()
+            for kw in keywords:
+                hits.update(self._lookup(kw))
+            return [self.rows[i] for i in sorted(hits)]
+
+
+resource_index = ResourceIndex()
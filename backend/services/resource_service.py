@@ -2,7 +2,6 @@
 # flake8: noqa
 
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from database.models import (
     SkillTrack,
@@ -12,6 +11,7 @@ from database.models import (
     LearningQuest,
     UserQuestProgress
 )
+from services.roadmap_service import complete_node as complete_roadmap_node
 
 
 # ================================================================
@@ -134,100 +134,8 @@ def get_roadmap(db: Session, track_slug: str, user_id: int | None):
 
 
 # ================================================================
-# 📌 노드 완료 처리 → 퀘스트도 함께 COMPLETED 처리
+# 📌 노드 완료 처리 → roadmap_service의 단일 트랜잭션 완료 API로 위임
+# (비트셋 / 간선 테이블 / 멱등 처리 / 진행도 version 갱신을 한 곳에서)
 # ================================================================
 def complete_node(db: Session, user_id: int, node_db_id: int):
-
-    # Node Progress 업데이트
-    progress = (
-        db.query(UserNodeProgress)
-        .filter_by(user_id=user_id, node_db_id=node_db_id)
-        .first()
-    )
-
-    if not progress:
-        progress = UserNodeProgress(
-            user_id=user_id,
-            node_db_id=node_db_id,
-            status=NodeStatus.COMPLETED,
-            completed_at=datetime.utcnow(),
-        )
-        db.add(progress)
-    else:
-        progress.status = NodeStatus.COMPLETED
-        progress.completed_at = datetime.utcnow()
-
-    db.commit()
-
-    # 해당 노드 연결된 Quest도 자동 완료
-    _complete_related_quest(db, user_id, node_db_id)
-
-    # 다음 노드 자동 Unlock
-    _unlock_next_nodes(db, user_id, node_db_id)
-
-    return progress
-
-
-# ================================================================
-# 📌 Node → 연결된 Quest 자동 완료
-# ================================================================
-def _complete_related_quest(db: Session, user_id: int, node_db_id: int):
-
-    node = db.query(SkillNode).filter_by(id=node_db_id).first()
-    if not node or not node.main_quest_id:
-        return
-
-    # 기존 퀘스트 진행 기록 체크
-    qp = (
-        db.query(UserQuestProgress)
-        .filter_by(user_id=user_id, quest_id=node.main_quest_id)
-        .first()
-    )
-
-    if qp:
-        qp.status = "completed"
-        qp.completed_at = datetime.utcnow()
-    else:
-        db.add(
-            UserQuestProgress(
-                user_id=user_id,
-                quest_id=node.main_quest_id,
-                status="completed",
-                completed_at=datetime.utcnow(),
-            )
-        )
-    db.commit()
-
-
-# ================================================================
-# 📌 prerequisites 충족한 다음 노드 자동 해금
-# ================================================================
-def _unlock_next_nodes(db: Session, user_id: int, node_db_id: int):
-    node = db.query(SkillNode).filter_by(id=node_db_id).first()
-    if not node:
-        return
-
-    next_nodes = (
-        db.query(SkillNode)
-        .filter(SkillNode.prerequisites.contains([node.node_id]))
-        .all()
-    )
-
-    for n in next_nodes:
-        exists = (
-            db.query(UserNodeProgress)
-            .filter_by(user_id=user_id, node_db_id=n.id)
-            .first()
-        )
-        if exists:
-            continue
-
-        db.add(
-            UserNodeProgress(
-                user_id=user_id,
-                node_db_id=n.id,
-                status=NodeStatus.UNLOCKED,
-            )
-        )
-
-    db.commit()
+    return complete_roadmap_node(db, user_id, node_db_id)
@@ -0,0 +1,215 @@
+# backend/services/roadmap_cache.py
+# flake8: noqa
+"""
+🗺️ 컴파일된 로드맵 구조 캐시 (프로세스 단위)
+트랙 구조(노드 / 선행관계 / 퀘스트 구성)는 seed 스크립트가 돌 때만 바뀌므로
+한 번 컴파일해 두고, 요청마다 트랙 한 줄 조회로 (id, version)만 유효성을 확인합니다.
+
+CompiledTrack
+- node_ids / index   : 표시 순서의 노드 db_id ↔ 배열 인덱스
+- parents / children : 인덱스 기반 DAG (트랙 밖 선행 노드는 missing_parent로 표시)
+- prereq_masks       : 노드별 선행 노드 비트마스크 (bit i = 인덱스 i), 트랙 밖 선행 노드가 있으면 None
+- topo_order         : Kahn 위상 정렬 순서
+- node_payloads      : status / quests 를 제외하고 미리 직렬화한 노드 dict
+- quest_payloads     : completed 를 제외하고 미리 직렬화한 퀘스트 dict (노드별)
+- public_payload     : public 모드 응답 전체 (유저 정보가 필요 없으므로 통째로 재사용)
+
+다른 프로세스(seed 스크립트)에서 구조를 바꾸면 SkillTrack.version이 새로 발급되어 자동으로 재컴파일되고,
+같은 프로세스에서는 invalidate_roadmap_cache()로 즉시 비울 수 있습니다.
+"""
+
+import threading
+from collections import deque
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
+
+from database.models import SkillTrack, SkillNode, NodeStatus, new_track_version
+
+
+# ====================================================================
+# 📦 컴파일 결과
+# ====================================================================
+class CompiledTrack:
+    __slots__ = (
+        "track_id", "version", "slug", "title", "description",
+        "node_ids", "index", "by_node_id",
+        "parents", "children", "missing_parent", "has_prerequisites", "topo_order", "prereq_masks",
+        "quest_ids", "node_payloads", "quest_payloads", "public_payload",
+    )
+
+
+def _topological_order(parents: list, children: list):
+    """
+    Kahn 위상 정렬 (인덱스 기준).
+    순환이 있으면 남은 노드를 원래 순서대로 뒤에 붙임
+    """
+    n = len(parents)
+    indegree = [len(p) for p in parents]
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for c in children[i]:
+            indegree[c] -= 1
+            if indegree[c] == 0:
+                queue.append(c)
+
+    if len(order) < n:
+        placed = set(order)
+        order.extend(i for i in range(n) if i not in placed)
+    return order
+
+
+def _serialize_node(node: SkillNode) -> dict:
+    return {
+        "db_id": node.id,
+        "id": node.node_id,
+        "label": node.label,
+        "description": node.description,
+        "icon": node.icon_slug,
+        "position": node.position,
+        "xp": node.xp_reward,
+        "prerequisites": node.prerequisites,
+        "resource_link": node.resource_link,
+        "thumbnail": node.thumbnail,
+    }
+
+
+def _serialize_quest(node: SkillNode, q) -> dict:
+    return {
+        "quest_id": q.id,
+        "node_db_id": node.id,
+        "title": q.title,
+        "description": q.description,
+        "xp": q.xp,
+        "category": q.category,
+        "url": q.url,
+        "resource_link": q.url,
+    }
+
+
+def compile_track(db: Session, track: SkillTrack) -> CompiledTrack:
+    """트랙 노드 + 퀘스트를 쿼리 2회로 로드해 인덱스 기반 구조로 컴파일"""
+    nodes = (
+        db.query(SkillNode)
+        .options(selectinload(SkillNode.quests))
+        .filter(SkillNode.track_id == track.id)
+        .order_by(SkillNode.id)
+        .all()
+    )
+
+    ct = CompiledTrack()
+    ct.track_id = track.id
+    ct.version = track.version
+    ct.slug = track.slug
+    ct.title = track.title
+    ct.description = track.description
+
+    ct.node_ids = [n.id for n in nodes]
+    ct.index = {n.id: i for i, n in enumerate(nodes)}
+    ct.by_node_id = {n.node_id: i for i, n in enumerate(nodes)}
+
+    ct.parents = [[] for _ in nodes]
+    ct.children = [[] for _ in nodes]
+    ct.missing_parent = [False] * len(nodes)
+    ct.has_prerequisites = [bool(n.prerequisites) for n in nodes]
+
+    for i, n in enumerate(nodes):
+        for parent in n.prerequisites or []:
+            p = ct.by_node_id.get(parent)
+            if p is None:
+                ct.missing_parent[i] = True
+                continue
+            ct.parents[i].append(p)
+            ct.children[p].append(i)
+
+    ct.topo_order = _topological_order(ct.parents, ct.children)
+    ct.prereq_masks = [
+        None if ct.missing_parent[i] else sum(1 << p for p in set(ct.parents[i]))
+        for i in range(len(nodes))
+    ]
+
+    ct.quest_ids = [[q.id for q in n.quests] for n in nodes]
+    ct.node_payloads = [_serialize_node(n) for n in nodes]
+    ct.quest_payloads = [[_serialize_quest(n, q) for q in n.quests] for n in nodes]
+
+    # public 모드: 첫 노드만 UNLOCKED, 퀘스트는 모두 미완료
+    ct.public_payload = {
+        "track_title": ct.title,
+        "track_desc": ct.description,
+        "nodes": [
+            {
+                **payload,
+                "status": NodeStatus.UNLOCKED if i == 0 else NodeStatus.LOCKED,
+                "quests": [{**q, "completed": False} for q in ct.quest_payloads[i]],
+            }
+            for i, payload in enumerate(ct.node_payloads)
+        ],
+    }
+    return ct
+
+
+# ====================================================================
+# 🗃️ 캐시
+# ====================================================================
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _compiled_for(db: Session, track: SkillTrack) -> CompiledTrack:
+    cached = _compiled.get(track.slug)
+    if cached is not None and (cached.track_id, cached.version) == (track.id, track.version):
+        return cached
+
+    compiled = compile_track(db, track)
+    with _compiled_lock:
+        _compiled[track.slug] = compiled
+    print(f"🗺️ Roadmap compiled: {track.slug} (v{compiled.version}, {len(compiled.node_ids)} nodes)")
+    return compiled
+
+
+def get_compiled_track(db: Session, track_slug: str):
+    """
+    → CompiledTrack | None
+    트랙 한 줄만 조회해 (id, version)을 캐시와 비교하고, 다르면 재컴파일
+    """
+    track = db.query(SkillTrack).filter_by(slug=track_slug).first()
+    if not track:
+        invalidate_roadmap_cache(track_slug)
+        return None
+    return _compiled_for(db, track)
+
+
+def get_compiled_track_for_node(db: Session, node_db_id: int):
+    """노드가 속한 트랙의 CompiledTrack | None"""
+    track = (
+        db.query(SkillTrack)
+        .join(SkillNode, SkillNode.track_id == SkillTrack.id)
+        .filter(SkillNode.id == node_db_id)
+        .first()
+    )
+    if not track:
+        return None
+    return _compiled_for(db, track)
+
+
+def invalidate_roadmap_cache(track_slug: str | None = None):
+    with _compiled_lock:
+        if track_slug is None:
+            _compiled.clear()
+        else:
+            _compiled.pop(track_slug, None)
+
+
+def bump_track_version(db: Session, track_id: int | None = None):
+    """
+    트랙 구조를 바꾼 쪽에서 호출 → 새 version 발급 (다른 프로세스 캐시도 다음 요청에서 재컴파일)
+    track_id가 없으면 전체 트랙. commit은 호출부에서.
+    """
+    stmt = update(SkillTrack).values(version=new_track_version())
+    if track_id is not None:
+        stmt = stmt.where(SkillTrack.id == track_id)
+    db.execute(stmt)
+    invalidate_roadmap_cache()
@@ -1,39 +1,190 @@
 # backend/services/roadmap_scraper.py
+"""
+🕷️ 생활코딩 강의 크롤러 (async)
+- httpx.AsyncClient 하나로 keep-alive 연결을 재사용하고, 전체 동시 요청은 CRAWL_CONCURRENCY로 제한
+- 호스트별 예절: 동시 요청 CRAWL_HOST_CONCURRENCY개 + 요청 시작 간격 CRAWL_HOST_INTERVAL초
+- 디스크 HTTP 캐시: ETag / Last-Modified 를 저장해 두고 조건부 GET → 304면 저장된 본문 사용
+  (재시드 시 바뀐 페이지만 다시 받음)
 
-import requests
-from bs4 import BeautifulSoup
+동기 코드(seed 스크립트)에서는 기존처럼 crawl_life_coding_library() 를 호출하면 됩니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
 import time
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
 
 BASE_URL = "https://opentutorials.org"
 
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "4"))
+CRAWL_HOST_INTERVAL = float(os.getenv("CRAWL_HOST_INTERVAL", "0.1"))
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "10"))
+CRAWL_CACHE_DIR = os.getenv(
+    "CRAWL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http"),
+)
+
+# URL 너무 많아지면 200개 이하로 잘라서 안정성 유지
+LESSON_LIMIT = 200
+
+
+# -----------------------------------------------------------
+# 💾 디스크 HTTP 캐시 (URL 하나당 JSON 파일 하나)
+# -----------------------------------------------------------
+class HttpDiskCache:
+    def __init__(self, directory: str = CRAWL_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, url: str) -> str:
+        name = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, url: str):
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def set(self, url: str, response: httpx.Response):
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not etag and not last_modified:
+            return  # 검증자가 없으면 조건부 GET이 불가능하므로 저장하지 않음
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"url": url, "etag": etag, "last_modified": last_modified, "body": response.text},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp, path)
+
 
 # -----------------------------------------------------------
-# 기본 요청 함수
+# 🚦 호스트별 예절 (동시 요청 수 + 요청 시작 간격)
 # -----------------------------------------------------------
-def _request(url):
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
+class HostBudget:
+    def __init__(self, concurrency: int, interval: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class Crawler:
+    def __init__(
+        self,
+        concurrency: int = CRAWL_CONCURRENCY,
+        host_concurrency: int = CRAWL_HOST_CONCURRENCY,
+        host_interval: float = CRAWL_HOST_INTERVAL,
+        cache: HttpDiskCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.concurrency = concurrency
+        self.host_concurrency = host_concurrency
+        self.host_interval = host_interval
+        self.cache = cache if cache is not None else HttpDiskCache()
+        self.transport = transport
+        self._hosts = {}
+        self._global = None
+        self.client = None
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0}
+
+    async def __aenter__(self):
+        self._global = asyncio.Semaphore(self.concurrency)
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=CRAWL_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=self.transport,
         )
-    }
-    time.sleep(0.3)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    def _budget(self, url: str) -> HostBudget:
+        host = urlsplit(url).netloc
+        budget = self._hosts.get(host)
+        if budget is None:
+            budget = self._hosts[host] = HostBudget(self.host_concurrency, self.host_interval)
+        return budget
+
+    async def fetch(self, url: str) -> str:
+        """→ 본문 HTML (304면 캐시 본문). 실패하면 예외"""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
 
-    resp = requests.get(url, headers=headers, timeout=10)
-    resp.raise_for_status()
-    return resp.text
+        async with self._global, self._budget(url):
+            resp = await self.client.get(url, headers=headers)
+
+        if resp.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return cached["body"]
+
+        resp.raise_for_status()
+        self.stats["fetched"] += 1
+        self.cache.set(url, resp)
+        return resp.text
+
+
+def _run(coro):
+    """동기 코드에서 코루틴 실행 (이미 이벤트 루프 안이면 별도 스레드에서)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
 
 
 # -----------------------------------------------------------
 # 1) 생활코딩 홈(course/1)에서 lesson URL 수집
 # -----------------------------------------------------------
-def find_lessons_from_root():
-    """생활코딩 메인(course/1) 페이지에서 모든 강의 링크 탐색"""
-    root_url = f"{BASE_URL}/course/1"
-    print(f"   📘 Crawling 생활코딩 메인: {root_url}")
-
-    html = _request(root_url)
+def parse_lesson_links(html: str):
     soup = BeautifulSoup(html, "html.parser")
 
     lesson_links = []
@@ -64,55 +215,95 @@ def find_lessons_from_root():
     return lesson_links
 
 
+async def find_lessons_from_root_async(crawler: Crawler):
+    """생활코딩 메인(course/1) 페이지에서 모든 강의 링크 탐색"""
+    root_url = f"{BASE_URL}/course/1"
+    print(f"   📘 Crawling 생활코딩 메인: {root_url}")
+    return parse_lesson_links(await crawler.fetch(root_url))
+
+
+async def _find_lessons_once():
+    async with Crawler() as crawler:
+        return await find_lessons_from_root_async(crawler)
+
+
+def find_lessons_from_root():
+    return _run(_find_lessons_once())
+
+
 # -----------------------------------------------------------
 # 2) 단일 강의 페이지 스크래핑
 # -----------------------------------------------------------
-def scrape_opentutorials(url):
-    try:
-        print(f"      🕷️ Scraping: {url}", end=" ")
+def _fallback_lesson(url):
+    return {
+        "title": "생활코딩 강의",
+        "description": "",
+        "resource_link": url,
+        "thumbnail": None,
+    }
 
-        html = _request(url)
-        soup = BeautifulSoup(html, "html.parser")
 
-        title_tag = soup.find("meta", property="og:title")
-        desc_tag = soup.find("meta", property="og:description")
+def parse_lesson(url: str, html: str):
+    soup = BeautifulSoup(html, "html.parser")
+
+    title_tag = soup.find("meta", property="og:title")
+    desc_tag = soup.find("meta", property="og:description")
 
-        title = title_tag["content"] if title_tag else "생활코딩 강의"
-        desc = desc_tag["content"] if desc_tag else ""
+    title = title_tag["content"] if title_tag else "생활코딩 강의"
+    desc = desc_tag["content"] if desc_tag else ""
+
+    return {
+        "title": title.strip(),
+        "description": desc[:250].strip(),
+        "resource_link": url,
+        "thumbnail": None,
+    }
 
-        print("OK")
-        return {
-            "title": title.strip(),
-            "description": desc[:250].strip(),
-            "resource_link": url,
-            "thumbnail": None,
-        }
 
+async def scrape_opentutorials_async(crawler: Crawler, url: str):
+    try:
+        lesson = parse_lesson(url, await crawler.fetch(url))
+        print(f"      🕷️ Scraping: {url} OK")
+        return lesson
     except Exception as e:
-        print(f"FAILED ({e})")
-        return {
-            "title": "생활코딩 강의",
-            "description": "",
-            "resource_link": url,
-            "thumbnail": None,
-        }
+        crawler.stats["failed"] += 1
+        reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+        print(f"      🕷️ Scraping: {url} FAILED ({reason})")
+        return _fallback_lesson(url)
+
+
+async def _scrape_once(url):
+    async with Crawler() as crawler:
+        return await scrape_opentutorials_async(crawler, url)
+
+
+def scrape_opentutorials(url):
+    return _run(_scrape_once(url))
 
 
 # -----------------------------------------------------------
 # 3) 최종 → 생활코딩 라이브러리 크롤링
 # -----------------------------------------------------------
-def crawl_life_coding_library():
-    print("🔥 생활코딩 강의 수집 시작...")
+async def crawl_life_coding_library_async(crawler: Crawler | None = None):
+    if crawler is None:
+        async with Crawler() as crawler:
+            return await crawl_life_coding_library_async(crawler)
 
-    lesson_urls = find_lessons_from_root()
-    lessons = []
+    print("🔥 생활코딩 강의 수집 시작...")
 
-    # URL 너무 많아지면 200개 이하로 잘라서 안정성 유지
-    LESSON_LIMIT = 200
+    lesson_urls = await find_lessons_from_root_async(crawler)
     lesson_urls = lesson_urls[:LESSON_LIMIT]
 
-    for url in lesson_urls:
-        lessons.append(scrape_opentutorials(url))
+    # gather는 입력 순서를 유지 → 기존 순차 크롤링과 같은 순서의 결과
+    lessons = await asyncio.gather(
+        *(scrape_opentutorials_async(crawler, url) for url in lesson_urls)
+    )
+
+    s = crawler.stats
+    print(f"\n📚 Total lessons parsed: {len(lessons)} "
+          f"(fetched={s['fetched']}, cached={s['not_modified']}, failed={s['failed']})")
+    return list(lessons)
 
-    print(f"\n📚 Total lessons parsed: {len(lessons)}")
-    return lessons
+
+def crawl_life_coding_library():
+    return _run(crawl_life_coding_library_async())
@@ -1,11 +1,15 @@
 # backend/services/roadmap_service.py
 # flake8: noqa
 
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 from datetime import datetime
 from database.models import (
-    SkillTrack, SkillNode, UserNodeProgress, NodeStatus
+    SkillNode, SkillNodeEdge, UserNodeProgress, UserTrackProgress, UserQuestProgress, NodeStatus
 )
+from services.roadmap_cache import get_compiled_track, get_compiled_track_for_node
 
 # ================================================================
 # 📌 1) 유저 현재 챕터
@@ -51,185 +55,327 @@ def get_related_categories(chapter: str | None):
 
 
 # ================================================================
-# 📌 3) 로드맵 조회 (public/personal 자동 지원)
+# 📌 3) 유저 진행도 오버레이 (비트셋)
+# - 트랙 구조는 roadmap_cache의 CompiledTrack을 재사용
+# - 유저 진행도는 user_track_progress 한 줄(completed / unlocked 비트마스크)로 읽고,
+#   트랙 버전이 바뀌었으면 UserNodeProgress에서 한 번 재구성
+# - 해금 판정은 노드별 (prereq_mask & done) == prereq_mask 비트 연산
 # ================================================================
-def get_roadmap(db: Session, track_slug: str, user_id: int | None):
+def _to_hex(mask: int) -> str:
+    return format(mask, "x")
 
-    # 1) 트랙 조회
-    track = db.query(SkillTrack).filter_by(slug=track_slug).first()
-    if not track:
-        return None
 
-    # 2) 스킬 노드 전체
-    nodes = db.query(SkillNode).filter_by(track_id=track.id).all()
-
-    # 3) personal 모드 → 유저 진행 정보 조회
-    progress_map = {}
-    if user_id:
-        user_progress = db.query(UserNodeProgress).filter_by(user_id=user_id).all()
-        progress_map = {p.node_db_id: p.status for p in user_progress}
-
-    node_str_to_db = {n.node_id: n.id for n in nodes}
-
-    # 4) 응답 노드 리스트 구성
-    result_nodes = []
-    for node in nodes:
-        
-        # ------------------------------------------------------------
-        # 🔥 [수정] 퀘스트 데이터 구성 및 완료 여부 강제 초기화 로직
-        # ------------------------------------------------------------
-        quests_data = []
-        
-        # user_id가 없으면(Public 모드) 퀘스트 전체 완료 여부도 False로 시작
-        all_quests_completed = True if (node.quests and user_id) else False 
-
-        for q in node.quests:
-            # ⭐ [핵심 수정] user_id가 없으면 무조건 미완료(False) 처리
-            # 이렇게 해야 새로고침 시(user_id=None일 때) 퀘스트가 초기화되어 보입니다.
-            is_completed = q.completed if user_id else False
-
-            quests_data.append({
-                "quest_id": q.id,
-                "node_db_id": node.id,
-                "title": q.title,
-                "description": q.description,
-                "xp": q.xp,
-                "category": q.category,
-                "url": q.url, 
-                "resource_link": q.url,
-                "completed": is_completed  # 수정된 상태값 사용
-            })
-            
-            # 하나라도 안 깬 게 있으면(혹은 강제 False면) 전체 완료 X
-            if not is_completed:
-                all_quests_completed = False
-        
-        if not node.quests:
-            all_quests_completed = False
-
-
-        # ----------------------------
-        # 🔹 4-1) 상태(Status) 결정
-        # ----------------------------
-        if user_id:
-            # 1. DB에 완료 기록이 있으면 완료
-            if node.id in progress_map and progress_map[node.id] == NodeStatus.COMPLETED:
-                status = NodeStatus.COMPLETED
-            
-            # 2. 퀘스트가 다 깨져있으면 완료로 간주
-            elif all_quests_completed:
-                status = NodeStatus.COMPLETED
-
-            # 3. 해금(Unlock) 여부 판단
-            elif not node.prerequisites:
-                status = NodeStatus.UNLOCKED
-            else:
-                unlockable = True
-                for parent in node.prerequisites:
-                    parent_db = node_str_to_db.get(parent)
-                    
-                    # 부모가 완료되었는지 확인
-                    parent_node = next((n for n in nodes if n.id == parent_db), None)
-                    is_parent_done = False
-
-                    # 부모 DB 기록 확인
-                    if parent_db in progress_map and progress_map[parent_db] == NodeStatus.COMPLETED:
-                        is_parent_done = True
-                    # 부모 퀘스트 확인 (user_id가 있을 때만 유효)
-                    elif parent_node and parent_node.quests:
-                         # 여기도 마찬가지로 user_id가 있을 때만 q.completed를 믿음
-                         if all(q.completed for q in parent_node.quests):
-                             is_parent_done = True
-                    
-                    if not is_parent_done:
-                        unlockable = False
-                        break
-                
-                status = NodeStatus.UNLOCKED if unlockable else NodeStatus.LOCKED
+def _from_hex(value: str | None) -> int:
+    return int(value, 16) if value else 0
+
+
+def _load_progress_map(db: Session, user_id: int, node_ids: list):
+    if not user_id or not node_ids:
+        return {}
+    rows = (
+        db.query(UserNodeProgress.node_db_id, UserNodeProgress.status)
+        .filter(
+            UserNodeProgress.user_id == user_id,
+            UserNodeProgress.node_db_id.in_(node_ids),
+        )
+        .all()
+    )
+    return {node_db_id: status for node_db_id, status in rows}
+
+
+def _build_masks(ct, progress_map: dict):
+    completed = unlocked = 0
+    for node_db_id, status in progress_map.items():
+        i = ct.index.get(node_db_id)
+        if i is None:
+            continue
+        if status == NodeStatus.COMPLETED:
+            completed |= 1 << i
+        elif status == NodeStatus.UNLOCKED:
+            unlocked |= 1 << i
+    return completed, unlocked
+
+
+def _load_track_bits(db: Session, user_id: int, ct, for_update: bool = False):
+    """
+    → (UserTrackProgress, completed_mask, unlocked_mask)
+    행이 없거나 track_version이 다르면 UserNodeProgress로 재구성 (flush만, commit은 호출부)
+    """
+    q = db.query(UserTrackProgress).filter_by(user_id=user_id, track_id=ct.track_id)
+    if for_update:
+        q = q.with_for_update()
+    row = q.first()
+
+    if row is not None and row.track_version == ct.version:
+        return row, _from_hex(row.completed_mask), _from_hex(row.unlocked_mask)
+
+    completed, unlocked = _build_masks(ct, _load_progress_map(db, user_id, ct.node_ids))
+    if row is None:
+        row = UserTrackProgress(user_id=user_id, track_id=ct.track_id, version=0)
+        db.add(row)
+    else:
+        row.version += 1
+    row.track_version = ct.version
+    row.completed_mask = _to_hex(completed)
+    row.unlocked_mask = _to_hex(unlocked)
+    return row, completed, unlocked
+
+
+def _get_user_masks(db: Session, user_id: int, ct):
+    """조회 경로: 재구성이 필요했을 때만 저장 (동시 생성 충돌은 무시하고 계산값 사용)"""
+    row, completed, unlocked = _load_track_bits(db, user_id, ct)
+    if row in db.new or row in db.dirty:
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+    return completed, unlocked
+
+
+def _load_completed_quest_ids(db: Session, user_id: int, node_ids: list):
+    if not node_ids:
+        return set()
+    rows = (
+        db.query(UserQuestProgress.quest_id)
+        .filter(
+            UserQuestProgress.user_id == user_id,
+            UserQuestProgress.node_db_id.in_(node_ids),
+            UserQuestProgress.status == "completed",
+        )
+        .all()
+    )
+    return {quest_id for quest_id, in rows}
+
+
+def _quest_done_mask(ct, completed_quests: set) -> int:
+    mask = 0
+    for i, quest_ids in enumerate(ct.quest_ids):
+        if quest_ids and all(q in completed_quests for q in quest_ids):
+            mask |= 1 << i
+    return mask
+
+
+def _resolve_statuses(ct, completed_mask: int, completed_quests: set):
+    """
+    → [NodeStatus] (CompiledTrack 인덱스 순)
+    - COMPLETED : DB 완료 기록 or (해당 유저가) 노드 퀘스트 전부 완료
+    - UNLOCKED  : 선행 노드가 없거나, 모든 선행 노드가 완료(기록 or 퀘스트 전부 완료)
+    - LOCKED    : 그 외 (트랙 밖 선행 노드는 미완료로 취급)
+    """
+    done = completed_mask | _quest_done_mask(ct, completed_quests)
+
+    statuses = []
+    for i, prereq in enumerate(ct.prereq_masks):
+        if done >> i & 1:
+            statuses.append(NodeStatus.COMPLETED)
+        elif not ct.has_prerequisites[i]:
+            statuses.append(NodeStatus.UNLOCKED)
+        elif prereq is not None and done & prereq == prereq:
+            statuses.append(NodeStatus.UNLOCKED)
         else:
-            # ⭐ user_id가 없으면(Public 모드) 무조건 첫 번째만 UNLOCKED
-            status = NodeStatus.UNLOCKED if node == nodes[0] else NodeStatus.LOCKED
-
-        # ============================================================
-        # 🔥 6) 최종 노드 데이터 조립
-        # ============================================================
-        result_nodes.append({
-            "db_id": node.id,
-            "id": node.node_id,
-            "label": node.label,
-            "description": node.description,
-            "icon": node.icon_slug,
-            "position": node.position,
-            "status": status,
-            "xp": node.xp_reward,
-            "prerequisites": node.prerequisites,
-            "resource_link": node.resource_link,
-            "thumbnail": node.thumbnail,
-            "quests": quests_data,      # 수정된 퀘스트 리스트
-        })
+            statuses.append(NodeStatus.LOCKED)
+
+    return statuses
+
+
+def bump_progress_version(db: Session, user_id: int, node_db_id: int):
+    """노드 상태는 그대로지만 응답이 바뀌는 변경(퀘스트 완료 등) → 진행도 version +1 (commit은 호출부)"""
+    track_id = select(SkillNode.track_id).where(SkillNode.id == node_db_id).scalar_subquery()
+    db.execute(
+        update(UserTrackProgress)
+        .where(UserTrackProgress.user_id == user_id, UserTrackProgress.track_id == track_id)
+        .values(version=UserTrackProgress.version + 1)
+    )
+
+
+# ================================================================
+# 📌 3-1) 로드맵 데이터 버전 (ETag용)
+# - public   : (트랙 id, 트랙 version)
+# - personal : + 유저 진행도 version (비트셋 행이 없거나 오래됐으면 None → ETag 생략)
+# ================================================================
+def get_roadmap_version(db: Session, track_slug: str, user_id: int | None, ct=None):
+    ct = ct or get_compiled_track(db, track_slug)
+    if not ct:
+        return None
+    if not user_id:
+        return (ct.track_id, ct.version)
+
+    row = (
+        db.query(UserTrackProgress.version, UserTrackProgress.track_version)
+        .filter_by(user_id=user_id, track_id=ct.track_id)
+        .first()
+    )
+    if not row or row.track_version != ct.version:
+        return None
+    return (ct.track_id, ct.version, user_id, row.version)
+
+
+# ================================================================
+# 📌 3-2) 로드맵 조회 (public/personal 자동 지원)
+# ================================================================
+def get_roadmap(db: Session, track_slug: str, user_id: int | None, ct=None):
+
+    # 1) 컴파일된 트랙 구조 (캐시 hit 시 트랙 버전 확인 쿼리 1회, 호출부가 이미 읽었으면 재사용)
+    ct = ct or get_compiled_track(db, track_slug)
+    if not ct:
+        return None
+
+    # ⭐ user_id가 없으면(Public 모드) 퀘스트는 무조건 미완료 → 미리 만든 응답 그대로
+    if not user_id:
+        return ct.public_payload
+
+    # 2) personal 모드 → 유저 비트셋 한 줄 + 유저 완료 퀘스트 (쿼리 2회)
+    completed_mask, _ = _get_user_masks(db, user_id, ct)
+    completed_quests = _load_completed_quest_ids(db, user_id, ct.node_ids)
+
+    # 3) 상태 계산 (비트 연산)
+    statuses = _resolve_statuses(ct, completed_mask, completed_quests)
+
+    # 4) 미리 직렬화된 노드에 상태만 덮어쓰기 (원래 노드 순서 유지)
+    result_nodes = [
+        {
+            **payload,
+            "status": statuses[i],
+            "quests": [
+                {**q, "completed": q["quest_id"] in completed_quests}
+                for q in ct.quest_payloads[i]
+            ],
+        }
+        for i, payload in enumerate(ct.node_payloads)
+    ]
 
     return {
-        "track_title": track.title,
-        "track_desc": track.description,
+        "track_title": ct.title,
+        "track_desc": ct.description,
         "nodes": result_nodes,
     }
 
 
 # ================================================================
-# 📌 4) 노드 완료 처리 + 다음 노드 자동 해금
+# 📌 4) 노드 완료 처리 + 다음 노드 자동 해금 (단일 트랜잭션)
+# - user_track_progress 행을 FOR UPDATE로 잠가 같은 유저/트랙의 완료 요청을 직렬화
+# - 이미 완료된 노드면 아무것도 쓰지 않고 반환 (더블클릭 / 재시도 안전)
+# - 진행도 / 자식 해금은 INSERT ... ON DUPLICATE KEY UPDATE, commit은 마지막 1회
 # ================================================================
-def complete_node(db: Session, user_id: int, node_db_id: int):
-    progress = (
-        db.query(UserNodeProgress)
-        .filter_by(user_id=user_id, node_db_id=node_db_id)
-        .first()
+def _upsert_completed(db: Session, user_id: int, node_db_id: int):
+    stmt = mysql_insert(UserNodeProgress).values(
+        user_id=user_id,
+        node_db_id=node_db_id,
+        status=NodeStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
     )
+    db.execute(stmt.on_duplicate_key_update(
+        status=stmt.inserted.status,
+        completed_at=stmt.inserted.completed_at,
+    ))
+
+
+def _complete_node_tx(db: Session, user_id: int, ct, node_db_id: int):
+    row, completed, unlocked = _load_track_bits(db, user_id, ct, for_update=True)
+    bit = 1 << ct.index[node_db_id]
+    if completed & bit:
+        return False
+
+    _upsert_completed(db, user_id, node_db_id)
+    unlocked_ids = _unlock_next_nodes(db, user_id, node_db_id)
+
+    completed |= bit
+    unlocked &= ~bit
+    for child_id in unlocked_ids:
+        i = ct.index.get(child_id)
+        if i is not None:
+            unlocked |= 1 << i
+
+    row.completed_mask = _to_hex(completed)
+    row.unlocked_mask = _to_hex(unlocked)
+    row.version += 1
+    return True
+
+
+def complete_node(db: Session, user_id: int, node_db_id: int, commit: bool = True):
+    """
+    → {"status", "already_completed"} | None (노드 없음)
+    commit=False면 호출부 트랜잭션에 합류 (quest 완료 처리 등)
+    """
+    ct = get_compiled_track_for_node(db, node_db_id)
+    if not ct or node_db_id not in ct.index:
+        return None
 
-    if not progress:
-        progress = UserNodeProgress(
-            user_id=user_id,
-            node_db_id=node_db_id,
-            status=NodeStatus.COMPLETED,
-            completed_at=datetime.utcnow(),
-        )
-        db.add(progress)
+    if not commit:
+        changed = _complete_node_tx(db, user_id, ct, node_db_id)
     else:
-        progress.status = NodeStatus.COMPLETED
-        progress.completed_at = datetime.utcnow()
-
-    db.commit()
+        try:
+            changed = _complete_node_tx(db, user_id, ct, node_db_id)
+            db.commit()
+        except (IntegrityError, OperationalError):
+            # 첫 완료 요청이 동시에 들어와 비트셋 행 생성이 충돌 / 교착 → 한 번만 재시도
+            db.rollback()
+            changed = _complete_node_tx(db, user_id, ct, node_db_id)
+            db.commit()
 
-    _unlock_next_nodes(db, user_id, node_db_id)
-    return progress
+    return {"status": NodeStatus.COMPLETED, "already_completed": not changed}
 
 
 # ================================================================
 # 📌 5) 다음 노드 자동 해금 로직
+# - skill_node_edges(parent_id) 인덱스 + 진행도 LEFT JOIN 1회
+# - 진행 기록이 없는 자식 노드만 한 번에 bulk insert (중복 키는 기존 상태 유지)
 # ================================================================
 def _unlock_next_nodes(db: Session, user_id: int, node_db_id: int):
-    node = db.query(SkillNode).filter_by(id=node_db_id).first()
-    if not node:
-        return
-
-    next_nodes = (
-        db.query(SkillNode)
-        .filter(SkillNode.prerequisites.contains([node.node_id]))
+    missing = (
+        db.query(SkillNodeEdge.child_id)
+        .outerjoin(
+            UserNodeProgress,
+            and_(
+                UserNodeProgress.node_db_id == SkillNodeEdge.child_id,
+                UserNodeProgress.user_id == user_id,
+            ),
+        )
+        .filter(
+            SkillNodeEdge.parent_id == node_db_id,
+            UserNodeProgress.id.is_(None),
+        )
         .all()
     )
+    if not missing:
+        return []
+
+    child_ids = [child_id for child_id, in missing]
+    stmt = mysql_insert(UserNodeProgress)
+    db.execute(
+        stmt.on_duplicate_key_update(status=UserNodeProgress.status),
+        [
+            {"user_id": user_id, "node_db_id": child_id, "status": NodeStatus.UNLOCKED}
+            for child_id in child_ids
+        ],
+    )
+    return child_ids
 
-    for n in next_nodes:
-        exists = (
-            db.query(UserNodeProgress)
-            .filter_by(user_id=user_id, node_db_id=n.id)
-            .first()
-        )
-        if exists:
-            continue
 
-        db.add(UserNodeProgress(
-            user_id=user_id,
-            node_db_id=n.id,
-            status=NodeStatus.UNLOCKED
-        ))
+# ================================================================
+# 📌 6) 선행관계 간선 재구성 (seed 후 호출)
+# - SkillNode.prerequisites(JSON, node_id 문자열) → skill_node_edges(parent_id, child_id)
+# - 트랙 밖 선행 노드는 간선을 만들지 않음. commit은 호출부에서.
+# ================================================================
+def rebuild_node_edges(db: Session, track_id: int):
+    nodes = (
+        db.query(SkillNode.id, SkillNode.node_id, SkillNode.prerequisites)
+        .filter(SkillNode.track_id == track_id)
+        .all()
+    )
+    by_str = {node_id: db_id for db_id, node_id, _ in nodes}
+
+    edges = {
+        (by_str[parent], db_id)
+        for db_id, _, prerequisites in nodes
+        for parent in prerequisites or []
+        if parent in by_str
+    }
 
-    db.commit()
\ No newline at end of file
+    db.query(SkillNodeEdge).filter(SkillNodeEdge.track_id == track_id).delete(synchronize_session=False)
+    if edges:
+        db.execute(insert(SkillNodeEdge), [
+            {"parent_id": parent_id, "child_id": child_id, "track_id": track_id}
+            for parent_id, child_id in sorted(edges)
+        ])
+    return len(edges)
@@ -6,16 +6,21 @@
 - 관심사 저장 및 조회 (Interests) -> 자동 분류 저장 기능 추가됨!
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 import json
 
 from database.models import UserProfile
+from utils.cache_utils import BloomFilter
 from core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
     create_access_token,
+    invalidate_principal,
 )
 
 # ----------------------------------------------------------
@@ -54,18 +59,48 @@ def classify_keywords(selected_list):
 # 🔐 인증 (Auth) 로직
 # ==========================================================
 
-def check_email_exists(db: Session, email: str) -> bool:
-    user = db.query(UserProfile).filter(UserProfile.email == email).first()
+# ----------------------------------------------------------
+# 🌸 이메일 Bloom Filter (/auth/check-email 빠른 경로)
+# - 서버 시작 시 전체 이메일로 생성, 회원가입 시 추가, 스케줄러가 주기적으로 재생성
+# - "없음" 판정은 DB 조회 없이 바로 반환, "있을 수도 있음"만 DB 인덱스 조회
+# - 다른 워커 프로세스에서 가입한 이메일은 다음 재생성 전까지 누락될 수 있으므로
+#   회원가입 자체의 중복 검사는 항상 DB로 합니다.
+# ----------------------------------------------------------
+EMAIL_FILTER_ERROR_RATE = 0.01
+EMAIL_FILTER_MIN_CAPACITY = 10_000
+
+_email_filter = None
+
+def _email_key(email: str) -> str:
+    # MariaDB 기본 collation이 대소문자를 구분하지 않으므로 소문자로 통일
+    return (email or "").strip().lower()
+
+def load_email_filter(db: Session):
+    global _email_filter
+    total = db.query(func.count(UserProfile.id)).scalar() or 0
+    bf = BloomFilter(max(total * 2, EMAIL_FILTER_MIN_CAPACITY), EMAIL_FILTER_ERROR_RATE)
+
+    rows = db.execute(select(UserProfile.email).execution_options(yield_per=5000))
+    for (email,) in rows:
+        bf.add(_email_key(email))
+
+    _email_filter = bf
+    print(f"🌸 Email Bloom Filter 준비 완료 ({bf.count} emails, {len(bf.bits) // 1024}KB)")
+    return bf
+
+def _email_in_db(db: Session, email: str) -> bool:
+    user = db.query(UserProfile.id).filter(UserProfile.email == email).first()
     return bool(user)
 
-def register_user(db: Session, user_data):
-    if check_email_exists(db, user_data.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 등록된 이메일입니다.",
-        )
+def check_email_exists(db: Session, email: str) -> bool:
+    if _email_filter is not None and _email_key(email) not in _email_filter:
+        return False
+    return _email_in_db(db, email)
 
-    hashed_pw = hash_password(user_data.password)
+def _find_user_by_email(db: Session, email: str):
+    return db.query(UserProfile).filter(UserProfile.email == email).first()
+
+def _create_user(db: Session, user_data, hashed_pw: str):
     new_user = UserProfile(
         username=user_data.username,
         email=user_data.email,
@@ -76,6 +111,31 @@ def register_user(db: Session, user_data):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    return new_user
+
+def _update_password_hash(db: Session, user: UserProfile, new_hash: str):
+    user.password_hash = new_hash
+    db.commit()
+    db.refresh(user)
+
+def _touch_last_login(db: Session, user: UserProfile):
+    # 야간 Daily Quest 배치는 최근 로그인한 유저만 미리 계산
+    user.last_login = datetime.utcnow()
+    db.commit()
+    db.refresh(user)
+
+# ⭐ bcrypt는 전용 워커 풀에서 await, DB 작업은 run_in_threadpool 로 실행
+async def register_user(db: Session, user_data):
+    if await run_in_threadpool(_email_in_db, db, user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이미 등록된 이메일입니다.",
+        )
+
+    hashed_pw = await hash_password_async(user_data.password)
+    new_user = await run_in_threadpool(_create_user, db, user_data, hashed_pw)
+    if _email_filter is not None:
+        _email_filter.add(_email_key(new_user.email))
     
     # ✅ [수정] 토큰 생성 시 'id' 필드 추가
     token = create_access_token(
@@ -93,14 +153,21 @@ def register_user(db: Session, user_data):
         "token_type": "bearer"
     }
 
-def authenticate_user(db: Session, login_data):
-    user = db.query(UserProfile).filter(UserProfile.email == login_data.email).first()
+async def authenticate_user(db: Session, login_data):
+    user = await run_in_threadpool(_find_user_by_email, db, login_data.email)
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await verify_password_async(login_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="잘못된 이메일 또는 비밀번호입니다.",
         )
+
+    # 🔁 BCRYPT_ROUNDS가 바뀌었으면 평문을 알고 있는 지금 새 비용으로 재해시
+    if needs_rehash(user.password_hash):
+        new_hash = await hash_password_async(login_data.password)
+        await run_in_threadpool(_update_password_hash, db, user, new_hash)
+
+    await run_in_threadpool(_touch_last_login, db, user)
     
     # ✅ [수정] 토큰 생성 시 'id' 필드 추가
     token = create_access_token(
@@ -145,7 +212,8 @@ def update_user_interests(db: Session, user_id: int, interests: list, main_focus
     
     db.commit()
     db.refresh(user)
-    
+    invalidate_principal(user.id, user.email)  # 캐시된 Principal도 새 프로필로
+
     print(f"✅ [User Update] ID:{user_id} | Tech: {techs} | Interest: {topics}")
     
     # 반환할 때는 프론트엔드가 헷갈리지 않게 합쳐서 줍니다 (선택사항)
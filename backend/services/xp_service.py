@@ -0,0 +1,88 @@
+# backend/services/xp_service.py
+# flake8: noqa
+"""
+⭐ XP / 레벨
+- award_xp        : 퀘스트 완료 시 XpLedger에 한 줄 INSERT (유저 행 잠금 없음)
+- apply_xp        : UPDATE ... SET current_xp = current_xp + :xp 한 문장으로 XP / 레벨 반영
+- compact_xp_ledger : 원장을 유저별로 합산해 apply_xp로 반영하고 삭제 (스케줄러)
+
+레벨 계산 (XP_PER_LEVEL = 100)
+    total      = current_xp + xp
+    level     += total DIV 100
+    current_xp = total MOD 100
+MySQL은 SET 절을 왼쪽부터 적용하므로 level을 current_xp보다 먼저 갱신합니다 (ordered_values).
+"""
+
+import os
+from collections import defaultdict
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+
+from database.models import UserProfile, XpLedger
+from services.leaderboard_service import leaderboard
+
+
+XP_PER_LEVEL = 100
+XP_COMPACT_BATCH = int(os.getenv("XP_COMPACT_BATCH", "5000"))
+
+
+def award_xp(db: Session, user_id: int, xp: int, source: str | None = None):
+    """원장에 적립만 (commit은 호출부에서)"""
+    if xp:
+        db.add(XpLedger(user_id=user_id, xp=xp, source=source))
+
+
+def apply_xp(db: Session, user_id: int, xp: int) -> bool:
+    """유저 XP / 레벨을 원자적으로 갱신 (commit은 호출부에서)"""
+    total = func.coalesce(UserProfile.current_xp, 0) + xp
+    res = db.execute(
+        update(UserProfile)
+        .where(UserProfile.id == user_id)
+        .ordered_values(
+            (UserProfile.level, func.coalesce(UserProfile.level, 1) + total // XP_PER_LEVEL),
+            (UserProfile.current_xp, total % XP_PER_LEVEL),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount > 0
+
+
+def compact_xp_ledger(db: Session, batch_size: int = XP_COMPACT_BATCH) -> int:
+    """
+    원장을 id 순으로 batch_size씩 잠가(FOR UPDATE) 유저별 합계를 반영하고 삭제.
+    여러 워커에서 동시에 돌아도 같은 원장 행을 두 번 반영하지 않음.
+    → 반영한 원장 행 수
+    """
+    folded = 0
+    while True:
+        rows = (
+            db.query(XpLedger.id, XpLedger.user_id, XpLedger.xp)
+            .order_by(XpLedger.id)
+            .limit(batch_size)
+            .with_for_update()
+            .all()
+        )
+        if not rows:
+            break
+
+        totals = defaultdict(int)
+        for r in rows:
+            totals[r.user_id] += r.xp
+
+        # 유저 id 순으로 갱신 → 동시 트랜잭션과 잠금 순서가 같아 교착 방지
+        for user_id in sorted(totals):
+            apply_xp(db, user_id, totals[user_id])
+
+        db.execute(
+            delete(XpLedger)
+            .where(XpLedger.id.in_([r.id for r in rows]))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        leaderboard.apply_changes(db, totals)
+        folded += len(rows)
+
+        if len(rows) < batch_size:
+            break
+    return folded
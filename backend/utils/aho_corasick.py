@@ -0,0 +1,87 @@
+# backend/utils/aho_corasick.py
+# flake8: noqa
+"""
+🔎 Aho-Corasick 다중 패턴 매칭
+패턴 수와 상관없이 텍스트를 한 번만 훑어서 "포함된 패턴" 을 찾습니다.
+각 패턴에 우선순위(0 이상, 작을수록 높음)를 주고, 텍스트에 포함된 패턴 중 가장 높은 우선순위를 돌려줍니다.
+
+    ac = AhoCorasick()
+    ac.add("react", 0)
+    ac.add("js", 1)
+    ac.build()
+    ac.best("react.js 입문")  # → 0
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self):
+        self.goto = [{}]       # state → {문자: 다음 state}
+        self.fail = [0]
+        self.best_at = [None]  # state에서 끝나는 패턴(실패 링크 포함) 중 최소 우선순위
+        self.always = None     # 빈 패턴: 모든 텍스트에 포함
+        self._built = False
+
+    def add(self, pattern: str, priority: int):
+        if not pattern:
+            self.always = priority if self.always is None else min(self.always, priority)
+            return
+
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.best_at.append(None)
+            state = nxt
+
+        current = self.best_at[state]
+        self.best_at[state] = priority if current is None else min(current, priority)
+        self._built = False
+
+    def build(self):
+        """BFS로 실패 링크를 잇고, 실패 링크 쪽 출력의 최소 우선순위를 합쳐 둠"""
+        queue = deque()
+        for nxt in self.goto[0].values():
+            self.fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+
+                inherited = self.best_at[self.fail[nxt]]
+                if inherited is not None:
+                    own = self.best_at[nxt]
+                    self.best_at[nxt] = inherited if own is None else min(own, inherited)
+                queue.append(nxt)
+
+        self._built = True
+
+    def best(self, text: str):
+        """text에 포함된 패턴 중 최소 우선순위 (없으면 None)"""
+        if not self._built:
+            self.build()
+
+        best = self.always
+        goto, fail, best_at = self.goto, self.fail, self.best_at
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            found = best_at[state]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best == 0:
+                    break
+        return best
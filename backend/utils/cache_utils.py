@@ -0,0 +1,97 @@
+# backend/utils/cache_utils.py
+# flake8: noqa
+"""
+🗃️ 인메모리 캐시 유틸
+- TTLCache    : 스레드 안전 LRU + TTL 캐시 (프로세스 단위)
+- BloomFilter : "확실히 없음"을 빠르게 판단하는 확률적 집합
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+# ====================================================================
+# ⏳ LRU + TTL 캐시
+# ====================================================================
+class TTLCache:
+    """
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    ttl(초)이 지난 항목은 조회 시점에 만료 처리합니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[0] if item else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ====================================================================
+# 🌸 Bloom Filter
+# ====================================================================
+class BloomFilter:
+    """
+    - item in bf 가 False → 확실히 추가된 적 없음
+    - item in bf 가 True  → 있을 수도 있음 (오탐률 ≈ error_rate, capacity 이하일 때)
+    삭제는 지원하지 않습니다.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str):
+        # double hashing: h1 + i*h2 (blake2b 128bit 하나로 k개 위치 생성)
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        positions = self._positions(item)
+        with self._lock:
+            for p in positions:
+                self.bits[p >> 3] |= 1 << (p & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
@@ -0,0 +1,278 @@
+# backend/utils/llm_chain.py
+# flake8: noqa
+"""
+🧠 LLM Gateway — 모든 OpenAI 호출이 거쳐가는 단일 창구
+- 공유 OpenAI 클라이언트 1개 (timeout 지정, SDK 자체 재시도는 끄고 여기서 관리)
+- 전역 동시 호출 제한 (Semaphore)
+- Token Bucket 기반 요청 속도 제한
+- 재시도 가능한 오류(429/5xx/timeout/연결)에 대한 지수 백오프 + jitter
+- 파이프라인별 일일 토큰 예산
+- 파이프라인별 호출/실패/재시도/토큰/지연시간 카운터
+
+사용 예:
+    content = chat_completion("news", [{"role": "user", "content": prompt}])
+
+오프라인 벤치마크:
+    OPENAI_BASE_URL=http://127.0.0.1:8899/v1 로 지정하면 scripts/llm_stub_server.py 로 호출이 향합니다.
+    (이 경우 API 키가 없어도 게이트웨이가 활성화됨)
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import date
+
+from dotenv import load_dotenv
+from openai import (
+    OpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+load_dotenv()
+
+
+# ====================================================================
+# ⚙️ 설정 (환경 변수로 조정)
+# ====================================================================
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+DEFAULT_MODEL = "gpt-4o-mini"
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MIN = float(os.getenv("LLM_REQUESTS_PER_MIN", "120"))
+LLM_BURST = int(os.getenv("LLM_BURST", str(LLM_MAX_CONCURRENCY)))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+
+# 파이프라인별 일일 토큰 예산 (0 = 무제한) → LLM_BUDGET_NEWS 처럼 env로 덮어쓰기 가능
+DEFAULT_TOKEN_BUDGETS = {
+    "news": 300_000,
+    "dev": 300_000,
+    "trend": 100_000,
+    "chat": 200_000,
+}
+
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
+# ====================================================================
+# ❗ 예외
+# ====================================================================
+class LLMError(Exception):
+    """게이트웨이에서 발생하는 모든 LLM 오류의 부모"""
+
+
+class LLMUnavailable(LLMError):
+    """API 키 / base URL이 없어 호출할 수 없음"""
+
+
+class LLMBudgetExceeded(LLMError):
+    """파이프라인의 오늘 토큰 예산 소진"""
+
+
+# ====================================================================
+# 🪣 Token Bucket (스레드 안전)
+# ====================================================================
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, capacity: int):
+        self.rate = rate_per_sec
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기, 대기한 시간(초)을 반환"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_bucket = TokenBucket(LLM_REQUESTS_PER_MIN / 60.0, LLM_BURST)
+_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+
+# ====================================================================
+# 🔌 공유 클라이언트
+# ====================================================================
+_client = None
+_client_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return bool(OPENAI_API_KEY or OPENAI_BASE_URL)
+
+
+def get_client() -> OpenAI:
+    global _client
+    if not is_enabled():
+        raise LLMUnavailable("OPENAI_API_KEY (or OPENAI_BASE_URL) is not set")
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=OPENAI_API_KEY or "offline-stub",
+                base_url=OPENAI_BASE_URL,
+                timeout=LLM_TIMEOUT,
+                max_retries=0,
+            )
+    return _client
+
+
+# ====================================================================
+# 📊 사용량 / 예산 카운터
+# ====================================================================
+_stats_lock = threading.Lock()
+_stats = {}
+_in_flight = 0
+_budget_day = date.today()
+
+
+def _budget_for(pipeline: str) -> int:
+    env = os.getenv(f"LLM_BUDGET_{pipeline.upper()}")
+    if env is not None:
+        return int(env)
+    return DEFAULT_TOKEN_BUDGETS.get(pipeline, 0)
+
+
+def _pipeline_stats(pipeline: str) -> dict:
+    # _stats_lock 안에서만 호출
+    global _budget_day
+    today = date.today()
+    if today != _budget_day:
+        _budget_day = today
+        for s in _stats.values():
+            s["tokens_today"] = 0
+
+    if pipeline not in _stats:
+        _stats[pipeline] = {
+            "calls": 0, "succeeded": 0, "failed": 0, "retries": 0, "budget_rejected": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "tokens_today": 0,
+            "latency_ms_total": 0.0, "latency_ms_max": 0.0, "wait_ms_total": 0.0,
+        }
+    return _stats[pipeline]
+
+
+def _check_budget(pipeline: str):
+    budget = _budget_for(pipeline)
+    with _stats_lock:
+        s = _pipeline_stats(pipeline)
+        if budget and s["tokens_today"] >= budget:
+            s["budget_rejected"] += 1
+            raise LLMBudgetExceeded(f"[{pipeline}] daily token budget ({budget}) exhausted")
+
+
+def _record(pipeline: str, ok: bool, latency_ms: float, wait_ms: float, retries: int, usage=None):
+    with _stats_lock:
+        s = _pipeline_stats(pipeline)
+        s["calls"] += 1
+        s["succeeded" if ok else "failed"] += 1
+        s["retries"] += retries
+        s["latency_ms_total"] += latency_ms
+        s["latency_ms_max"] = max(s["latency_ms_max"], latency_ms)
+        s["wait_ms_total"] += wait_ms
+        if usage:
+            s["prompt_tokens"] += usage.prompt_tokens or 0
+            s["completion_tokens"] += usage.completion_tokens or 0
+            s["tokens_today"] += usage.total_tokens or 0
+
+
+def get_llm_stats() -> dict:
+    with _stats_lock:
+        pipelines = {}
+        for name, s in _stats.items():
+            _pipeline_stats(name)
+            calls = s["calls"] or 1
+            pipelines[name] = {
+                **s,
+                "latency_ms_avg": round(s["latency_ms_total"] / calls, 1),
+                "wait_ms_avg": round(s["wait_ms_total"] / calls, 1),
+                "budget": _budget_for(name),
+            }
+        return {
+            "enabled": is_enabled(),
+            "in_flight": _in_flight,
+            "max_concurrency": LLM_MAX_CONCURRENCY,
+            "requests_per_min": LLM_REQUESTS_PER_MIN,
+            "pipelines": pipelines,
+        }
+
+
+# ====================================================================
+# 🔁 재시도 대기 시간
+# ====================================================================
+def _backoff_seconds(attempt: int, error: Exception) -> float:
+    # 429 응답에 Retry-After가 있으면 우선 사용
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(LLM_BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+
+    delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.5)
+
+
+# ====================================================================
+# 🚀 Chat Completion
+# ====================================================================
+def chat_completion(pipeline: str, messages: list, model: str = DEFAULT_MODEL, **kwargs) -> str:
+    """
+    OpenAI chat.completions 호출 후 응답 텍스트를 반환합니다.
+    실패 시 LLMError(또는 OpenAI 예외)를 그대로 올리므로 호출부에서 fallback 처리하세요.
+    """
+    global _in_flight
+
+    client = get_client()
+    _check_budget(pipeline)
+
+    retries = 0
+    wait_ms = 0.0
+    started = time.monotonic()
+
+    while True:
+        wait_ms += _bucket.acquire() * 1000
+
+        wait_started = time.monotonic()
+        _semaphore.acquire()
+        wait_ms += (time.monotonic() - wait_started) * 1000
+        with _stats_lock:
+            _in_flight += 1
+
+        try:
+            res = client.chat.completions.create(model=model, messages=messages, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            error = e
+        except Exception:
+            _record(pipeline, False, (time.monotonic() - started) * 1000, wait_ms, retries)
+            raise
+        else:
+            _record(pipeline, True, (time.monotonic() - started) * 1000, wait_ms, retries, res.usage)
+            return res.choices[0].message.content
+        finally:
+            with _stats_lock:
+                _in_flight -= 1
+            _semaphore.release()
+
+        # 재시도 가능 오류 → 슬롯을 반납한 상태에서 대기
+        if retries >= LLM_MAX_RETRIES:
+            _record(pipeline, False, (time.monotonic() - started) * 1000, wait_ms, retries)
+            raise error
+        time.sleep(_backoff_seconds(retries, error))
+        retries += 1
@@ -0,0 +1,150 @@
+# backend/utils/nlp_utils.py
+# flake8: noqa
+"""
+🧮 텍스트 벡터화 & 클러스터링 유틸 (NumPy + SciPy sparse)
+- tokenize          : 영문/숫자/한글 토큰 추출
+- build_tfidf       : 문서 → CSR TF-IDF 행렬 (행 L2 정규화)
+- minibatch_kmeans  : 코사인 기준 미니배치 k-means
+- cluster_documents : 위 과정을 묶어 클러스터별 상위 단어 + 소속 문서 반환
+요청 처리 경로가 아닌 배치 작업(크롤링 이후 스냅샷 갱신)에서만 사용합니다.
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+
+# ====================================================================
+# 1️⃣ 토큰화
+# ====================================================================
+_NON_WORD = re.compile(r"[^a-zA-Z0-9가-힣\s]")
+
+
+def tokenize(text: str, stopwords=()):
+    t = _NON_WORD.sub(" ", (text or "").lower())
+    return [w for w in t.split() if len(w) > 1 and w not in stopwords]
+
+
+# ====================================================================
+# 2️⃣ TF-IDF
+# ====================================================================
+def build_tfidf(docs: list, max_features: int = 5000, min_df: int = 2, stopwords=()):
+    """
+    docs → (X, terms)
+    - X     : (n_docs x n_terms) CSR 행렬, 각 행은 L2 정규화됨
+    - terms : 열 인덱스 → 단어
+    """
+    tokenized = [tokenize(d, stopwords) for d in docs]
+
+    df = Counter()
+    for tokens in tokenized:
+        df.update(set(tokens))
+
+    vocab = [t for t, c in df.most_common() if c >= min_df][:max_features]
+    index = {t: i for i, t in enumerate(vocab)}
+
+    rows, cols, vals = [], [], []
+    for r, tokens in enumerate(tokenized):
+        for term, tf in Counter(t for t in tokens if t in index).items():
+            rows.append(r)
+            cols.append(index[term])
+            vals.append(tf)
+
+    X = sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float64), (rows, cols)),
+        shape=(len(docs), len(vocab)),
+    )
+    if not vocab:
+        return X, vocab
+
+    n_docs = len(docs)
+    doc_freq = np.asarray([df[t] for t in vocab], dtype=np.float64)
+    idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+    X = X.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    X = sparse.diags(1.0 / norms) @ X
+    return X.tocsr(), vocab
+
+
+# ====================================================================
+# 3️⃣ Mini-batch k-means (cosine)
+# ====================================================================
+def _normalize_rows(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+def assign_clusters(X, centers, chunk_size: int = 2048):
+    labels = np.empty(X.shape[0], dtype=np.int64)
+    for start in range(0, X.shape[0], chunk_size):
+        sims = X[start:start + chunk_size] @ centers.T
+        labels[start:start + chunk_size] = np.asarray(sims).argmax(axis=1)
+    return labels
+
+
+def minibatch_kmeans(X, k: int, batch_size: int = 256, n_iter: int = 100, seed: int = 42):
+    """
+    L2 정규화된 CSR 행렬을 코사인 유사도 기준으로 k개로 묶습니다.
+    중심 갱신은 중심별 누적 개수에 반비례하는 학습률을 사용합니다.
+    → (labels, centers)
+    """
+    rng = np.random.default_rng(seed)
+    n = X.shape[0]
+    k = max(1, min(k, n))
+
+    centers = _normalize_rows(X[rng.choice(n, k, replace=False)].toarray())
+    counts = np.zeros(k)
+
+    for _ in range(n_iter):
+        idx = rng.choice(n, min(batch_size, n), replace=False)
+        batch = X[idx]
+        labels = np.asarray(batch @ centers.T).argmax(axis=1)
+        dense = batch.toarray()
+
+        for c in np.unique(labels):
+            members = dense[labels == c]
+            counts[c] += len(members)
+            eta = len(members) / counts[c]
+            centers[c] = (1.0 - eta) * centers[c] + eta * members.mean(axis=0)
+
+        centers = _normalize_rows(centers)
+
+    return assign_clusters(X, centers), centers
+
+
+# ====================================================================
+# 4️⃣ 문서 클러스터링 (TF-IDF → k-means → 상위 단어)
+# ====================================================================
+def cluster_documents(docs: list, k: int = 8, n_terms: int = 5, stopwords=(), seed: int = 42):
+    """
+    → [{"terms": [...], "members": [doc_index, ...]}, ...] (크기 내림차순)
+    단어가 하나도 없는 문서는 어느 클러스터에도 속하지 않습니다.
+    """
+    X, terms = build_tfidf(docs, stopwords=stopwords)
+    if not terms:
+        return []
+
+    doc_idx = np.flatnonzero(X.getnnz(axis=1) > 0)
+    if len(doc_idx) < 2:
+        return []
+
+    labels, centers = minibatch_kmeans(X[doc_idx], k, seed=seed)
+    top = np.argsort(-centers, axis=1)[:, :n_terms]
+
+    clusters = []
+    for c in range(centers.shape[0]):
+        members = doc_idx[labels == c]
+        if len(members) == 0:
+            continue
+        clusters.append({
+            "terms": [terms[i] for i in top[c] if centers[c, i] > 0],
+            "members": members.tolist(),
+        })
+
+    clusters.sort(key=lambda x: len(x["members"]), reverse=True)
+    return clusters
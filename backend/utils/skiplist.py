@@ -0,0 +1,150 @@
+# backend/utils/skiplist.py
+# flake8: noqa
+"""
+🪜 Indexable Skip List (순서 통계 자료구조)
+정렬 상태를 유지하면서 아래 연산을 모두 기대 O(log n)에 처리합니다.
+- add(key) / remove(key)
+- bisect_left(key) : key보다 작은 원소 수 (= 0부터 센 순위)
+- sl[i]            : i번째로 작은 원소
+- islice(start, stop)
+
+각 링크에 "건너뛰는 원소 수(width)"를 같이 저장해서 인덱스 접근이 가능합니다.
+key는 서로 비교 가능하고 중복이 없어야 합니다 (예: (-level, -xp, user_id)).
+"""
+
+import random
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    MAX_LEVEL = 32
+
+    def __init__(self, seed=None):
+        self._rand = random.Random(seed)
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self._rand.random() < 0.5:
+            level += 1
+        return level
+
+    def _find(self, key):
+        """각 레벨에서 key 직전 노드와 그 노드까지의 위치(앞에 있는 원소 수)"""
+        update = [self._head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self._head
+        pos = 0
+        for lv in range(self._level - 1, -1, -1):
+            nxt = node.next[lv]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[lv]
+                node = nxt
+                nxt = node.next[lv]
+            update[lv] = node
+            rank[lv] = pos
+        return update, rank
+
+    def add(self, key):
+        update, rank = self._find(key)
+        level = self._random_level()
+        if level > self._level:
+            for lv in range(self._level, level):
+                update[lv] = self._head
+                rank[lv] = 0
+                self._head.width[lv] = self._size + 1
+            self._level = level
+
+        node = _Node(key, level)
+        pos = rank[0]  # 새 노드 앞에 있는 원소 수
+        for lv in range(level):
+            prev = update[lv]
+            node.next[lv] = prev.next[lv]
+            prev.next[lv] = node
+            # prev → node 사이 거리, node → 원래 다음 노드 사이 거리
+            before = pos - rank[lv]
+            node.width[lv] = prev.width[lv] - before
+            prev.width[lv] = before + 1
+
+        for lv in range(level, self._level):
+            update[lv].width[lv] += 1
+
+        self._size += 1
+
+    def remove(self, key) -> bool:
+        update, _ = self._find(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+
+        for lv in range(self._level):
+            prev = update[lv]
+            if prev.next[lv] is node:
+                prev.width[lv] += node.width[lv] - 1
+                prev.next[lv] = node.next[lv]
+            else:
+                prev.width[lv] -= 1
+
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+    def bisect_left(self, key) -> int:
+        _, rank = self._find(key)
+        return rank[0]
+
+    def __contains__(self, key) -> bool:
+        update, _ = self._find(key)
+        node = update[0].next[0]
+        return node is not None and node.key == key
+
+    def _node_at(self, index: int):
+        node = self._head
+        remaining = index + 1
+        for lv in range(self._level - 1, -1, -1):
+            while node.next[lv] is not None and node.width[lv] <= remaining:
+                remaining -= node.width[lv]
+                node = node.next[lv]
+            if remaining == 0:
+                break
+        return node
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skiplist index out of range")
+        return self._node_at(index).key
+
+    def islice(self, start: int, stop: int):
+        """start ≤ i < stop 원소 (O(log n + k))"""
+        start = max(0, start)
+        stop = min(self._size, stop)
+        if start >= stop:
+            return []
+        node = self._node_at(start)
+        out = []
+        for _ in range(stop - start):
+            out.append(node.key)
+            node = node.next[0]
+        return out
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]